@@ -25,9 +25,15 @@ def authenticate(request=None, role_id=0):
     if not user:
         return AnonymousRole()
 
-    # 2. 用户的角色不存在, 返回staff
-    if role_id == 0 or not RoleUser.objects.user_role_exists(request.user.username, role_id):
+    if role_id == 0:
         return AnonymousRole()
 
-    # 3. 对于用户与角色关系认证通过的，返回对应的分级管理员(超级管理员和系统管理员是两类特殊的分级管理员)
-    return Role.objects.get(id=role_id)
+    # 2. 对于用户与角色关系认证通过的，返回对应的分级管理员(超级管理员和系统管理员是两类特殊的分级管理员)
+    # 使用子查询一次完成用户与角色关系的认证和角色的查询
+    role = Role.objects.filter(
+        id=role_id,
+        id__in=RoleUser.objects.filter(role_id=role_id, username=request.user.username).values("role_id"),
+    ).first()
+
+    # 3. 用户的角色不存在, 返回staff
+    return role or AnonymousRole()
@@ -33,6 +33,19 @@ class SubjectCheckMixin:
             logger.exception(f"[OpenAPI] authorize user[{username}] check error")
             raise error_codes.VALIDATE_ERROR.format(f"user[{username}] not exists")
 
+    def check_or_sync_users(self, usernames: List[str]):
+        """
+        批量检测用户是否存在，不存在则批量同步用户
+        """
+        try:
+            not_found_usernames = Syncer().sync_multi_users(usernames)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f"[OpenAPI] sync users{usernames} check error")
+            raise error_codes.VALIDATE_ERROR.format("sync users error")
+
+        if not_found_usernames:
+            raise error_codes.VALIDATE_ERROR.format(f"users{not_found_usernames} not exists")
+
 
 class AuthorizationAPIAllowListCheckMixin:
     """授权API相关白名单控制"""
@@ -12,6 +12,7 @@ from typing import Dict, List
 
 from pydantic.tools import parse_obj_as
 
+from backend.apps.action.models import ActionRelatedObject
 from backend.apps.role.models import RoleScope
 from backend.biz.policy import PolicyBean
 from backend.biz.resource import ResourceBiz, ResourceNodeBean
@@ -19,7 +20,7 @@ from backend.biz.role import RoleAuthorizationScopeChecker, RoleBiz
 from backend.common.error_codes import APIException
 from backend.service.constants import RoleScopeType
 from backend.service.models import Action, Policy, RelatedResource, ResourceInstance, Subject, group_paths
-from backend.service.role import AuthScopeAction, AuthScopeSystem
+from backend.service.role import AuthScopeAction, AuthScopeSystem, role_scope_cache
 from backend.util.json import json_dumps
 
 
@@ -145,3 +146,7 @@ def _add_policies_to_role_authorization_scope(
     RoleScope.objects.filter(role_id=role_id, type=RoleScopeType.AUTHORIZATION.value).update(
         content=json_dumps([one.dict() for one in auth_scopes]),
     )
+    ActionRelatedObject.objects.reset_role_scope_actions(
+        role_id, [(one.system_id, action.id) for one in auth_scopes for action in one.actions]
+    )
+    role_scope_cache.delete([role_id])
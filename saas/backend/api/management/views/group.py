@@ -18,6 +18,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from backend.api.authentication import ESBAuthentication
+from backend.api.authorization.mixins import SubjectCheckMixin
 from backend.api.management.constants import ManagementAPIEnum, VerifyAPIParamLocationEnum
 from backend.api.management.permissions import ManagementAPIPermission
 from backend.api.management.serializers import (
@@ -204,7 +205,7 @@ class ManagementGroupViewSet(ExceptionHandlerMixin, GenericViewSet):
         return Response({})
 
 
-class ManagementGroupMemberViewSet(ExceptionHandlerMixin, GenericViewSet):
+class ManagementGroupMemberViewSet(SubjectCheckMixin, ExceptionHandlerMixin, GenericViewSet):
     """用户组成员"""
 
     authentication_classes = [ESBAuthentication]
@@ -261,6 +262,11 @@ class ManagementGroupMemberViewSet(ExceptionHandlerMixin, GenericViewSet):
         # 成员Dict结构转换为Subject结构，并去重
         members = list(set(parse_obj_as(List[Subject], members_data)))
 
+        # 批量同步尚未同步的用户
+        usernames = [m.id for m in members if m.type == SubjectType.USER.value]
+        if usernames:
+            self.check_or_sync_users(usernames)
+
         # 检测成员是否满足管理的授权范围
         role = self.role_biz.get_role_by_group_id(group.id)
         self.group_check_biz.check_role_subject_scope(role, members)
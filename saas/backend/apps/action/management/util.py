@@ -11,9 +11,9 @@ specific language governing permissions and limitations under the License.
 import logging
 from collections import defaultdict
 
-from django.core.paginator import Paginator
 from django.db import transaction
 
+from backend.apps.action.models import ActionRelatedObject
 from backend.apps.policy.models import Policy as PolicyModel
 from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthorized
 from backend.biz.template import TemplateBiz
@@ -103,15 +103,12 @@ class ActionViewService:
             authorized_templates = PermTemplatePolicyAuthorized.objects.filter(template_id=t.id).only(
                 "subject_type", "subject_id"
             )
-            paginator = Paginator(authorized_templates, 100)
-            if paginator.count:
-                for i in paginator.page_range:
-                    page = paginator.page(i)
-                    members = [
-                        Subject(type=authorized_template.subject_type, id=authorized_template.subject_id)
-                        for authorized_template in page
-                    ]
-                    template_biz.revoke_subjects(t.system_id, t.id, members)
+            # revoke_subjects内部会分批删除
+            members = [
+                Subject(type=authorized_template.subject_type, id=authorized_template.subject_id)
+                for authorized_template in authorized_templates
+            ]
+            template_biz.revoke_subjects(t.system_id, t.id, members)
             template_biz.delete(t.id)
 
         logger.info("Delete Template Success")
@@ -145,4 +142,5 @@ class ActionViewService:
         """
         old_template.action_ids = action_ids
         old_template.save(update_fields=["_action_ids"])
+        ActionRelatedObject.objects.reset_template_actions(old_template.id, old_template.system_id, action_ids)
         return old_template
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from typing import Iterable, List, Tuple
+
+from django.db import models
+
+from backend.service.constants import ActionRelatedObjectType
+
+
+class ActionRelatedObjectManager(models.Manager):
+    def reset_object_actions(self, object_type: str, object_id: int, system_actions: Iterable[Tuple[str, str]]):
+        """
+        重置对象引用的操作
+
+        system_actions: [(system_id, action_id), ...]
+        """
+        self.filter(object_type=object_type, object_id=object_id).delete()
+        self.bulk_create(
+            [
+                self.model(system_id=system_id, action_id=action_id, object_type=object_type, object_id=object_id)
+                for system_id, action_id in set(system_actions)
+            ],
+            batch_size=100,
+        )
+
+    def delete_object(self, object_type: str, object_id: int):
+        self.filter(object_type=object_type, object_id=object_id).delete()
+
+    def delete_action_relation(self, object_type: str, object_ids: List[int], system_id: str, action_id: str):
+        """
+        删除对象与某个操作的引用关系
+        """
+        self.filter(
+            object_type=object_type, object_id__in=object_ids, system_id=system_id, action_id=action_id
+        ).delete()
+
+    def list_object_ids(self, object_type: str, system_id: str, action_id: str) -> List[int]:
+        """
+        查询引用了操作的对象ID列表
+        """
+        return list(
+            self.filter(system_id=system_id, action_id=action_id, object_type=object_type).values_list(
+                "object_id", flat=True
+            )
+        )
+
+    def reset_template_actions(self, template_id: int, system_id: str, action_ids: List[str]):
+        self.reset_object_actions(
+            ActionRelatedObjectType.TEMPLATE.value, template_id, [(system_id, action_id) for action_id in action_ids]
+        )
+
+    def delete_template(self, template_id: int):
+        self.delete_object(ActionRelatedObjectType.TEMPLATE.value, template_id)
+
+    def list_template_ids(self, system_id: str, action_id: str) -> List[int]:
+        return self.list_object_ids(ActionRelatedObjectType.TEMPLATE.value, system_id, action_id)
+
+    def reset_role_scope_actions(self, role_id: int, system_actions: Iterable[Tuple[str, str]]):
+        self.reset_object_actions(ActionRelatedObjectType.ROLE_SCOPE.value, role_id, system_actions)
+
+    def delete_role_scope(self, role_id: int):
+        self.delete_object(ActionRelatedObjectType.ROLE_SCOPE.value, role_id)
+
+    def list_role_ids(self, system_id: str, action_id: str) -> List[int]:
+        return self.list_object_ids(ActionRelatedObjectType.ROLE_SCOPE.value, system_id, action_id)
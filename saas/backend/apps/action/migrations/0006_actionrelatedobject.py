@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+# Generated by Django 2.2.14 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+from backend.util.json import json_loads
+
+
+def init_action_related_object(apps, schema_editor):
+    """
+    初始化已有权限模板与角色授权范围的操作引用关系
+    """
+    ActionRelatedObject = apps.get_model("action", "ActionRelatedObject")
+    PermTemplate = apps.get_model("template", "PermTemplate")
+    RoleScope = apps.get_model("role", "RoleScope")
+
+    related_objects = []
+    for template_id, system_id, action_ids in PermTemplate.objects.values_list("id", "system_id", "_action_ids"):
+        related_objects.extend(
+            ActionRelatedObject(
+                system_id=system_id, action_id=action_id, object_type="template", object_id=template_id
+            )
+            for action_id in set(json_loads(action_ids))
+        )
+
+    for role_id, content in RoleScope.objects.filter(type="authorization").values_list("role_id", "content"):
+        system_actions = {
+            (scope["system_id"], action["id"]) for scope in json_loads(content) for action in scope["actions"]
+        }
+        related_objects.extend(
+            ActionRelatedObject(system_id=system_id, action_id=action_id, object_type="role_scope", object_id=role_id)
+            for system_id, action_id in system_actions
+        )
+
+    ActionRelatedObject.objects.bulk_create(related_objects, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0005_auto_20210407_2013'),
+        ('role', '0009_rolesource'),
+        ('template', '0012_auto_20210330_1426'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActionRelatedObject',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('system_id', models.CharField(max_length=32, verbose_name='系统ID')),
+                ('action_id', models.CharField(max_length=64, verbose_name='操作ID')),
+                (
+                    'object_type',
+                    models.CharField(
+                        choices=[('template', '权限模板'), ('role_scope', '角色授权范围')],
+                        max_length=32,
+                        verbose_name='对象类型',
+                    ),
+                ),
+                ('object_id', models.IntegerField(verbose_name='对象ID')),
+            ],
+            options={
+                'verbose_name': '操作引用关系',
+                'verbose_name_plural': '操作引用关系',
+                'unique_together': {('object_type', 'object_id', 'system_id', 'action_id')},
+                'index_together': {('system_id', 'action_id', 'object_type')},
+            },
+        ),
+        migrations.RunPython(init_action_related_object, migrations.RunPython.noop),
+    ]
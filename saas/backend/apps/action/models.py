@@ -8,14 +8,15 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
-
 from django.db import models
 
-from backend.util.json import json_dumps
+from backend.common.models import LazyJSONField, LazyJSONModelMixin
+from backend.service.constants import ActionRelatedObjectType
+
+from .managers import ActionRelatedObjectManager
 
 
-class AggregateAction(models.Model):
+class AggregateAction(LazyJSONModelMixin, models.Model):
     system_id = models.CharField("系统ID", max_length=32)
     _action_ids = models.TextField("操作列表", db_column="action_ids")
     _aggregate_resource_type = models.TextField("聚合资源类型", db_column="aggregate_resource_type")
@@ -26,18 +27,24 @@ class AggregateAction(models.Model):
 
         index_together = ["system_id"]
 
-    @property
-    def action_ids(self):
-        return json.loads(self._action_ids)
+    action_ids = LazyJSONField("_action_ids")
+    aggregate_resource_type = LazyJSONField("_aggregate_resource_type")
+
 
-    @action_ids.setter
-    def action_ids(self, action_ids):
-        self._action_ids = json_dumps(action_ids)
+class ActionRelatedObject(models.Model):
+    """
+    操作被引用关系, 权限模板的操作与角色授权范围的操作的反查索引
+    """
 
-    @property
-    def aggregate_resource_type(self):
-        return json.loads(self._aggregate_resource_type)
+    system_id = models.CharField("系统ID", max_length=32)
+    action_id = models.CharField("操作ID", max_length=64)
+    object_type = models.CharField("对象类型", max_length=32, choices=ActionRelatedObjectType.get_choices())
+    object_id = models.IntegerField("对象ID")
+
+    objects = ActionRelatedObjectManager()
 
-    @aggregate_resource_type.setter
-    def aggregate_resource_type(self, aggregate_resource_type):
-        self._aggregate_resource_type = json_dumps(aggregate_resource_type)
+    class Meta:
+        verbose_name = "操作引用关系"
+        verbose_name_plural = "操作引用关系"
+        unique_together = ["object_type", "object_id", "system_id", "action_id"]
+        index_together = [["system_id", "action_id", "object_type"]]
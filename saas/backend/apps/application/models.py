@@ -8,13 +8,10 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
-
 from django.db import models
 
-from backend.common.models import BaseModel
+from backend.common.models import BaseModel, LazyJSONField
 from backend.service.constants import ApplicationStatus, ApplicationTypeEnum
-from backend.util.json import json_dumps
 
 
 class Application(BaseModel):
@@ -39,10 +36,4 @@ class Application(BaseModel):
         ordering = ["-id"]
         index_together = ["created_time"]
 
-    @property
-    def data(self):
-        return json.loads(self._data)
-
-    @data.setter
-    def data(self, data):
-        self._data = json_dumps(data)
+    data = LazyJSONField("_data")
@@ -13,6 +13,7 @@ import logging
 from celery import task
 
 from backend.biz.application import ApplicationBiz
+from backend.common.concurrency import concurrent_map
 from backend.service.constants import ApplicationStatus
 
 from .models import Application
@@ -20,29 +21,59 @@ from .models import Application
 logger = logging.getLogger("celery")
 
 
+# 每页处理的审批中单据数量
+PENDING_APPLICATION_PAGE_SIZE = 500
+# 并发处理单据结果的最大线程数, 避免对权限后台等服务造成过大的压力
+APPLICATION_HANDLE_MAX_WORKERS = 5
+
+
 @task(ignore_result=True)
 def check_or_update_application_status():
     """
     检查并更新申请单据状态
     由于对接第三方审批系统后，回调权限中心可能出现极小概率回调失败，所以需要周期任务检查补偿
+
+    1. 按创建先后分页查询审批中的单据, 查询状态时只加载单号
+    2. 分批查询第三方审批系统的单据状态
+    3. 只加载已结束的单据完整数据, 并通过有限的线程池并发处理, 单据的处理以ID与审批中状态为条件保证幂等
     """
-    # 查询未结束的申请单据
     # TODO: 是否需要过滤超过多久没处理才查询，但也有可能导致某些单据无法快速回调
-    applications = Application.objects.filter(status=ApplicationStatus.PENDING.value)
-    if not applications:
-        return
-
-    # 查询状态
     biz = ApplicationBiz()
-    id_status_dict = biz.query_application_approval_status(applications)
+    last_id = 0
+    while True:
+        applications = list(
+            Application.objects.filter(status=ApplicationStatus.PENDING.value, id__gt=last_id)
+            .order_by("id")
+            .only("id", "sn")[:PENDING_APPLICATION_PAGE_SIZE]
+        )
+        if not applications:
+            return
+        last_id = applications[-1].id
 
-    # 遍历每个申请单，进行审批处理
-    for application in applications:
         try:
-            status = id_status_dict.get(application.id)
-            # 若查询不到，则忽略
-            if status is None:
-                continue
-            biz.handle_application_result(application, status)
+            # 查询状态
+            id_status_dict = biz.query_application_approval_status(applications)
         except Exception as error:  # pylint: disable=broad-except
             logger.exception(error)
+            continue
+
+        # 若查询不到或还在审批中，则忽略
+        finished_ids = [
+            a.id for a in applications if id_status_dict.get(a.id) not in [None, ApplicationStatus.PENDING.value]
+        ]
+        if not finished_ids:
+            continue
+
+        finished_applications = Application.objects.filter(id__in=finished_ids)
+        concurrent_map(
+            lambda application: _handle_application_result(biz, application, id_status_dict.get(application.id)),
+            finished_applications,
+            max_workers=APPLICATION_HANDLE_MAX_WORKERS,
+        )
+
+
+def _handle_application_result(biz: ApplicationBiz, application: Application, status: ApplicationStatus):
+    try:
+        biz.handle_application_result(application, status)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception(error)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import logging
+
+from celery import task
+from django.core.cache import cache
+
+from backend.plugins.approval_process.itsm import PROCESS_WITH_NODES_REFRESH_LOCK_KEY, ITSMApprovalProcessProvider
+
+logger = logging.getLogger("celery")
+
+
+@task(ignore_result=True)
+def refresh_approval_process_with_nodes():
+    """
+    刷新带节点的审批流程列表缓存，避免页面请求时同步查询所有流程节点
+    """
+    try:
+        ITSMApprovalProcessProvider().refresh_list_with_nodes()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("refresh_approval_process_with_nodes error")
+    finally:
+        # 释放请求中触发后台刷新时加的锁
+        cache.delete(PROCESS_WITH_NODES_REFRESH_LOCK_KEY)
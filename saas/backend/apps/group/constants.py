@@ -50,3 +50,6 @@ GROUP_SAAS_ATTRIBUTE_VALUE_TYPE_MAP = {
 
 # 每个属性的默认值
 GROUP_SAAS_ATTRIBUTE_DEFAULT_VALUE_MAP = {GroupSaaSAttributeEnum.READONLY.value: False}
+
+# 批量查询用户组有权限的系统时, 单次最多查询的用户组数量
+GROUP_SYSTEM_COUNTER_MAX_COUNT = 100
@@ -20,7 +20,7 @@ from rest_framework import serializers
 from backend.apps.application.base_serializers import BaseAggActionListSLZ, validate_action_repeat
 from backend.apps.application.serializers import ExpiredAtSLZ, SystemInfoSLZ
 from backend.apps.group.models import Group
-from backend.apps.policy.serializers import BasePolicyActionSLZ, ResourceTypeSLZ
+from backend.apps.policy.serializers import BasePolicyActionSLZ, PolicySystemSLZ, ResourceTypeSLZ
 from backend.apps.role.models import Role, RoleRelatedObject
 from backend.apps.template.models import PermTemplatePolicyAuthorized
 from backend.biz.group import GroupBiz, GroupCheckBiz
@@ -33,7 +33,7 @@ from backend.service.models.system import Subject
 from backend.service.system import SystemService
 
 from ...service.constants import ADMIN_USER
-from .constants import GroupMemberType
+from .constants import GROUP_SYSTEM_COUNTER_MAX_COUNT, GroupMemberType
 
 
 class GroupMemberSLZ(serializers.Serializer):
@@ -49,6 +49,30 @@ class GroupIdSLZ(serializers.Serializer):
     id = serializers.IntegerField(label="用户ID")
 
 
+class GroupIdsQuerySLZ(serializers.Serializer):
+    ids = serializers.CharField(label="用户组ID，多个以英文逗号分隔")
+
+    def validate(self, data):
+        # 验证 ID的合法性，并转化为后续view需要数据格式
+        ids = data.get("ids") or ""
+        try:
+            data["ids"] = list(map(int, filter(None, ids.split(","))))
+        except Exception:  # pylint: disable=broad-except
+            raise serializers.ValidationError({"ids": [f"用户组IDS({ids})非法，用户组ID只能是数字"]})
+
+        if len(data["ids"]) == 0:
+            raise serializers.ValidationError({"ids": "should not be empty"})
+        if len(data["ids"]) > GROUP_SYSTEM_COUNTER_MAX_COUNT:
+            raise serializers.ValidationError({"ids": f"should not be more than {GROUP_SYSTEM_COUNTER_MAX_COUNT}"})
+
+        return data
+
+
+class GroupSystemCounterSLZ(serializers.Serializer):
+    id = serializers.IntegerField(label="用户组ID")
+    systems = PolicySystemSLZ(label="系统", many=True)
+
+
 class GroupSLZ(serializers.ModelSerializer):
     role = serializers.SerializerMethodField()
     attributes = serializers.SerializerMethodField()
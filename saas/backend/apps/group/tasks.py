@@ -22,6 +22,7 @@ from backend.biz.template import TemplateBiz
 from backend.common.time import db_time
 from backend.long_task.constants import TaskType
 from backend.long_task.task import StepTask, register_handler
+from backend.publisher.buffer import buffered_publish
 from backend.service.models import Subject
 
 from .audit import log_group_cleanup_member_audit_event
@@ -46,20 +47,22 @@ def group_cleanup_expired_member():
         return
 
     for i in paginator.page_range:
-        for group in paginator.page(i):
-            # 查询指定过期时间之前的成员数量
-            count = biz.get_member_count_before_expired_at(group.id, expired_at)
-            if count == 0:
-                continue
-
-            # 分页删除过期的成员
-            for offset in range(0, count, limit):
-                _, members = biz.list_paging_members_before_expired_at(group.id, expired_at, limit, offset)
-                subjects = parse_obj_as(List[Subject], members)
-                biz.remove_members(str(group.id), subjects)
-
-                # 记审计信息
-                log_group_cleanup_member_audit_event(task_id, group, subjects)
+        # 每页的删除策略事件合并后一次发布
+        with buffered_publish():
+            for group in paginator.page(i):
+                # 查询指定过期时间之前的成员数量
+                count = biz.get_member_count_before_expired_at(group.id, expired_at)
+                if count == 0:
+                    continue
+
+                # 分页删除过期的成员
+                for offset in range(0, count, limit):
+                    _, members = biz.list_paging_members_before_expired_at(group.id, expired_at, limit, offset)
+                    subjects = parse_obj_as(List[Subject], members)
+                    biz.remove_members(str(group.id), subjects)
+
+                    # 记审计信息
+                    log_group_cleanup_member_audit_event(task_id, group, subjects)
 
 
 @register_handler(TaskType.GROUP_AUTHORIZATION.value)
@@ -15,6 +15,10 @@ from . import views
 urlpatterns = [
     path("", views.GroupViewSet.as_view({"get": "list", "post": "create"}), name="group.group"),
     path("transfer/", views.GroupTransferView.as_view(), name="group.transfer"),
+    # 批量查询用户组有权限的系统
+    path(
+        "systems/", views.GroupsSystemCounterViewSet.as_view({"get": "list"}), name="group.list_groups_policy_system"
+    ),
     # 用户组详情
     path(
         "<str:id>/",
@@ -25,7 +25,8 @@ from backend.account.permissions import RolePermission, role_perm_class
 from backend.apps.application.serializers import ConditionCompareSLZ, ConditionTagSLZ
 from backend.apps.group import tasks  # noqa
 from backend.apps.group.models import Group
-from backend.apps.policy.serializers import PolicyDeleteSLZ, PolicySLZ, PolicySystemSLZ
+from backend.apps.policy.mixins import SubjectPolicyListMixin
+from backend.apps.policy.serializers import PolicyDeleteSLZ, PolicyListQuerySLZ, PolicySLZ, PolicySystemSLZ
 from backend.apps.template.models import PermTemplatePolicyAuthorized
 from backend.audit.audit import audit_context_setter, view_audit_decorator
 from backend.biz.group import GroupBiz, GroupCheckBiz, GroupMemberExpiredAtBean
@@ -34,9 +35,9 @@ from backend.biz.policy_tag import ConditionTagBean, ConditionTagBiz
 from backend.biz.role import RoleBiz, RoleListQuery, RoleObjectRelationChecker
 from backend.biz.template import TemplateBiz
 from backend.biz.trans.group import GroupTrans
+from backend.common.constants import TranslateModeEnum
 from backend.common.error_codes import error_codes
 from backend.common.filters import NoCheckModelFilterBackend
-from backend.common.serializers import SystemQuerySLZ
 from backend.common.swagger import PaginatedResponseSwaggerAutoSchema, ResponseSwaggerAutoSchema
 from backend.common.time import PERMANENT_SECONDS
 from backend.service.constants import PermissionCodeEnum, RoleType, SubjectType
@@ -62,9 +63,11 @@ from .serializers import (
     GroupCreateSLZ,
     GroupDeleteMemberSLZ,
     GroupIdSLZ,
+    GroupIdsQuerySLZ,
     GroupMemberUpdateExpiredAtSLZ,
     GroupPolicyUpdateSLZ,
     GroupSLZ,
+    GroupSystemCounterSLZ,
     GroupTemplateDetailSchemaSLZ,
     GroupTemplateDetailSLZ,
     GroupTemplateSchemaSLZ,
@@ -399,7 +402,7 @@ class GroupTemplateViewSet(GroupPermissionMixin, GenericViewSet):
         return Response(GroupTemplateDetailSLZ(authorized_template).data)
 
 
-class GroupPolicyViewSet(GroupPermissionMixin, GenericViewSet):
+class GroupPolicyViewSet(GroupPermissionMixin, SubjectPolicyListMixin, GenericViewSet):
 
     permission_classes = [RolePermission]
     action_permission = {
@@ -411,6 +414,7 @@ class GroupPolicyViewSet(GroupPermissionMixin, GenericViewSet):
     paginator = None  # 去掉swagger中的limit offset参数
     queryset = Group.objects.all()
     lookup_field = "id"
+    translate_mode = TranslateModeEnum.SCHEMA.value
 
     policy_query_biz = PolicyQueryBiz()
     policy_operation_biz = PolicyOperationBiz()
@@ -447,22 +451,16 @@ class GroupPolicyViewSet(GroupPermissionMixin, GenericViewSet):
     @swagger_auto_schema(
         operation_description="用户组自定义权限列表",
         auto_schema=ResponseSwaggerAutoSchema,
-        query_serializer=SystemQuerySLZ,
+        query_serializer=PolicyListQuerySLZ,
         responses={status.HTTP_200_OK: PolicySLZ(label="策略", many=True)},
         tags=["group"],
     )
     def list(self, request, *args, **kwargs):
-        slz = SystemQuerySLZ(data=request.query_params)
-        slz.is_valid(raise_exception=True)
-
-        system_id = slz.validated_data["system_id"]
         group = get_object_or_404(self.queryset, pk=kwargs["id"])
 
         subject = Subject(type=SubjectType.GROUP.value, id=str(group.id))
 
-        policies = self.policy_query_biz.list_by_subject(system_id, subject)
-
-        return Response([p.dict() for p in policies])
+        return self.list_subject_policies(request, subject)
 
     @swagger_auto_schema(
         operation_description="用户组删除自定义权限",
@@ -541,6 +539,32 @@ class GroupSystemViewSet(GenericViewSet):
         return Response([one.dict() for one in data])
 
 
+class GroupsSystemCounterViewSet(GroupQueryMixin, GenericViewSet):
+
+    paginator = None  # 去掉swagger中的limit offset参数
+    queryset = Group.objects.all()
+
+    biz = GroupBiz()
+
+    @swagger_auto_schema(
+        operation_description="批量查询用户组有权限的所有系统列表",
+        auto_schema=ResponseSwaggerAutoSchema,
+        query_serializer=GroupIdsQuerySLZ(),
+        responses={status.HTTP_200_OK: GroupSystemCounterSLZ(label="用户组系统", many=True)},
+        tags=["group"],
+    )
+    def list(self, request, *args, **kwargs):
+        slz = GroupIdsQuerySLZ(data=request.query_params)
+        slz.is_valid(raise_exception=True)
+
+        # 只查询当前角色可访问的用户组
+        group_ids = list(self.get_queryset().filter(id__in=slz.validated_data["ids"]).values_list("id", flat=True))
+        data = self.biz.list_system_counter_by_groups(group_ids)
+        return Response(
+            [{"id": group_id, "systems": [one.dict() for one in systems]} for group_id, systems in data.items()]
+        )
+
+
 class GroupTransferView(views.APIView):
     """
     用户组转出
@@ -8,14 +8,12 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 from typing import Dict, List, Tuple, Union
 
 from django.db import models
 
 from backend.apps.model_builder.constants import ModelSectionEnum, ModelSectionTypeDict, ModelSectionTypeList
-from backend.common.models import BaseModel
-from backend.util.json import json_dumps
+from backend.common.models import BaseModel, LazyJSONField
 
 
 class MockSystemModel(BaseModel):
@@ -37,15 +35,7 @@ class MockSystemModel(BaseModel):
     def system(self) -> Dict:
         return self.data.get(ModelSectionEnum.SYSTEM.value, {})
 
-    @property
-    def data(self) -> Dict:
-        if not self._data:
-            return {}
-        return json.loads(self._data)
-
-    @data.setter
-    def data(self, data: Dict):
-        self._data = json_dumps(data)
+    data = LazyJSONField("_data", default=dict)
 
     def add_or_update_section(self, section: str, data: Union[List, Dict]) -> None:
         """
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+部门祖先闭包索引
+
+部门树只会在组织架构全量同步时变更, 因此在进程内存中缓存部门的父子关系, 通过版本号在同步后失效,
+用于替代逐个部门解析ancestors JSON字段来判断部门/用户是否在某个部门范围内
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.biz.organization import DEFAULT_CATEGORY_NAME, get_category_dict
+from backend.util.cache import VersionedLocalCache
+
+from .models import Department, DepartmentMember
+
+CLOSURE_VERSION_CACHE_KEY = "bk_iam:org:department_closure:version"
+
+
+class DepartmentClosure:
+    """
+    部门祖先闭包
+    """
+
+    def __init__(self, parents: Dict[int, Optional[int]], names: Dict[int, str]):
+        self._parents = parents
+        self._names = names
+        # 目录ID与名称的映射, 首次使用时加载, 随闭包一起在组织架构同步后失效
+        self._category_names: Optional[Dict[int, str]] = None
+
+    @classmethod
+    def build(cls) -> "DepartmentClosure":
+        parents: Dict[int, Optional[int]] = {}
+        names: Dict[int, str] = {}
+        for _id, parent_id, name in Department.objects.values_list("id", "parent_id", "name").iterator():
+            parents[_id] = parent_id
+            names[_id] = name
+        return cls(parents, names)
+
+    def __contains__(self, department_id: int) -> bool:
+        return department_id in self._parents
+
+    @staticmethod
+    def _query_self_and_ancestors(department_id: int) -> List[Tuple[int, str]]:
+        """
+        闭包中还没有的部门(如组织架构同步后闭包还未重建), 回退到MPTT查询祖先, 从根部门到部门自身
+        """
+        department = Department.objects.filter(id=department_id).first()
+        if department is None:
+            return []
+        return list(department.get_ancestors(include_self=True).values_list("id", "name"))
+
+    def get_ancestor_ids(self, department_id: int) -> List[int]:
+        """
+        部门的祖先ID, 从根部门开始, 不包括部门自身
+        """
+        if department_id not in self._parents:
+            return [_id for _id, _ in self._query_self_and_ancestors(department_id) if _id != department_id]
+
+        ancestor_ids = []
+        parent_id = self._parents.get(department_id)
+        # 使用visited避免脏数据导致的死循环
+        visited = {department_id}
+        while parent_id is not None and parent_id not in visited:
+            ancestor_ids.append(parent_id)
+            visited.add(parent_id)
+            parent_id = self._parents.get(parent_id)
+
+        ancestor_ids.reverse()
+        return ancestor_ids
+
+    def get_path_names(self, department_id: int) -> List[str]:
+        """
+        从根部门到部门自身的名称列表
+        """
+        if department_id not in self._parents:
+            return [name for _, name in self._query_self_and_ancestors(department_id)] or [""]
+
+        ids = self.get_ancestor_ids(department_id)
+        ids.append(department_id)
+        return [self._names.get(_id, "") for _id in ids]
+
+    def get_category_name(self, category_id: int) -> str:
+        """
+        目录名称
+        """
+        if self._category_names is None:
+            self._category_names = get_category_dict()
+        return self._category_names.get(category_id) or DEFAULT_CATEGORY_NAME
+
+    def list_self_and_ancestor_ids(self, department_ids: Iterable[int]) -> Set[int]:
+        """
+        批量获取部门及其所有祖先部门的ID
+        """
+        id_set = set()
+        for _id in department_ids:
+            if _id in id_set:
+                continue
+            id_set.add(_id)
+            id_set.update(self.get_ancestor_ids(_id))
+        return id_set
+
+    def is_department_in_scope(self, department_id: int, scope_department_ids: Set[int]) -> bool:
+        """
+        部门存在, 且部门自身或其任意祖先部门在范围内
+        """
+        # 先确认部门存在, 不存在的部门即使ID在范围内也不满足
+        if department_id not in self._parents:
+            return any(_id in scope_department_ids for _id, _ in self._query_self_and_ancestors(department_id))
+
+        if department_id in scope_department_ids:
+            return True
+
+        parent_id = self._parents.get(department_id)
+        visited = {department_id}
+        while parent_id is not None and parent_id not in visited:
+            if parent_id in scope_department_ids:
+                return True
+            visited.add(parent_id)
+            parent_id = self._parents.get(parent_id)
+
+        return False
+
+    def filter_departments_in_scope(self, department_ids: Iterable[int], scope_department_ids: Set[int]) -> Set[int]:
+        """
+        批量筛选出在范围内的部门
+        """
+        return {_id for _id in department_ids if self.is_department_in_scope(_id, scope_department_ids)}
+
+    def filter_users_in_scope(self, user_ids: Iterable[int], scope_department_ids: Set[int]) -> Set[int]:
+        """
+        批量筛选出在范围内的用户(用户AutoID), 用户的任意一个所在部门在范围内即可
+
+        只需一次DB查询用户的直接部门
+        """
+        user_ids = list(user_ids)
+        if not user_ids or not scope_department_ids:
+            return set()
+
+        in_scope_user_ids = set()
+        members = DepartmentMember.objects.filter(user_id__in=user_ids).values_list("user_id", "department_id")
+        for user_id, department_id in members:
+            if user_id in in_scope_user_ids:
+                continue
+            if self.is_department_in_scope(department_id, scope_department_ids):
+                in_scope_user_ids.add(user_id)
+
+        return in_scope_user_ids
+
+
+department_closure_cache = VersionedLocalCache(CLOSURE_VERSION_CACHE_KEY, DepartmentClosure.build)
+
+
+def get_department_closure() -> DepartmentClosure:
+    return department_closure_cache.get()
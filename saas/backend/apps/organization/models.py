@@ -8,7 +8,6 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import logging
 from typing import Dict, List
 
@@ -17,8 +16,7 @@ from mptt.managers import TreeManager
 from mptt.models import MPTTModel, TreeForeignKey
 
 from backend.apps.organization.constants import SYNC_TASK_DEFAULT_EXECUTOR, StaffStatus, SyncTaskStatus, SyncType
-from backend.biz.organization import get_category_name
-from backend.common.models import TimestampedModel
+from backend.common.models import LazyJSONField, TimestampedModel
 
 logger = logging.getLogger("app")
 
@@ -65,10 +63,9 @@ class User(TimestampedModel):
             "department_id", flat=True
         )
         # 查询所有部门的祖先，包括直接部门自身
-        department_id_set = set(direct_department_ids)
-        if department_id_set:
-            for dept in Department.objects.filter(id__in=direct_department_ids):
-                department_id_set.update(dept.ancestor_ids)
+        from .closure import get_department_closure
+
+        department_id_set = get_department_closure().list_self_and_ancestor_ids(direct_department_ids)
         # 仅仅需要ID字段，则直接返回
         return list(department_id_set)
 
@@ -106,29 +103,41 @@ class Department(TimestampMPTTModel):
     def __str__(self):
         return f"{self.id}-{self.name}"
 
+    # 祖先JSON, 每个实例只解析一次
+    _parsed_ancestors = LazyJSONField("ancestors", default=list)
+
     def parse_ancestors(self) -> List[Dict]:
         """解析祖先JSON"""
-        if self.ancestors:
-            try:
-                return json.loads(self.ancestors)
-            except Exception as error:  # pylint: disable=broad-except
-                logger.error(
-                    "parse_ancestors ancestors: %s, department_id: %s, error: %s", self.ancestors, self.id, error
-                )
-                return []
-        return []
+        try:
+            return self._parsed_ancestors
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("parse_ancestors ancestors: %s, department_id: %s, error: %s", self.ancestors, self.id, error)
+            return []
 
     @property
     def ancestor_ids(self) -> List[int]:
+        from .closure import get_department_closure
+
+        closure = get_department_closure()
+        # 闭包未包含的部门(如同步过程中新增的部门)，则直接解析祖先JSON
+        if self.id in closure:
+            return closure.get_ancestor_ids(self.id)
         return [i["id"] for i in self.parse_ancestors()]
 
     @property
     def full_name(self):
         """如：总公司/子公司/分公司"""
-        departments = [i["name"] for i in self.parse_ancestors()]
+        from .closure import get_department_closure
+
+        closure = get_department_closure()
+        if self.id in closure:
+            departments = closure.get_path_names(self.id)[:-1]
+        else:
+            departments = [i["name"] for i in self.parse_ancestors()]
         departments.append(self.name)
         # TODO: 后续重构后，Category与FullName这样的业务逻辑，迁移到Service层拼接
-        category_name = get_category_name(self.category_id)
+        # 目录名称从闭包缓存的目录映射中读取, 避免逐行查询
+        category_name = closure.get_category_name(self.category_id)
         department_names = "/".join(departments)
         return f"{category_name}: {department_names}"
 
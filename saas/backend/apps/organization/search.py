@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+组织架构搜索索引
+
+在进程内存中对部门名称、用户名与用户显示名建立2-gram与单字符倒排索引, 组织架构同步后通过版本号失效,
+新增用户时原地更新, 避免每次搜索都对全表进行 LIKE '%keyword%' 扫描
+"""
+import heapq
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, Generic, Hashable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from backend.util.cache import VersionedLocalCache
+
+from .models import Department, User
+
+SEARCH_INDEX_VERSION_CACHE_KEY = "bk_iam:org:search_index:version"
+
+# 匹配类型, 值越小排序越靠前
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_CONTAINS = 2
+MATCH_FUZZY = 3
+
+# 模糊匹配的关键字最小长度, 过短的关键字容错后几乎能匹配所有文档
+FUZZY_MIN_KEYWORD_LENGTH = 4
+# 关键字长度达到该值时允许2处编辑(插入/删除/替换), 否则只允许1处
+FUZZY_TWO_EDITS_KEYWORD_LENGTH = 8
+
+T = TypeVar("T")
+
+
+def _prefix_edit_distance(keyword: str, text: str, max_distance: int) -> int:
+    """
+    keyword与text任意前缀的最小编辑距离, 超过max_distance时返回max_distance + 1
+    """
+    text = text[: len(keyword) + max_distance]
+    previous = list(range(len(text) + 1))
+    for i, kc in enumerate(keyword, 1):
+        current = [i]
+        for j, tc in enumerate(text, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (kc != tc)))
+        # 每一行的最小值单调不减, 已超过阈值则提前结束
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous)
+
+
+class NGramIndex(Generic[T]):
+    """
+    子串搜索索引
+
+    每个文档包含多个字段, 搜索时用关键字中最稀有的2-gram的倒排列表作为候选集, 再逐个校验子串匹配,
+    单个字符的关键字使用单字符的倒排列表, 与 LIKE '%keyword%' 的结果一致
+
+    没有子串匹配的结果时, 使用与关键字共享足够多2-gram的文档作为候选集,
+    按字段前缀的编辑距离做容错匹配, 兼容输入错误
+    """
+
+    def __init__(self):
+        self._docs: List[T] = []
+        self._fields: List[Tuple[str, ...]] = []
+        self._postings: Dict[str, array] = defaultdict(lambda: array("i"))
+        # 单字符的倒排列表, 用于单个字符的搜索
+        self._char_postings: Dict[str, array] = defaultdict(lambda: array("i"))
+        # 文档key对应的位置, 以及被更新后失效的位置
+        self._positions: Dict[Hashable, int] = {}
+        self._deleted: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    def add(self, doc: T, fields: Sequence[str], key: Optional[Hashable] = None):
+        """
+        添加文档, key默认为文档自身, 相同key的文档已存在时原地更新
+        """
+        key = doc if key is None else key
+        old_position = self._positions.get(key)
+        if old_position is not None:
+            # 倒排列表只追加, 旧位置标记为失效
+            self._deleted.add(old_position)
+
+        position = len(self._docs)
+        lower_fields = tuple(f.lower() for f in fields if f)
+        self._docs.append(doc)
+        self._fields.append(lower_fields)
+        self._positions[key] = position
+
+        grams: Set[str] = set()
+        chars: Set[str] = set()
+        for f in lower_fields:
+            grams.update(self._grams(f))
+            chars.update(f)
+        for g in grams:
+            self._postings[g].append(position)
+        for c in chars:
+            self._char_postings[c].append(position)
+
+    def _candidates(self, keyword: str) -> Sequence[int]:
+        if len(keyword) == 1:
+            return self._char_postings.get(keyword) or []
+
+        grams = [keyword[i : i + 2] for i in range(len(keyword) - 1)]
+
+        smallest = None
+        for g in grams:
+            posting = self._postings.get(g)
+            # 任意一个gram不存在, 则一定没有匹配的文档
+            if posting is None:
+                return []
+            if smallest is None or len(posting) < len(smallest):
+                smallest = posting
+        return smallest or []
+
+    def _fuzzy_candidates(self, keyword: str, max_distance: int) -> List[int]:
+        """
+        每处编辑最多影响2个2-gram, 容错匹配的文档至少包含关键字中 len(grams) - 2 * max_distance 个2-gram
+        """
+        grams = self._grams(keyword)
+        min_shared = max(len(grams) - 2 * max_distance, 1)
+
+        counter: Counter = Counter()
+        for g in grams:
+            counter.update(self._postings.get(g) or [])
+        return [position for position, shared in counter.items() if shared >= min_shared]
+
+    @staticmethod
+    def _match(keyword: str, fields: Tuple[str, ...], is_exact: bool) -> Tuple[int, int]:
+        """
+        返回(匹配类型, 匹配字段长度), 不匹配时匹配类型为-1
+        """
+        best = (-1, 0)
+        for f in fields:
+            if f == keyword:
+                return MATCH_EXACT, len(f)
+
+            if is_exact:
+                continue
+
+            if f.startswith(keyword):
+                match = (MATCH_PREFIX, len(f))
+            elif keyword in f:
+                match = (MATCH_CONTAINS, len(f))
+            else:
+                continue
+
+            if best[0] == -1 or match < best:
+                best = match
+        return best
+
+    @staticmethod
+    def _fuzzy_match(keyword: str, fields: Tuple[str, ...], max_distance: int) -> Tuple[int, int]:
+        """
+        返回(编辑距离, 匹配字段长度), 不匹配时编辑距离为-1
+        """
+        best = (-1, 0)
+        for f in fields:
+            distance = _prefix_edit_distance(keyword, f, max_distance)
+            if distance > max_distance:
+                continue
+
+            match = (distance, len(f))
+            if best[0] == -1 or match < best:
+                best = match
+        return best
+
+    def search(self, keyword: str, limit: int, is_exact: bool = False) -> Tuple[int, List[T]]:
+        """
+        搜索, 返回匹配的总数与排序后的前limit个文档
+
+        排序规则: 完全匹配 > 前缀匹配 > 包含匹配, 相同匹配类型下字段越短越靠前,
+        没有匹配时返回容错匹配的结果, 编辑距离越小、字段越短越靠前
+        """
+        keyword = keyword.strip().lower()
+        if not keyword:
+            return 0, []
+
+        matches = []
+        for position in self._candidates(keyword):
+            if position in self._deleted:
+                continue
+            match_type, length = self._match(keyword, self._fields[position], is_exact)
+            if match_type != -1:
+                matches.append((match_type, length, position))
+
+        if not matches and not is_exact:
+            matches = self._fuzzy_search(keyword)
+
+        top = heapq.nsmallest(limit, matches)
+        return len(matches), [self._docs[position] for _, _, position in top]
+
+    def _fuzzy_search(self, keyword: str) -> List[Tuple[int, int, int]]:
+        if len(keyword) < FUZZY_MIN_KEYWORD_LENGTH:
+            return []
+
+        max_distance = 2 if len(keyword) >= FUZZY_TWO_EDITS_KEYWORD_LENGTH else 1
+        matches = []
+        for position in self._fuzzy_candidates(keyword, max_distance):
+            if position in self._deleted:
+                continue
+            distance, length = self._fuzzy_match(keyword, self._fields[position], max_distance)
+            if distance != -1:
+                # 容错匹配排在所有子串匹配之后
+                matches.append((MATCH_FUZZY + distance, length, position))
+        return matches
+
+
+class OrganizationSearchIndex:
+    """
+    组织架构搜索索引
+    """
+
+    def __init__(self, department_index: NGramIndex[int], user_index: NGramIndex[Tuple[str, str]]):
+        self.department_index = department_index
+        self.user_index = user_index
+
+    @classmethod
+    def build(cls) -> "OrganizationSearchIndex":
+        department_index: NGramIndex[int] = NGramIndex()
+        for _id, name in Department.objects.values_list("id", "name").iterator():
+            department_index.add(_id, [name])
+
+        user_index: NGramIndex[Tuple[str, str]] = NGramIndex()
+        for username, display_name in User.objects.values_list("username", "display_name").iterator():
+            user_index.add((username, display_name), [username, display_name or ""], key=username)
+
+        return cls(department_index, user_index)
+
+    def add_user(self, username: str, display_name: str):
+        """
+        新增或更新单个用户
+        """
+        self.user_index.add((username, display_name), [username, display_name or ""], key=username)
+
+    def search_department(self, keyword: str, limit: int, is_exact: bool = False) -> Tuple[int, List[int]]:
+        """
+        搜索部门, 返回匹配总数与部门ID列表
+        """
+        return self.department_index.search(keyword, limit, is_exact)
+
+    def search_user(self, keyword: str, limit: int, is_exact: bool = False) -> Tuple[int, List[Tuple[str, str]]]:
+        """
+        搜索用户, 返回匹配总数与(username, display_name)列表
+        """
+        return self.user_index.search(keyword, limit, is_exact)
+
+
+def _apply_user_update(index: OrganizationSearchIndex, item: Any):
+    username, display_name = item
+    index.add_user(username, display_name)
+
+
+# 新增用户通过update([[username, display_name], ...])原地更新所有进程的索引
+organization_search_index_cache = VersionedLocalCache(
+    SEARCH_INDEX_VERSION_CACHE_KEY, OrganizationSearchIndex.build, updater=_apply_user_update
+)
+
+
+def get_organization_search_index() -> OrganizationSearchIndex:
+    return organization_search_index_cache.get()
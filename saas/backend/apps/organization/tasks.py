@@ -15,7 +15,9 @@ from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 
+from backend.apps.organization.closure import department_closure_cache
 from backend.apps.organization.models import SyncRecord
+from backend.apps.organization.search import organization_search_index_cache
 from backend.biz.org_sync.department import DBDepartmentSyncExactInfo, DBDepartmentSyncService
 from backend.biz.org_sync.department_member import DBDepartmentMemberSyncService
 from backend.biz.org_sync.iam_department import IAMBackendDepartmentSyncService
@@ -74,6 +76,10 @@ def sync_organization(executor: str = SYNC_TASK_DEFAULT_EXECUTOR):
             # 计算和同步部门的冗余数据
             DBDepartmentSyncExactInfo().sync_to_db()
 
+        # 组织架构已变更，失效所有进程的部门闭包与搜索索引
+        department_closure_cache.invalidate()
+        organization_search_index_cache.invalidate()
+
         # 2. SaaS 将DB存储的组织架构同步给IAM后台
         iam_backend_user_sync_service = IAMBackendUserSyncService()
         iam_backend_department_sync_service = IAMBackendDepartmentSyncService()
@@ -8,7 +8,6 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from django.db.models import Q
 from drf_yasg.openapi import Response as yasg_response
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, views
@@ -18,6 +17,7 @@ from rest_framework.viewsets import GenericViewSet
 from backend.account.permissions import role_perm_class
 from backend.apps.organization.constants import SyncType
 from backend.apps.organization.models import Department, SyncRecord, User
+from backend.apps.organization.search import get_organization_search_index
 from backend.apps.organization.serializers import (
     DepartmentSLZ,
     OrganizationCategorySLZ,
@@ -31,7 +31,6 @@ from backend.apps.organization.tasks import sync_organization
 from backend.common.swagger import ResponseSwaggerAutoSchema
 from backend.component import usermgr
 from backend.service.constants import PermissionCodeEnum
-from backend.util.cache import region
 
 
 class CategoryViewSet(GenericViewSet):
@@ -131,22 +130,6 @@ class OrganizationViewSet(GenericViewSet):
 
     paginator = None  # 去掉swagger中的limit offset参数
 
-    @region.cache_on_arguments(expiration_time=60 * 5)
-    def get_search_data(self, keyword, is_exact, limit):
-        """
-        获取search数据
-        """
-        # 默认模糊匹配
-        department_query_condition = Q(name__icontains=keyword)
-        user_query_condition = Q(display_name__icontains=keyword) | Q(username__icontains=keyword)
-        if is_exact:
-            department_query_condition = Q(name=keyword)
-            user_query_condition = Q(display_name=keyword) | Q(username=keyword)
-
-        departments = Department.objects.filter(department_query_condition)[0:limit]
-        users = User.objects.filter(user_query_condition)[0:limit]
-        return departments, users
-
     @swagger_auto_schema(
         operation_description="组织架构 - 搜索",
         auto_schema=ResponseSwaggerAutoSchema,
@@ -155,18 +138,24 @@ class OrganizationViewSet(GenericViewSet):
         tags=["organization"],
     )
     def list(self, request, *args, **kwargs):
-        # TODO: 添加Cache,组织架构变动则clear cache
         slz = OrganizationSearchSLZ(data=request.query_params)
         slz.is_valid(raise_exception=True)
         keyword = slz.validated_data["keyword"]
         is_exact = slz.validated_data.get("is_exact")
         limit = 500
 
-        departments, users = self.get_search_data(keyword, is_exact, limit)
+        # 使用内存中的搜索索引，组织架构同步后索引会自动重建
+        search_index = get_organization_search_index()
+        department_count, department_ids = search_index.search_department(keyword, limit, is_exact)
+        user_count, users = search_index.search_user(keyword, limit, is_exact)
         # 最多搜索各500个，超过则提示太多
-        if len(departments) == limit or len(users) == limit:
+        if department_count >= limit or user_count >= limit:
             return Response({"is_too_much": True, "departments": [], "users": []})
 
+        # 按搜索结果的排序返回部门
+        department_dict = {d.id: d for d in Department.objects.filter(id__in=department_ids)}
+        departments = [department_dict[_id] for _id in department_ids if _id in department_dict]
+
         data = {
             "is_too_much": False,
             "departments": [
@@ -180,7 +169,7 @@ class OrganizationViewSet(GenericViewSet):
                 }
                 for r in departments
             ],
-            "users": [{"username": i.username, "name": i.display_name} for i in users],
+            "users": [{"username": username, "name": display_name} for username, display_name in users],
         }
         return Response(data)
 
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import time
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand
+from pydantic import parse_obj_as
+
+from backend.biz.policy_tag import ConditionTagBean, ConditionTagBiz
+from backend.service.models.policy import Policy
+
+
+def gen_conditions(start: int, count: int) -> List[Dict[str, Any]]:
+    """
+    生成包含count条实例路径的条件数据, 用于基准测试
+    """
+    path = [
+        [
+            {"system_id": "bk_cmdb", "type": "biz", "id": "1", "name": "biz1"},
+            {"system_id": "bk_cmdb", "type": "host", "id": str(i), "name": f"host{i}"},
+        ]
+        for i in range(start, start + count)
+    ]
+    return [
+        {"id": "1", "instances": [{"type": "host", "name": "主机", "path": path}], "attributes": []},
+        {
+            "id": "2",
+            "instances": [],
+            "attributes": [{"id": "os", "name": "os", "values": [{"id": "linux", "name": "linux"}]}],
+        },
+    ]
+
+
+def gen_policy(conditions: List[Dict[str, Any]]) -> Policy:
+    return Policy.parse_obj(
+        {
+            "id": "view_host",
+            "related_resource_types": [{"system_id": "bk_cmdb", "type": "host", "condition": conditions}],
+            "expired_at": 0,
+        }
+    )
+
+
+class Command(BaseCommand):
+    help = "benchmark condition compare and tag / policy diff on large conditions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", action="store", dest="count", type=int, default=10000, help="instance paths")
+        parser.add_argument("-r", action="store", dest="rounds", type=int, default=10, help="rounds")
+
+    def handle(self, *args, **options):
+        count, rounds = options["count"], options["rounds"]
+        # 新旧数据有一半路径重叠
+        new_conditions = gen_conditions(count // 2, count)
+        old_conditions = gen_conditions(0, count)
+
+        self.stdout.write(f"conditions with {count} instance paths")
+        biz = ConditionTagBiz()
+        self._bench(
+            "compare_and_tag",
+            rounds,
+            lambda: (
+                parse_obj_as(List[ConditionTagBean], new_conditions),
+                parse_obj_as(List[ConditionTagBean], old_conditions),
+            ),
+            lambda new, old: biz.compare_and_tag(new, old, is_template=True),
+        )
+        self._bench(
+            "policy diff",
+            rounds,
+            lambda: (gen_policy(new_conditions), gen_policy(old_conditions)),
+            lambda new, old: new.diff(old),
+        )
+
+    def _bench(self, name, rounds, setup, func):
+        # 比较过程会在数据上打标签, 每轮重新生成数据, 只统计比较的耗时
+        cost = 0.0
+        for _ in range(rounds):
+            new, old = setup()
+            start = time.perf_counter()
+            func(new, old)
+            cost += time.perf_counter() - start
+        self.stdout.write(f"{name}: {cost / rounds * 1000:.1f} ms/compare")
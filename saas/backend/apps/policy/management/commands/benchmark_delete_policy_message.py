@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.publisher.codec import decode_message, encode_message
+from backend.publisher.constants import DeletePolicyTypeEnum
+from backend.util.json import json_dumps
+
+
+class Command(BaseCommand):
+    help = "benchmark size and throughput of delete policy pub/sub message formats"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", action="store", dest="count", type=int, default=10000, help="policy ids per message")
+        parser.add_argument("-r", action="store", dest="rounds", type=int, default=100, help="rounds of encode/decode")
+
+    def handle(self, *args, **options):
+        count, rounds = options["count"], options["rounds"]
+
+        # 模拟批量删除时的策略ID: 大体连续, 夹杂少量跳跃
+        policy_ids, _id = [], random.randint(1, 10 ** 7)
+        for _ in range(count):
+            _id += random.choice((1, 1, 1, 2, 3, 50))
+            policy_ids.append(_id)
+        message = {
+            "timestamp": int(time.time()),
+            "type": DeletePolicyTypeEnum.POLICY.value,
+            "data": {"policy_ids": policy_ids},
+        }
+
+        json_raw = json_dumps(message).encode()
+        compact_raw = encode_message(message)
+        self.stdout.write(f"policy ids per message: {count}")
+        self.stdout.write(f"json size: {len(json_raw)} bytes, compact size: {len(compact_raw)} bytes")
+        self.stdout.write(f"compression ratio: {len(json_raw) / len(compact_raw):.2f}")
+
+        self._bench("json encode", rounds, lambda: json_dumps(message))
+        self._bench("json decode", rounds, lambda: decode_message(json_raw))
+        self._bench("compact encode", rounds, lambda: encode_message(message))
+        self._bench("compact decode", rounds, lambda: decode_message(compact_raw))
+
+    def _bench(self, name, rounds, func):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        cost = time.perf_counter() - start
+        self.stdout.write(f"{name}: {cost / rounds * 1000:.3f} ms/message, {rounds / cost:.1f} messages/s")
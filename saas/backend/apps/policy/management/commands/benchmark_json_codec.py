@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.util.json import JSONCodec, OrjsonCodec, codec
+
+from .benchmark_policy_translation import gen_large_policy
+
+
+class Command(BaseCommand):
+    help = "benchmark encode/decode of policy json with stdlib json and the configured codec"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", action="store", dest="count", type=int, default=10000, help="instance paths")
+        parser.add_argument("-r", action="store", dest="rounds", type=int, default=20, help="rounds")
+
+    def handle(self, *args, **options):
+        count, rounds = options["count"], options["rounds"]
+        # 与Policy.resources字段中存储的数据一致
+        resources = [rt.dict() for rt in gen_large_policy(count).related_resource_types]
+
+        codecs = [JSONCodec()]
+        if codec.name == OrjsonCodec.name:
+            codecs.append(codec)
+
+        raw = JSONCodec().dumps(resources)
+        self.stdout.write(f"policy resources with {count} instance paths, {len(raw)} bytes")
+        for one in codecs:
+            # 与标准库的编解码结果是否一致
+            self.stdout.write(f"{one.name} byte-compatible: {one.dumps(resources) == raw}")
+            self.stdout.write(f"{one.name} loads parity: {one.loads(raw) == json.loads(raw)}")
+            self._bench(f"{one.name} dumps", rounds, lambda: one.dumps(resources))
+            self._bench(f"{one.name} loads", rounds, lambda: one.loads(raw))
+            self._bench(f"{one.name} dumps_bytes", rounds, lambda: one.dumps_bytes(resources))
+
+    def _bench(self, name, rounds, func):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        cost = time.perf_counter() - start
+        self.stdout.write(f"{name}: {cost / rounds * 1000:.2f} ms")
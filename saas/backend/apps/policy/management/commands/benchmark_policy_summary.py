@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from backend.service.models import Subject
+from backend.service.policy.query import PolicyQueryService
+
+
+class Command(BaseCommand):
+    help = "benchmark full policy listing vs summary-only listing of a subject"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-s", action="store", dest="system_id", required=True, help="system id")
+        parser.add_argument("-t", action="store", dest="subject_type", default="group", help="subject type")
+        parser.add_argument("-i", action="store", dest="subject_id", required=True, help="subject id")
+        parser.add_argument("-r", action="store", dest="rounds", type=int, default=10, help="rounds")
+
+    def handle(self, *args, **options):
+        system_id, rounds = options["system_id"], options["rounds"]
+        subject = Subject(type=options["subject_type"], id=options["subject_id"])
+        svc = PolicyQueryService()
+
+        count = len(svc.list_summary_by_subject(system_id, subject))
+        self.stdout.write(f"subject {subject.type}:{subject.id} with {count} policies in system {system_id}")
+        self._bench("full", rounds, lambda: svc.list_by_subject(system_id, subject))
+        self._bench("summary", rounds, lambda: svc.list_summary_by_subject(system_id, subject))
+
+    def _bench(self, name, rounds, func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        cost = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f"{name}: {cost / rounds * 1000:.1f} ms/query, peak memory {peak / 1024 / 1024:.1f} MB")
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.utils import translation
+
+from backend.biz.policy import ConditionBean, InstanceBean, PathNodeBean, PolicyBean, RelatedResourceBean
+from backend.common.i18n import localized_dict
+from backend.common.renderers import handle_tranlate
+
+
+def gen_large_policy(count: int) -> PolicyBean:
+    """
+    生成包含count条实例路径的策略, 用于基准测试
+    """
+    path = [
+        [
+            PathNodeBean(
+                system_id="bk_cmdb", type="biz", id=str(i), name=f"biz{i}", type_name="业务", type_name_en="Biz"
+            ),
+            PathNodeBean(
+                system_id="bk_cmdb", type="host", id=str(i), name=f"host{i}", type_name="主机", type_name_en="Host"
+            ),
+        ]
+        for i in range(count)
+    ]
+    instance = InstanceBean(type="host", name="主机", name_en="Host", path=path)
+    resource = RelatedResourceBean(
+        system_id="bk_cmdb",
+        type="host",
+        name="主机",
+        name_en="Host",
+        condition=[ConditionBean(id="1", instances=[instance], attributes=[])],
+    )
+    return PolicyBean(id="view_host", name="查看主机", name_en="View Host", related_resource_types=[resource], policy_id=1)
+
+
+class Command(BaseCommand):
+    help = "benchmark generic walk translation vs schema-aware translation on a large policy response"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", action="store", dest="count", type=int, default=10000, help="instance paths")
+        parser.add_argument("-r", action="store", dest="rounds", type=int, default=10, help="rounds")
+        parser.add_argument("-l", action="store", dest="language", default="en", help="language, en or zh-hans")
+
+    def handle(self, *args, **options):
+        count, rounds = options["count"], options["rounds"]
+        policy = gen_large_policy(count)
+
+        translation.activate(options["language"])
+        self.stdout.write(f"policy with {count} instance paths, language: {options['language']}")
+        # 兼容模式: 先生成dict, 再由渲染器递归处理
+        self._bench("walk", rounds, lambda: handle_tranlate({"data": [policy.dict()]}))
+        # 按Model声明的双语字段在序列化时翻译
+        self._bench("schema", rounds, lambda: {"data": [localized_dict(policy)]})
+
+    def _bench(self, name, rounds, func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        cost = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f"{name}: {cost / rounds * 1000:.1f} ms/response, peak memory {peak / 1024 / 1024:.1f} MB")
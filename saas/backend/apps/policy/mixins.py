@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from typing import List, Optional, Set
+
+from rest_framework.response import Response
+
+from backend.biz.policy import PolicyBean, PolicyQueryBiz
+from backend.common.i18n import localized_dict
+from backend.common.streaming import CursorPager, JSONStreamingResponse
+from backend.service.models import Subject
+
+from .serializers import PolicyListQuerySLZ
+
+
+class SubjectPolicyListMixin:
+    """
+    Subject的策略列表
+
+    支持只返回指定的字段, 以及按游标分页流式返回, 避免大量策略时在内存中生成完整的响应
+    """
+
+    policy_query_biz = PolicyQueryBiz()
+
+    def list_subject_policies(self, request, subject: Subject):
+        slz = PolicyListQuerySLZ(data=request.query_params)
+        slz.is_valid(raise_exception=True)
+
+        data = slz.validated_data
+        system_id = data["system_id"]
+        include = self._gen_policy_include(data["fields"])
+
+        if not data["stream"]:
+            policies = self.policy_query_biz.list_by_subject(system_id, subject)
+            return Response([localized_dict(p, include=include) for p in policies])
+
+        pager = CursorPager(
+            self.policy_query_biz.new_paging_fetcher_by_subject(system_id, subject),
+            cursor=data["cursor"],
+            limit=data["limit"],
+        )
+        return JSONStreamingResponse(
+            (localized_dict(p, include=include) for p in pager),
+            get_extra=lambda: {"next_cursor": pager.next_cursor},
+        )
+
+    def _gen_policy_include(self, fields: List[str]) -> Optional[Set[str]]:
+        """
+        转换请求的字段为PolicyBean的字段名, 兼容别名, 并带上对应的双语字段
+        """
+        if not fields:
+            return None
+
+        wanted = set(fields) | {f + "_en" for f in fields}
+        return {name for name, field in PolicyBean.__fields__.items() if name in wanted or field.alias in wanted}
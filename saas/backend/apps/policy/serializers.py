@@ -124,6 +124,28 @@ class PolicyModelSLZ(serializers.ModelSerializer):
         fields = ("policy_id", "type", "id", "name", "description", "related_resource_types", "environment")
 
 
+class PolicyListQuerySLZ(serializers.Serializer):
+    system_id = serializers.CharField(label="系统ID")
+    stream = serializers.BooleanField(label="是否流式返回, 流式返回时按游标分页", required=False, default=False)
+    cursor = serializers.IntegerField(label="分页游标, 流式返回时有效", required=False, default=0, min_value=0)
+    limit = serializers.IntegerField(
+        label="分页数量, 流式返回时有效, 不传则返回游标后的所有策略",
+        required=False,
+        allow_null=True,
+        default=None,
+        min_value=1,
+    )
+    fields = serializers.CharField(
+        label="返回的字段, 多个以英文逗号分隔, 不需要资源条件时可不包含related_resource_types",
+        required=False,
+        default="",
+        allow_blank=True,
+    )
+
+    def validate_fields(self, value):
+        return [f.strip() for f in value.split(",") if f.strip()]
+
+
 class PolicySystemSLZ(serializers.Serializer):
     id = serializers.CharField(label="系统ID")
     name = serializers.CharField(label="系统名称")
@@ -8,25 +8,37 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 
 from aenum import LowerStrEnum, auto
 from celery import task
+from django.core.cache import cache
 
 from backend.api.authorization.constants import AuthorizationAPIEnum
 from backend.api.authorization.models import AuthAPIAllowListConfig
+from backend.apps.action.models import ActionRelatedObject
 from backend.apps.approval.models import ActionProcessRelation
 from backend.apps.policy.models import Policy
 from backend.apps.role.models import RoleScope
 from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthorized
+from backend.common.concurrency import concurrent_map
 from backend.component import iam
-from backend.service.constants import RoleScopeType
+from backend.service.constants import ActionRelatedObjectType, RoleScopeType
+from backend.service.role import role_scope_cache
 from backend.util.enum import ChoicesEnum
-from backend.util.json import json_dumps
+from backend.util.json import json_dumps, json_loads
 
 logger = logging.getLogger("celery")
 
+# 分批删除/更新数据时每批的主键数量, 避免长时间锁表
+MODEL_CHANGE_EVENT_BATCH_SIZE = 1000
+# 并发执行不同操作的模型变更事件的并发数
+MODEL_CHANGE_EVENT_MAX_WORKERS = 4
+# 事件执行进度的缓存时间
+MODEL_CHANGE_EVENT_CHECKPOINT_TIMEOUT = 24 * 60 * 60
+
 
 # TODO: [重构]单独的ModelChangeEvent的Service和Biz模块
 class ModelChangeEventTypeEnum(ChoicesEnum, LowerStrEnum):
@@ -48,7 +60,8 @@ def execute_model_change_event():
     if len(events) == 0:
         return
 
-    # 2. 遍历每个事件，执行对应任务
+    # 2. 按操作分组, 同一操作的事件需要按顺序执行(先删除策略再删除Action), 不同操作的事件之间相互独立, 并发执行
+    action_events: Dict[Any, List[Dict]] = OrderedDict()
     for event in events:
         if event["type"] not in [
             ModelChangeEventTypeEnum.ActionPolicyDeleted.value,
@@ -57,40 +70,94 @@ def execute_model_change_event():
             logger.info(f"The model change event of type({event['type']}) not supported yet")
             continue
 
-        system_id, action_id = event["system_id"], event["model_id"]
-        # 记录执行过的事件，以防需要排查
-        logger.info(f"execute model change event: f{event}")
-        # 删除Action相关的所有策略
-        if event["type"] == ModelChangeEventTypeEnum.ActionPolicyDeleted.value:
-            delete_action_policies(system_id, action_id)
-        elif event["type"] == ModelChangeEventTypeEnum.ActionDeleted.value:
-            # 删除Action模型
-            delete_action(system_id, action_id)
-        # 执行完事件后，更新事件状态
-        iam.update_model_change_event(event["pk"], ModelChangeEventStatusEnum.Finished.value)
+        action_events.setdefault((event["system_id"], event["model_id"]), []).append(event)
+
+    concurrent_map(_execute_events, list(action_events.values()), max_workers=MODEL_CHANGE_EVENT_MAX_WORKERS)
+
+
+def _execute_events(events: List[Dict]):
+    """顺序执行同一操作的模型变更事件, 单个事件失败不影响其他操作的事件, 下次调度时重试"""
+    for event in events:
+        try:
+            _execute_event(event)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f"execute model change event fail: {event}")
+            return
+
+
+def _execute_event(event: Dict):
+    system_id, action_id = event["system_id"], event["model_id"]
+    # 记录执行过的事件，以防需要排查
+    logger.info(f"execute model change event: {event}")
+    # 删除Action相关的所有策略
+    if event["type"] == ModelChangeEventTypeEnum.ActionPolicyDeleted.value:  # type: ignore[attr-defined]
+        delete_action_policies(system_id, action_id, checkpoint=ModelChangeEventCheckpoint(event["pk"]))
+    elif event["type"] == ModelChangeEventTypeEnum.ActionDeleted.value:  # type: ignore[attr-defined]
+        # 删除Action模型
+        delete_action(system_id, action_id)
+    # 执行完事件后，更新事件状态
+    iam.update_model_change_event(event["pk"], ModelChangeEventStatusEnum.Finished.value)  # type: ignore[attr-defined]
+
 
+class ModelChangeEventCheckpoint:
+    """
+    记录事件已完成的步骤, 事件执行中断后重试时跳过已完成的步骤
+    """
 
-def delete_action_policies(system_id: str, action_id: str):
+    def __init__(self, event_pk: int):
+        self.key = f"bk_iam:model_change_event:{event_pk}:finished_steps"
+
+    def is_finished(self, step: str) -> bool:
+        return step in (cache.get(self.key) or [])
+
+    def finish(self, step: str):
+        steps = cache.get(self.key) or []
+        steps.append(step)
+        cache.set(self.key, steps, timeout=MODEL_CHANGE_EVENT_CHECKPOINT_TIMEOUT)
+
+
+def delete_action_policies(system_id: str, action_id: str, checkpoint: Optional[ModelChangeEventCheckpoint] = None):
     """删除某个操作的所有策略"""
-    # 1. 用户或用户组自定义权限删除
-    Policy.objects.filter(system_id=system_id, action_id=action_id).delete()
+    steps = [
+        # 1. 用户或用户组自定义权限删除
+        ("policy", lambda: _batch_delete(Policy.objects.filter(system_id=system_id, action_id=action_id))),
+        # 2. 权限模板：变更权限模板里的action_ids及其授权的数据
+        ("perm_template", lambda: _delete_action_from_perm_template(system_id, action_id)),
+        # 3. 调用后台根据action_id删除Policy的API, 实际测试在150万策略里删除10万+策略，大概需要3秒多
+        ("backend_policy", lambda: iam.delete_action_policies(system_id, action_id)),
+        # 4. 分级管理员授权范围：role_rolescope
+        ("role_scope", lambda: _delete_action_from_role_scope(system_id, action_id)),
+        # 5. Action的审批流程配置：approval_actionprocessrelation
+        (
+            "action_process_relation",
+            lambda: ActionProcessRelation.objects.filter(system_id=system_id, action_id=action_id).delete(),
+        ),
+        # 6. API白名单授权：authorization_authapiallowlistconfig
+        (
+            "auth_api_allow_list",
+            lambda: AuthAPIAllowListConfig.objects.filter(
+                type=AuthorizationAPIEnum.AUTHORIZATION_INSTANCE.value, system_id=system_id, object_id=action_id
+            ).delete(),
+        ),
+    ]
 
-    # 2. 权限模板：变更权限模板里的action_ids及其授权的数据
-    _delete_action_from_perm_template(system_id, action_id)
+    for name, step in steps:
+        if checkpoint and checkpoint.is_finished(name):
+            continue
 
-    # 3. 调用后台根据action_id删除Policy的API, 实际测试在150万策略里删除10万+策略，大概需要3秒多
-    iam.delete_action_policies(system_id, action_id)
+        step()
 
-    # 4. 分级管理员授权范围：role_rolescope
-    _delete_action_from_role_scope(system_id, action_id)
+        if checkpoint:
+            checkpoint.finish(name)
 
-    # 5. Action的审批流程配置：approval_actionprocessrelation
-    ActionProcessRelation.objects.filter(system_id=system_id, action_id=action_id).delete()
 
-    # 6. API白名单授权：authorization_authapiallowlistconfig
-    AuthAPIAllowListConfig.objects.filter(
-        type=AuthorizationAPIEnum.AUTHORIZATION_INSTANCE.value, system_id=system_id, object_id=action_id
-    ).delete()
+def _batch_delete(queryset):
+    """按主键分批删除, 避免一次删除大量数据长时间锁表"""
+    while True:
+        ids = list(queryset.values_list("id", flat=True)[:MODEL_CHANGE_EVENT_BATCH_SIZE])
+        if not ids:
+            return
+        queryset.model.objects.filter(id__in=ids).delete()
 
 
 def delete_action(system_id: str, action_id: str):
@@ -102,7 +169,9 @@ def delete_action(system_id: str, action_id: str):
 def _delete_action_from_perm_template(system_id: str, action_id: str):
     """从权限模板里移除Action，同时包括权限模板的授权"""
     # 1 变更权限模板
-    perm_templates = PermTemplate.objects.filter(system_id=system_id)
+    # 通过操作引用关系只加载包含该操作的模板, 且只加载需要更新的字段
+    template_ids = ActionRelatedObject.objects.list_template_ids(system_id, action_id)
+    perm_templates = PermTemplate.objects.filter(id__in=template_ids).only("id", "_action_ids")
     modified_perm_template_ids = []
     updated_perm_templates = []
     for pt in perm_templates:
@@ -120,30 +189,49 @@ def _delete_action_from_perm_template(system_id: str, action_id: str):
     if len(updated_perm_templates) > 0:
         PermTemplate.objects.bulk_update(updated_perm_templates, fields=["_action_ids"], batch_size=100)
 
-    # 2 变更权限模板授权数据
+    # 2 变更权限模板授权数据, 按主键游标分批加载与更新
     if len(modified_perm_template_ids) > 0:
-        perm_template_policy_authorizeds = PermTemplatePolicyAuthorized.objects.filter(
+        queryset = PermTemplatePolicyAuthorized.objects.filter(
             template_id__in=modified_perm_template_ids, system_id=system_id
-        )
-        updated_perm_template_policy_authorizeds = []
-        for ptpa in perm_template_policy_authorizeds:
-            data = ptpa.data
-            actions = [a for a in data["actions"] if a["id"] != action_id]
-            data["actions"] = actions
-            ptpa.data = data
-            updated_perm_template_policy_authorizeds.append(ptpa)
-        if len(updated_perm_template_policy_authorizeds) > 0:
-            PermTemplatePolicyAuthorized.objects.bulk_update(
-                updated_perm_template_policy_authorizeds, fields=["_data"], batch_size=20
+        ).only("id", "_data")
+        cursor = 0
+        while True:
+            perm_template_policy_authorizeds = list(
+                queryset.filter(id__gt=cursor).order_by("id")[:MODEL_CHANGE_EVENT_BATCH_SIZE]
             )
+            if not perm_template_policy_authorizeds:
+                break
+            cursor = perm_template_policy_authorizeds[-1].id
+
+            updated_perm_template_policy_authorizeds = []
+            for ptpa in perm_template_policy_authorizeds:
+                data = ptpa.data
+                actions = [a for a in data["actions"] if a["id"] != action_id]
+                # 授权数据里没有该操作，则忽略
+                if len(actions) == len(data["actions"]):
+                    continue
+                data["actions"] = actions
+                ptpa.data = data
+                updated_perm_template_policy_authorizeds.append(ptpa)
+            if len(updated_perm_template_policy_authorizeds) > 0:
+                PermTemplatePolicyAuthorized.objects.bulk_update(
+                    updated_perm_template_policy_authorizeds, fields=["_data"], batch_size=100
+                )
+
+    # 3 数据更新完成后再删除引用关系, 中断重试时仍可查到未处理完的模板
+    ActionRelatedObject.objects.delete_action_relation(
+        ActionRelatedObjectType.TEMPLATE.value, template_ids, system_id, action_id
+    )
 
 
 def _delete_action_from_role_scope(system_id: str, action_id: str):
     """从分级管理员的授权范围里删除操作"""
-    role_scopes = RoleScope.objects.filter(type=RoleScopeType.AUTHORIZATION.value)
+    # 通过操作引用关系只加载包含该操作的授权范围
+    role_ids = ActionRelatedObject.objects.list_role_ids(system_id, action_id)
+    role_scopes = RoleScope.objects.filter(role_id__in=role_ids, type=RoleScopeType.AUTHORIZATION.value)
     updated_role_scopes = []
     for role_scope in role_scopes:
-        content = json.loads(role_scope.content)
+        content = json_loads(role_scope.content)
         is_updated = False
         for scope in content:
             if scope["system_id"] != system_id:
@@ -163,3 +251,8 @@ def _delete_action_from_role_scope(system_id: str, action_id: str):
     # 批量更新分级管理员授权范围
     if len(updated_role_scopes) > 0:
         RoleScope.objects.bulk_update(updated_role_scopes, fields=["content"], batch_size=10)
+        role_scope_cache.delete([one.role_id for one in updated_role_scopes])
+
+    ActionRelatedObject.objects.delete_action_relation(
+        ActionRelatedObjectType.ROLE_SCOPE.value, role_ids, system_id, action_id
+    )
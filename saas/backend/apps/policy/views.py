@@ -26,7 +26,9 @@ from backend.biz.open import ApplicationPolicyListCache
 from backend.biz.policy import ConditionBean, PolicyBean, PolicyOperationBiz, PolicyQueryBiz, RelatedResourceBean
 from backend.biz.policy_tag import PolicyTagBean, PolicyTagBeanList
 from backend.biz.related_policy import RelatedPolicyBiz
+from backend.common.constants import TranslateModeEnum
 from backend.common.error_codes import error_codes
+from backend.common.i18n import localized_dict
 from backend.common.serializers import ActionQuerySLZ
 from backend.common.swagger import ResponseSwaggerAutoSchema
 from backend.common.time import get_soon_expire_ts
@@ -50,6 +52,7 @@ permission_logger = logging.getLogger("permission")
 class PolicyViewSet(GenericViewSet):
 
     paginator = None  # 去掉swagger中的limit offset参数
+    translate_mode = TranslateModeEnum.SCHEMA.value
 
     policy_query_biz = PolicyQueryBiz()
     policy_operation_biz = PolicyOperationBiz()
@@ -87,9 +90,9 @@ class PolicyViewSet(GenericViewSet):
             apply_policy_list.set_tag(PolicyTag.ADD.value)
             policy_list.merge(apply_policy_list)
 
-            return Response([p.dict() for p in policy_list.policies])
+            return Response([localized_dict(p) for p in policy_list.policies])
 
-        return Response([p.dict() for p in policies])
+        return Response([localized_dict(p) for p in policies])
 
     @swagger_auto_schema(
         operation_description="删除权限",
@@ -161,6 +164,7 @@ class PolicyViewSet(GenericViewSet):
 class PolicySystemViewSet(GenericViewSet):
 
     paginator = None  # 去掉swagger中的limit offset参数
+    translate_mode = TranslateModeEnum.SCHEMA.value
 
     biz = PolicyQueryBiz()
 
@@ -176,12 +180,13 @@ class PolicySystemViewSet(GenericViewSet):
 
         data = self.biz.list_system_counter_by_subject(subject)
 
-        return Response([one.dict() for one in data])
+        return Response([localized_dict(one) for one in data])
 
 
 class PolicyExpireSoonViewSet(GenericViewSet):
 
     paginator = None  # 去掉swagger中的limit offset参数
+    translate_mode = TranslateModeEnum.SCHEMA.value
 
     biz = PolicyQueryBiz()
 
@@ -197,7 +202,7 @@ class PolicyExpireSoonViewSet(GenericViewSet):
 
         data = self.biz.list_expired(subject, get_soon_expire_ts())
 
-        return Response([one.dict() for one in data])
+        return Response([localized_dict(one) for one in data])
 
 
 class RelatedPolicyViewSet(GenericViewSet):
@@ -205,6 +210,8 @@ class RelatedPolicyViewSet(GenericViewSet):
     生成依赖操作
     """
 
+    translate_mode = TranslateModeEnum.SCHEMA.value
+
     related_policy_biz = RelatedPolicyBiz()
 
     @swagger_auto_schema(
@@ -240,7 +247,7 @@ class RelatedPolicyViewSet(GenericViewSet):
 
         target_policy_list.fill_empty_fields()
 
-        return Response([p.dict() for p in target_policy_list.policies])
+        return Response([localized_dict(p) for p in target_policy_list.policies])
 
 
 class BatchPolicyResourceCopyViewSet(GenericViewSet):
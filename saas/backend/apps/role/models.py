@@ -8,15 +8,14 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 from typing import Dict, List, Union
 
 from django.db import models
 from django.utils.functional import cached_property
 
-from backend.common.models import BaseModel
+from backend.common.models import BaseModel, LazyJSONField
 from backend.service.constants import RoleRelatedObjectType, RoleScopeType, RoleSourceTypeEnum, RoleType, SubjectType
-from backend.util.json import json_dumps
+from backend.util.json import json_dumps, json_loads
 
 from .constants import DEFAULT_ROLE_PERMISSIONS
 from .managers import RoleRelatedObjectManager, RoleUserManager
@@ -79,7 +78,7 @@ class RoleUserSystemPermission(BaseModel):
 
     @cached_property
     def enabled_detail(self) -> Dict[str, Union[List[str], bool]]:
-        return json.loads(self.content)
+        return json_loads(self.content)
 
     @property
     def enabled_users(self) -> List[str]:
@@ -206,13 +205,7 @@ class RoleCommonAction(BaseModel):
         ordering = ["id"]
         index_together = ["role_id", "system_id"]
 
-    @property
-    def action_ids(self):
-        return json.loads(self._action_ids)
-
-    @action_ids.setter
-    def action_ids(self, action_ids):
-        self._action_ids = json_dumps(action_ids)
+    action_ids = LazyJSONField("_action_ids")
 
 
 class RoleSource(BaseModel):
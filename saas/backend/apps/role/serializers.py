@@ -18,6 +18,7 @@ from backend.apps.policy.serializers import ConditionSLZ, InstanceSLZ, ResourceS
 from backend.apps.role.models import Role, RoleCommonAction, RoleUser
 from backend.biz.role import RoleBiz
 from backend.biz.subject import SubjectInfoList
+from backend.common.serializers import TranslatedFieldsSLZMixin
 from backend.common.time import PERMANENT_SECONDS
 from backend.service.constants import ADMIN_USER, ANY_ID, SUBJECT_ALL, SUBJECT_TYPE_ALL, RoleScopeSubjectType
 
@@ -233,10 +234,11 @@ class SuperManagerMemberDeleteSLZ(serializers.Serializer):
         return value
 
 
-class RoleCommonActionSLZ(serializers.ModelSerializer):
+class RoleCommonActionSLZ(TranslatedFieldsSLZMixin, serializers.ModelSerializer):
     class Meta:
         model = RoleCommonAction
         fields = ("id", "system_id", "name", "name_en", "action_ids")
+        translated_fields = ("name",)
 
 
 class RoleCommonCreateSLZ(serializers.Serializer):
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from backend.apps.action.models import ActionRelatedObject
+
+from .models import Role
+
+
+@receiver(post_delete, sender=Role, dispatch_uid="backend.apps.role.delete_role_scope_actions")
+def delete_role_scope_actions(sender, instance, **kwargs):
+    # 角色删除后, 同时删除其授权范围的操作引用关系
+    ActionRelatedObject.objects.delete_role_scope(instance.id)
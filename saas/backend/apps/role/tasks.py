@@ -32,8 +32,9 @@ def sync_system_manager():
     """
     创建系统管理员
     """
-    # 查询后端所有的系统信息
+    # 查询后端所有的系统信息, 先失效缓存以获取最新注册的系统
     svc = SystemService()
+    svc.invalidate()
     systems = {system.id: system for system in svc.list()}
 
     # 查询已创建的系统管理员的系统id
@@ -45,7 +45,9 @@ from backend.biz.role import (
 )
 from backend.biz.subject import SubjectInfoList
 from backend.biz.trans.role import RoleTrans
+from backend.common.constants import TranslateModeEnum
 from backend.common.error_codes import error_codes
+from backend.common.i18n import localized_dict
 from backend.common.serializers import SystemQuerySLZ
 from backend.common.swagger import PaginatedResponseSwaggerAutoSchema, ResponseSwaggerAutoSchema
 from backend.common.time import get_soon_expire_ts
@@ -479,6 +481,7 @@ class RoleCommonActionViewSet(GenericViewSet):
     serializer_class = RoleCommonActionSLZ
     filterset_class = RoleCommonActionFilter
     lookup_field = "id"
+    translate_mode = TranslateModeEnum.SCHEMA.value
 
     biz = RoleBiz()
 
@@ -501,7 +504,7 @@ class RoleCommonActionViewSet(GenericViewSet):
         system_id = request.query_params.get("system_id")
         if system_id:
             system_common_actions = self.biz.list_system_common_actions(system_id)
-            data = [one.dict() for one in system_common_actions] + data
+            data = [localized_dict(one) for one in system_common_actions] + data
 
         return Response(data)
 
@@ -11,7 +11,14 @@ specific language governing permissions and limitations under the License.
 from rest_framework import serializers
 
 from backend.apps.group.constants import SubjectRelationType
+from backend.apps.policy.serializers import PolicySystemSLZ
 from backend.common.time import PERMANENT_SECONDS
+from backend.service.constants import SubjectType
+
+# 批量查询Subject有权限的系统时, 单次最多查询的Subject数量
+SUBJECT_SYSTEM_COUNTER_MAX_COUNT = 100
+# 批量查询Subject有权限的系统时, 支持的Subject类型
+SUBJECT_SYSTEM_COUNTER_TYPES = [SubjectType.USER.value, SubjectType.DEPARTMENT.value]
 
 
 class UserRelationSLZ(serializers.Serializer):
@@ -34,3 +41,22 @@ class SubjectDepartmentSLZ(serializers.Serializer):
     id = serializers.CharField(label="部门ID")
     name = serializers.CharField(label="部门名称")
     full_name = serializers.CharField(label="部门路径名称")
+
+
+class SubjectIdsQuerySLZ(serializers.Serializer):
+    ids = serializers.CharField(label="Subject ID，多个以英文逗号分隔")
+
+    def validate(self, data):
+        data["ids"] = list(dict.fromkeys(filter(None, data["ids"].split(","))))
+
+        if len(data["ids"]) == 0:
+            raise serializers.ValidationError({"ids": "should not be empty"})
+        if len(data["ids"]) > SUBJECT_SYSTEM_COUNTER_MAX_COUNT:
+            raise serializers.ValidationError({"ids": f"should not be more than {SUBJECT_SYSTEM_COUNTER_MAX_COUNT}"})
+
+        return data
+
+
+class SubjectSystemCounterSLZ(serializers.Serializer):
+    id = serializers.CharField(label="Subject ID")
+    systems = PolicySystemSLZ(label="系统", many=True)
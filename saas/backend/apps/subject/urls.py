@@ -8,11 +8,18 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 from . import views
+from .serializers import SUBJECT_SYSTEM_COUNTER_TYPES
 
 urlpatterns = [
+    # 批量查询Subject有权限的系统, 限定subject_type, 避免与ID为systems的Subject的路由冲突
+    re_path(
+        r"^(?P<subject_type>{})/systems/$".format("|".join(SUBJECT_SYSTEM_COUNTER_TYPES)),
+        views.SubjectsSystemViewSet.as_view({"get": "list"}),
+        name="subject.list_subjects_policy_system",
+    ),
     path(
         "<str:subject_type>/<str:subject_id>/",
         include(
@@ -40,5 +47,5 @@ urlpatterns = [
                 ),
             ]
         ),
-    )
+    ),
 ]
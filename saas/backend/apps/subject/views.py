@@ -18,18 +18,33 @@ from rest_framework.viewsets import GenericViewSet
 
 from backend.account.permissions import role_perm_class
 from backend.apps.organization.models import Department, User
-from backend.apps.policy.serializers import PolicyDeleteSLZ, PolicyPartDeleteSLZ, PolicySLZ, PolicySystemSLZ
+from backend.apps.policy.mixins import SubjectPolicyListMixin
+from backend.apps.policy.serializers import (
+    PolicyDeleteSLZ,
+    PolicyListQuerySLZ,
+    PolicyPartDeleteSLZ,
+    PolicySLZ,
+    PolicySystemSLZ,
+)
 from backend.apps.template.models import PermTemplatePolicyAuthorized
 from backend.audit.audit import audit_context_setter, view_audit_decorator
 from backend.biz.group import GroupBiz
 from backend.biz.policy import ConditionBean, PolicyOperationBiz, PolicyQueryBiz
-from backend.common.serializers import SystemQuerySLZ
+from backend.common.constants import TranslateModeEnum
+from backend.common.error_codes import error_codes
 from backend.common.swagger import ResponseSwaggerAutoSchema
 from backend.service.constants import PermissionCodeEnum
 from backend.service.models import Subject
 
 from .audit import SubjectGroupDeleteAuditProvider, SubjectPolicyDeleteAuditProvider
-from .serializers import SubjectDepartmentSLZ, SubjectGroupSLZ, UserRelationSLZ
+from .serializers import (
+    SUBJECT_SYSTEM_COUNTER_TYPES,
+    SubjectDepartmentSLZ,
+    SubjectGroupSLZ,
+    SubjectIdsQuerySLZ,
+    SubjectSystemCounterSLZ,
+    UserRelationSLZ,
+)
 
 permission_logger = logging.getLogger("permission")
 
@@ -144,33 +159,57 @@ class SubjectSystemViewSet(GenericViewSet):
         return Response([one.dict() for one in data])
 
 
-class SubjectPolicyViewSet(GenericViewSet):
+class SubjectsSystemViewSet(GenericViewSet):
 
     permission_classes = [role_perm_class(PermissionCodeEnum.MANAGE_ORGANIZATION.value)]
 
     paginator = None  # 去掉swagger中的limit offset参数
 
+    biz = PolicyQueryBiz()
+
+    @swagger_auto_schema(
+        operation_description="批量查询Subject有权限的所有系统列表",
+        auto_schema=ResponseSwaggerAutoSchema,
+        query_serializer=SubjectIdsQuerySLZ(),
+        responses={status.HTTP_200_OK: SubjectSystemCounterSLZ(label="Subject系统", many=True)},
+        tags=["subject"],
+    )
+    def list(self, request, *args, **kwargs):
+        subject_type = kwargs["subject_type"]
+        if subject_type not in SUBJECT_SYSTEM_COUNTER_TYPES:
+            raise error_codes.VALIDATE_ERROR.format(f"subject_type({subject_type}) not supported")
+
+        slz = SubjectIdsQuerySLZ(data=request.query_params)
+        slz.is_valid(raise_exception=True)
+
+        data = self.biz.list_system_counter_by_subjects(subject_type, slz.validated_data["ids"])
+
+        return Response(
+            [{"id": subject_id, "systems": [one.dict() for one in systems]} for subject_id, systems in data.items()]
+        )
+
+
+class SubjectPolicyViewSet(SubjectPolicyListMixin, GenericViewSet):
+
+    permission_classes = [role_perm_class(PermissionCodeEnum.MANAGE_ORGANIZATION.value)]
+
+    paginator = None  # 去掉swagger中的limit offset参数
+    translate_mode = TranslateModeEnum.SCHEMA.value
+
     policy_query_biz = PolicyQueryBiz()
     policy_operation_biz = PolicyOperationBiz()
 
     @swagger_auto_schema(
         operation_description="Subject权限列表",
         auto_schema=ResponseSwaggerAutoSchema,
-        query_serializer=SystemQuerySLZ,
+        query_serializer=PolicyListQuerySLZ,
         responses={status.HTTP_200_OK: PolicySLZ(label="策略", many=True)},
         tags=["subject"],
     )
     def list(self, request, *args, **kwargs):
-        slz = SystemQuerySLZ(data=request.query_params)
-        slz.is_valid(raise_exception=True)
-
-        system_id = slz.validated_data["system_id"]
-
         subject = Subject(type=kwargs["subject_type"], id=kwargs["subject_id"])
 
-        policies = self.policy_query_biz.list_by_subject(system_id, subject)
-
-        return Response([p.dict() for p in policies])
+        return self.list_subject_policies(request, subject)
 
     @swagger_auto_schema(
         operation_description="删除权限",
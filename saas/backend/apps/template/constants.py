@@ -14,3 +14,9 @@ from aenum import LowerStrEnum, auto
 class TemplateTag(LowerStrEnum):
     CHECKED = auto()
     UNCHECKED = auto()
+
+
+# 移除模板成员数量超过该值时, 使用长时任务异步移除
+TEMPLATE_MEMBER_REVOKE_TASK_THRESHOLD = 100
+# 长时任务每个步骤移除的成员数量
+TEMPLATE_MEMBER_REVOKE_TASK_CHUNK_SIZE = 100
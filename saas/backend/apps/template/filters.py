@@ -10,7 +10,9 @@ specific language governing permissions and limitations under the License.
 """
 from django_filters import rest_framework as filters
 
+from backend.apps.action.models import ActionRelatedObject
 from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthorized
+from backend.service.constants import ActionRelatedObjectType
 
 
 class TemplateMemberFilter(filters.FilterSet):
@@ -33,6 +35,7 @@ class TemplateFilter(filters.FilterSet):
     name = filters.CharFilter(label="名字", lookup_expr="icontains")
     description = filters.CharFilter(label="描述", lookup_expr="icontains")
     group_id = filters.NumberFilter(method="group_id_filter", label="用户组id")
+    action_id = filters.CharFilter(method="action_id_filter", label="操作id")
 
     class Meta:
         model = PermTemplate
@@ -40,3 +43,13 @@ class TemplateFilter(filters.FilterSet):
 
     def group_id_filter(self, queryset, name, value):
         return queryset
+
+    def action_id_filter(self, queryset, name, value):
+        # 通过操作引用关系查询包含该操作的模板
+        related_object_queryset = ActionRelatedObject.objects.filter(
+            object_type=ActionRelatedObjectType.TEMPLATE.value, action_id=value
+        )
+        system_id = self.data.get("system_id")
+        if system_id:
+            related_object_queryset = related_object_queryset.filter(system_id=system_id)
+        return queryset.filter(id__in=related_object_queryset.values("object_id"))
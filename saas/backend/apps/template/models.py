@@ -8,13 +8,10 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
-
 from django.db import models
 
-from backend.common.models import BaseModel, CompressedJSONField
+from backend.common.models import BaseModel, CompressedJSONField, LazyJSONField
 from backend.service.constants import SubjectType, TemplatePreUpdateStatus
-from backend.util.json import json_dumps
 
 from .managers import PermTemplateManager, PermTemplatePolicyAuthorizedManager, PermTemplatePreGroupSyncManager
 
@@ -38,13 +35,7 @@ class PermTemplate(BaseModel):
         ordering = ["-created_time"]
         index_together = ["system_id"]
 
-    @property
-    def action_ids(self):
-        return json.loads(self._action_ids)
-
-    @action_ids.setter
-    def action_ids(self, data):
-        self._action_ids = json_dumps(data)
+    action_ids = LazyJSONField("_action_ids")
 
 
 class PermTemplatePolicyAuthorized(BaseModel):
@@ -69,13 +60,7 @@ class PermTemplatePolicyAuthorized(BaseModel):
         unique_together = ["template_id", "subject_type", "subject_id"]
         ordering = ["-updated_time"]
 
-    @property
-    def data(self):
-        return json.loads(self._data)
-
-    @data.setter
-    def data(self, data):
-        self._data = json_dumps(data)
+    data = LazyJSONField("_data")
 
 
 class PermTemplatePreUpdateLock(BaseModel):
@@ -152,6 +152,10 @@ class TemplateMemberListSchemaSLZ(TemplateMemberListSLZ):
         )
 
 
+class TemplateMemberListQuerySLZ(serializers.Serializer):
+    stream = serializers.BooleanField(label="是否流式返回所有成员, 流式返回时忽略分页参数", required=False, default=False)
+
+
 class TemplateMemberSLZ(serializers.Serializer):
     type = serializers.ChoiceField(label="成员类型", choices=[(SubjectType.GROUP.value, _("用户组"))])
     id = serializers.CharField(label="成员id")
@@ -8,14 +8,20 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from typing import Any, List
+from typing import Any, Dict, List
+
+from pydantic import parse_obj_as
 
 from backend.apps.template.models import PermTemplatePolicyAuthorized
 from backend.biz.template import TemplateBiz
+from backend.common.error_codes import error_codes
 from backend.long_task.constants import TaskType
 from backend.long_task.task import StepTask, register_handler
 from backend.service.constants import SubjectType
 from backend.service.models import Subject
+from backend.util.basic import chunked
+
+from .constants import TEMPLATE_MEMBER_REVOKE_TASK_CHUNK_SIZE
 
 
 @register_handler(TaskType.TEMPLATE_UPDATE.value)
@@ -44,3 +50,36 @@ class TemplateUpdateTask(StepTask):
     def on_success(self):
         # 结束同步, 完成修改模板, 删除预提交的相关信息
         self.template_biz.finish_template_update_sync(self.template_id)
+
+
+@register_handler(TaskType.TEMPLATE_MEMBER_REVOKE.value)
+class TemplateMemberRevokeTask(StepTask):
+    """
+    权限模板批量移除成员
+    """
+
+    template_biz = TemplateBiz()
+
+    def __init__(self, system_id: str, template_id: int, members: List[Dict[str, str]]):
+        self.system_id = system_id
+        self.template_id = template_id
+        self.members = members
+
+    def get_params(self) -> List[Any]:
+        # 每个步骤移除一批成员
+        return chunked(self.members, TEMPLATE_MEMBER_REVOKE_TASK_CHUNK_SIZE)
+
+    def run(self, item: Any):
+        failed_subjects = self.template_biz.revoke_subjects(
+            self.system_id, self.template_id, parse_obj_as(List[Subject], item)
+        )
+        # 成员已从DB移除, 后端删除失败的成员记录到子任务的异常信息中, 便于排查
+        if failed_subjects:
+            raise error_codes.REMOTE_REQUEST_ERROR.format(
+                "delete template policies fail: {}".format(
+                    [{"type": one["subject_type"], "id": one["subject_id"]} for one in failed_subjects]
+                )
+            )
+
+    def on_success(self):
+        pass
@@ -37,6 +37,7 @@ from backend.biz.template import (
     TemplatePolicyCloneBiz,
 )
 from backend.common.error_codes import error_codes
+from backend.common.streaming import CursorPager, JSONStreamingResponse
 from backend.common.swagger import PaginatedResponseSwaggerAutoSchema, ResponseSwaggerAutoSchema
 from backend.long_task.constants import TaskType
 from backend.long_task.models import TaskDetail
@@ -53,6 +54,7 @@ from .audit import (
     TemplateUpdateAuditProvider,
     TemplateUpdateCommitProvider,
 )
+from .constants import TEMPLATE_MEMBER_REVOKE_TASK_THRESHOLD
 from .filters import TemplateFilter, TemplateMemberFilter
 from .serializers import (
     GroupCopyActionInstanceSLZ,
@@ -65,6 +67,7 @@ from .serializers import (
     TemplateIdSLZ,
     TemplateListSchemaSLZ,
     TemplateListSLZ,
+    TemplateMemberListQuerySLZ,
     TemplateMemberListSchemaSLZ,
     TemplateMemberListSLZ,
     TemplatePartialUpdateSLZ,
@@ -274,6 +277,7 @@ class TemplateMemberViewSet(TemplatePermissionMixin, GenericViewSet):
     @swagger_auto_schema(
         operation_description="模板成员",
         auto_schema=PaginatedResponseSwaggerAutoSchema,
+        query_serializer=TemplateMemberListQuerySLZ,
         responses={status.HTTP_200_OK: TemplateMemberListSchemaSLZ(label="模板成员", many=True)},
         tags=["template"],
     )
@@ -281,6 +285,11 @@ class TemplateMemberViewSet(TemplatePermissionMixin, GenericViewSet):
         template = self.get_object()
         queryset = self.filter_queryset(self.queryset).filter(template_id=template.id)
 
+        slz = TemplateMemberListQuerySLZ(data=request.query_params)
+        slz.is_valid(raise_exception=True)
+        if slz.validated_data["stream"]:
+            return self._stream_template_members(queryset)
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = TemplateMemberListSLZ(page, many=True)
@@ -292,6 +301,19 @@ class TemplateMemberViewSet(TemplatePermissionMixin, GenericViewSet):
         data = self._fill_template_member_info(serializer.data)
         return Response(data)
 
+    def _stream_template_members(self, queryset):
+        """
+        按id游标分批查询并填充成员信息, 逐条流式返回
+        """
+
+        def fetch(cursor: int, size: int):
+            members = list(queryset.filter(id__gt=cursor).order_by("id")[: size + 1])
+            next_cursor = members[size - 1].id if len(members) > size else None
+            data = self._fill_template_member_info(TemplateMemberListSLZ(members[:size], many=True).data)
+            return data, next_cursor
+
+        return JSONStreamingResponse(CursorPager(fetch), get_extra=lambda: {"count": queryset.count()})
+
     def _fill_template_member_info(self, data: List[Dict[str, Any]]):
         """
         填充模板成员信息
@@ -320,11 +342,21 @@ class TemplateMemberViewSet(TemplatePermissionMixin, GenericViewSet):
 
         permission_logger.info("template delete member by user: %s", request.user.username)
 
-        self.template_biz.revoke_subjects(template.system_id, template.id, parse_obj_as(List[Subject], members))
+        data = {}
+        if len(members) > TEMPLATE_MEMBER_REVOKE_TASK_THRESHOLD:
+            # 成员数量较多时使用长时任务分批移除, 避免请求超时, 返回任务id用于查询进度
+            task = TaskDetail.create(
+                TaskType.TEMPLATE_MEMBER_REVOKE.value,
+                [template.system_id, template.id, [{"type": m["type"], "id": m["id"]} for m in members]],
+            )
+            TaskFactory().delay(task.id)
+            data["task_id"] = task.id
+        else:
+            self.template_biz.revoke_subjects(template.system_id, template.id, parse_obj_as(List[Subject], members))
 
         audit_context_setter(template=template, members=members)
 
-        return Response({})
+        return Response(data)
 
 
 class TemplatePreUpdateViewSet(TemplatePermissionMixin, GenericViewSet):
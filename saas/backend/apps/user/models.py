@@ -8,13 +8,10 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
-
 from django.db import models
 
 from backend.apps.user.managers import UserProfileManager
-from backend.common.models import BaseModel
-from backend.util.json import json_dumps
+from backend.common.models import BaseModel, LazyJSONField
 
 
 class UserProfile(BaseModel):
@@ -31,10 +28,4 @@ class UserProfile(BaseModel):
         verbose_name = "用户配置"
         verbose_name_plural = "用户配置"
 
-    @property
-    def newbie(self):
-        return json.loads(self._newbie)
-
-    @newbie.setter
-    def newbie(self, newbie):
-        self._newbie = json_dumps(newbie)
+    newbie = LazyJSONField("_newbie")
@@ -24,6 +24,7 @@ from backend.biz.group import GroupBiz
 from backend.biz.policy import PolicyQueryBiz
 from backend.common.time import db_time, get_soon_expire_ts
 from backend.component import esb
+from backend.publisher.buffer import buffered_publish
 from backend.service.constants import SubjectType
 from backend.service.models import Subject
 from backend.service.policy.query import PolicyQueryService
@@ -92,18 +93,20 @@ def user_cleanup_expired_policy():
         return
 
     for i in paginator.page_range:
-        for user in paginator.page(i):
-            subject = Subject(type=SubjectType.USER.value, id=user.username)
-
-            # 查询用户指定过期时间之前的所有策略
-            policies = policy_svc.list_backend_policy_before_expired_at(expired_at, subject)
-            if not policies:
-                continue
-
-            # 分系统删除过期的策略
-            sorted_policies = sorted(policies, key=lambda p: p.system)
-            for system_id, per_policies in groupby(sorted_policies, lambda p: p.system):
-                audit_policies = policy_svc.delete_by_ids(system_id, subject, [p.id for p in per_policies])
-
-                # 记审计信息
-                log_user_cleanup_policy_audit_event(task_id, user, system_id, audit_policies)
+        # 每页的删除策略事件合并后一次发布
+        with buffered_publish():
+            for user in paginator.page(i):
+                subject = Subject(type=SubjectType.USER.value, id=user.username)
+
+                # 查询用户指定过期时间之前的所有策略
+                policies = policy_svc.list_backend_policy_before_expired_at(expired_at, subject)
+                if not policies:
+                    continue
+
+                # 分系统删除过期的策略
+                sorted_policies = sorted(policies, key=lambda p: p.system)
+                for system_id, per_policies in groupby(sorted_policies, lambda p: p.system):
+                    audit_policies = policy_svc.delete_by_ids(system_id, subject, [p.id for p in per_policies])
+
+                    # 记审计信息
+                    log_user_cleanup_policy_audit_event(task_id, user, system_id, audit_policies)
@@ -8,7 +8,6 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import uuid
 
 from django.apps import apps
@@ -16,9 +15,8 @@ from django.db import connections, models
 from django.utils import timezone
 
 from backend.audit.apps import AuditConfig
-from backend.common.models import BaseModel
+from backend.common.models import BaseModel, LazyJSONField
 from backend.service.constants import RoleType
-from backend.util.json import json_dumps
 
 from .constants import AuditObjectType, AuditSourceType, AuditStatus, AuditType
 
@@ -45,13 +43,7 @@ class Event(BaseModel):
         choices=AuditStatus.get_choices(),
     )
 
-    @property
-    def extra(self):
-        return json.loads(self._extra)
-
-    @extra.setter
-    def extra(self, data):
-        self._extra = json_dumps(data)
+    extra = LazyJSONField("_extra")
 
     class Meta:
         abstract = True
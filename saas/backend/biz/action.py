@@ -125,7 +125,7 @@ class ActionBiz:
         actions = self.list_by_role(system_id, role)
         action_list = ActionBeanList(actions)
 
-        policies = self.policy_svc.list_by_subject(system_id, subject)
+        policies = self.policy_svc.list_summary_by_subject(system_id, subject)
         action_expired_at = {policy.action_id: policy.expired_at for policy in policies}
         action_list.fill_expired_at_and_tag(action_expired_at)
 
@@ -14,6 +14,7 @@ from itertools import groupby
 from typing import Any, Dict, List, Optional
 
 from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from pydantic import BaseModel
 from pydantic.tools import parse_obj_as
@@ -62,6 +63,9 @@ from .template import TemplateBiz
 
 logger = logging.getLogger(__name__)
 
+# 批量查询第三方审批系统单据状态时, 单次请求的最大单据数
+QUERY_TICKET_STATUS_CHUNK_SIZE = 100
+
 
 class BaseApplicationDataBean(BaseModel):
     """申请的基本数据"""
@@ -538,9 +542,15 @@ class ApplicationBiz:
 
         with transaction.atomic():
             # 对于非审批中，都需要将单据状态更新保存
-            # Note: 由于application里的data字段较大，使用save更新时相当所有字段都更新，所以需指定status字段更新
+            # Note: 以单据ID与审批中状态作为条件更新，保证审批回调与周期补偿任务并发处理同一单据时只会处理一次
+            updated = Application.objects.filter(id=application.id, status=ApplicationStatus.PENDING.value).update(
+                status=status, updated_time=timezone.now()
+            )
+            if not updated:
+                logger.info("application %s has been handled, skip status %s", application.id, status)
+                return
+
             application.status = status
-            application.save(update_fields=["status", "updated_time"])
 
             # 审批通过，则执行相关授权等
             if status == ApplicationStatus.PASS.value:
@@ -560,9 +570,13 @@ class ApplicationBiz:
         self.handle_application_result(application, ticket.status)
 
     def query_application_approval_status(self, applications: List[Application]) -> ApplicationIDStatusDict:
-        """查询申请单审批状态"""
+        """查询申请单审批状态, 按批次查询第三方审批系统"""
         sn_id_dict = {a.sn: a.id for a in applications}
-        tickets = self.svc.query_ticket_approval_status(list(sn_id_dict.keys()))
+        sns = list(sn_id_dict.keys())
+
+        tickets = []
+        for i in range(0, len(sns), QUERY_TICKET_STATUS_CHUNK_SIZE):
+            tickets.extend(self.svc.query_ticket_approval_status(sns[i : i + QUERY_TICKET_STATUS_CHUNK_SIZE]))
 
         return ApplicationIDStatusDict(data={sn_id_dict[t.sn]: t.status for t in tickets})
 
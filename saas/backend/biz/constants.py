@@ -27,3 +27,8 @@ class ConditionTag(LowerStrEnum):
     ADD = auto()
     DELETE = auto()
     UNCHANGED = auto()
+
+
+# 模板新增操作clone策略时, 每批查询的用户组数量与并发数
+TEMPLATE_CLONE_POLICY_GROUP_CHUNK_SIZE = 100
+TEMPLATE_CLONE_POLICY_MAX_WORKERS = 5
@@ -8,11 +8,13 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+import hashlib
+from collections import defaultdict
 from datetime import datetime
-from itertools import groupby
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Q
 from django.utils.translation import gettext as _
@@ -27,13 +29,14 @@ from backend.biz.policy import PolicyBean, PolicyBeanList, PolicyOperationBiz
 from backend.biz.resource import ResourceBiz
 from backend.biz.role import RoleAuthorizationScopeChecker, RoleSubjectScopeChecker
 from backend.biz.template import TemplateBiz, TemplateCheckBiz
+from backend.common.concurrency import concurrent_map
 from backend.common.error_codes import APIException, CodeException, error_codes
 from backend.common.time import PERMANENT_SECONDS, expired_at_display
 from backend.long_task.constants import TaskType
 from backend.long_task.models import TaskDetail
 from backend.long_task.task import TaskFactory
 from backend.service.constants import RoleRelatedObjectType, SubjectType
-from backend.service.engine import EngineService
+from backend.service.engine import EngineService, PolicyResource
 from backend.service.group import GroupCreate, GroupMemberExpiredAt, GroupService, SubjectGroup
 from backend.service.group_saas_attribute import GroupAttributeService
 from backend.service.models import Subject
@@ -41,12 +44,16 @@ from backend.service.policy.query import Policy, PolicyQueryService
 from backend.service.role import RoleService, UserRole
 from backend.service.system import SystemService
 from backend.service.template import TemplateService
+from backend.util.json import json_dumps
 from backend.util.time import utc_string_to_local
 from backend.util.uuid import gen_uuid
 
 from .action import ActionCheckBiz, ActionForCheck
 from .subject import SubjectInfoList
 
+# 预申请用户组的查询结果缓存时间(秒)
+PRE_APPLICATION_GROUPS_CACHE_TIMEOUT = 3 * 60
+
 
 class GroupSystemCounterBean(BaseModel):
     id: str
@@ -162,31 +169,36 @@ class GroupBiz:
         """
         查询用户组授权的系统信息, 返回自定义权限/模板的数量
         """
-        subject = Subject(type=SubjectType.GROUP.value, id=str(group_id))
-        policy_systems_count = self.policy_query_svc.list_system_counter_by_subject(subject)
-        template_system_count = self.template_svc.list_system_counter_by_subject(subject)
-        policy_system_count_dict = {system.id: system.count for system in policy_systems_count}
-        template_system_count_dict = {system.id: system.count for system in template_system_count}
+        return self.list_system_counter_by_groups([group_id])[group_id]
 
-        if len(policy_systems_count) == 0 and len(template_system_count) == 0:
-            return []
+    def list_system_counter_by_groups(self, group_ids: List[int]) -> Dict[int, List[GroupSystemCounterBean]]:
+        """
+        批量查询用户组授权的系统信息, 自定义权限与模板数量各只需一次分组聚合查询
+        """
+        subject_ids = [str(group_id) for group_id in group_ids]
+        policy_counters = self.policy_query_svc.list_system_counter_by_subjects(SubjectType.GROUP.value, subject_ids)
+        template_counters = self.template_svc.list_system_counter_by_subjects(SubjectType.GROUP.value, subject_ids)
+
+        group_systems: Dict[int, List[GroupSystemCounterBean]] = {group_id: [] for group_id in group_ids}
+        if not policy_counters and not template_counters:
+            return group_systems
 
         systems = self.system_svc.list()
-        group_systems: List[GroupSystemCounterBean] = []
-        for system in systems:
-            if system.id not in policy_system_count_dict and system.id not in template_system_count_dict:
-                continue
+        for group_id, subject_id in zip(group_ids, subject_ids):
+            policy_system_count_dict = {system.id: system.count for system in policy_counters.get(subject_id, [])}
+            template_system_count_dict = {system.id: system.count for system in template_counters.get(subject_id, [])}
 
-            group_system = GroupSystemCounterBean.parse_obj(system)
+            for system in systems:
+                if system.id not in policy_system_count_dict and system.id not in template_system_count_dict:
+                    continue
 
-            # 填充系统自定义权限策略数量与模板数量
-            if system.id in policy_system_count_dict:
-                group_system.custom_policy_count = policy_system_count_dict.get(system.id)
+                group_system = GroupSystemCounterBean.parse_obj(system)
 
-            if system.id in template_system_count_dict:
-                group_system.template_count = template_system_count_dict.get(system.id)
+                # 填充系统自定义权限策略数量与模板数量
+                group_system.custom_policy_count = policy_system_count_dict.get(system.id, 0)
+                group_system.template_count = template_system_count_dict.get(system.id, 0)
 
-            group_systems.append(group_system)
+                group_systems[group_id].append(group_system)
 
         return group_systems
 
@@ -344,47 +356,70 @@ class GroupBiz:
     def list_pre_application_groups(self, policy_list: PolicyBeanList) -> List[int]:
         """
         获取用户预申请的用户组列表
+
+        相同的查询资源在短时间内直接使用缓存结果
         """
         system_id, policies = policy_list.system_id, policy_list.policies
 
         try:
             policy_resources = self.engine_svc.gen_search_policy_resources(policies)
-            # 填充资源实例的属性
-            for pr in policy_resources:
-                if len(pr.resources) != 0:
-                    self._fill_resources_attribute(pr.resources)
 
-            results = self.engine_svc.query_subjects_by_policy_resources(
-                system_id, policy_resources, SubjectType.GROUP.value
-            )
+            cache_key = self._gen_pre_application_groups_cache_key(system_id, policy_resources)
+            group_ids = cache.get(cache_key)
+            if group_ids is not None:
+                return group_ids
+
+            group_ids = self._query_pre_application_groups(system_id, policy_resources)
+            cache.set(cache_key, group_ids, timeout=PRE_APPLICATION_GROUPS_CACHE_TIMEOUT)
         except APIException:
             return []
 
-        # 取结果的交集
-        subject_id_set = None
-        for res in results:
+        return group_ids
+
+    def _gen_pre_application_groups_cache_key(self, system_id: str, policy_resources: List[PolicyResource]) -> str:
+        """
+        使用查询资源的指纹生成缓存key, 与策略的顺序无关
+        """
+        data = sorted(json_dumps(pr.dict(), sort_keys=True) for pr in policy_resources)
+        fingerprint = hashlib.md5(json_dumps([system_id, data]).encode()).hexdigest()
+        return f"bk_iam:pre_application_groups:{fingerprint}"
+
+    def _query_pre_application_groups(self, system_id: str, policy_resources: List[PolicyResource]) -> List[int]:
+        """
+        流式查询engine并取结果的交集, 交集为空时不再请求后续的查询
+        """
+        # 填充资源实例的属性
+        self._fill_resources_attribute([r for pr in policy_resources for r in pr.resources])
+
+        subject_id_set: Optional[Set[str]] = None
+        for res in self.engine_svc.iter_query_subjects_by_policy_resources(
+            system_id, policy_resources, SubjectType.GROUP.value
+        ):
             ids = {subject["id"] for subject in res}
-            if subject_id_set is None:
-                subject_id_set = ids
-            else:
-                subject_id_set = subject_id_set & ids
+            subject_id_set = ids if subject_id_set is None else subject_id_set & ids
+            if not subject_id_set:
+                return []
 
         return [int(_id) for _id in subject_id_set] if subject_id_set else []
 
     def _fill_resources_attribute(self, resources: List[Dict[str, Any]]):
         """
         用户组通过policy查询subjects的资源填充属性
+
+        按(system, type)分组去重后并发查询各资源类型的属性
         """
-        need_fetch_resources = []
+        need_fetch_resources: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
         for resource in resources:
             if resource["id"] != "*" and not resource["attribute"]:
-                need_fetch_resources.append(resource)
+                need_fetch_resources[(resource["system"], resource["type"])].append(resource)
 
         if not need_fetch_resources:
             return
 
-        for key, parts in groupby(need_fetch_resources, key=lambda resource: (resource["system"], resource["type"])):
-            self._exec_fill_resources_attribute(key[0], key[1], list(parts))
+        concurrent_map(
+            lambda item: self._exec_fill_resources_attribute(item[0][0], item[0][1], item[1]),
+            need_fetch_resources.items(),
+        )
 
     def _exec_fill_resources_attribute(self, system_id, resource_type_id, resources):
         # 查询属性
@@ -424,9 +459,9 @@ class GroupBiz:
         """
         校验授权的操作没有重复授权
         """
-        policy_list = self.policy_query_svc.new_policy_list_by_subject(system_id, subject)
+        exists_action_ids = {p.action_id for p in self.policy_query_svc.list_summary_by_subject(system_id, subject)}
         for action_id in action_ids:
-            if policy_list.get(action_id):
+            if action_id in exists_action_ids:
                 raise error_codes.VALIDATE_ERROR.format(_("系统: {} 的操作: {} 权限已存在").format(system_id, action_id))
 
     def _gen_grant_lock(
@@ -565,10 +600,10 @@ class GroupCheckBiz:
         检查用户组自定义授权时只能新增不能修改
         """
         subject = Subject(type=SubjectType.GROUP.value, id=str(group_id))
-        policies = self.policy_svc.list_by_subject(system_id, subject)
-        policy_list = PolicyBeanList(system_id, parse_obj_as(List[PolicyBean], policies))
+        # 只需要已有策略的操作, 不需要查询资源条件
+        exists_action_ids = {p.action_id for p in self.policy_svc.list_summary_by_subject(system_id, subject)}
         for p in policies:
-            if policy_list.get(p.action_id):
+            if p.action_id in exists_action_ids:
                 raise error_codes.VALIDATE_ERROR.format(
                     _("系统: {} 的操作: {} 权限已存在, 只能新增, 不能修改!").format(system_id, p.action_id)
                 )
@@ -11,11 +11,31 @@ specific language governing permissions and limitations under the License.
 所有组织架构同步操作 统一处理
 """
 import datetime
+from contextlib import ExitStack
+from typing import List
 
-from backend.apps.organization.constants import NEW_USER_AUTO_SYNC_COUNT_LIMIT
+from django.core.cache import cache
+
+from backend.apps.organization.constants import NEW_USER_AUTO_SYNC_COUNT_LIMIT, SyncTaskLockKey
 from backend.apps.organization.models import User
+from backend.apps.organization.search import organization_search_index_cache
 from backend.component import iam, usermgr
 
+# 同步用户的分布式锁的过期时间与等待时间(秒), 等待超时会抛出LockError, 避免请求无限阻塞
+SYNC_USER_LOCK_TIMEOUT = 10
+SYNC_USER_LOCK_BLOCKING_TIMEOUT = 5
+
+
+def _user_lock(username: str):
+    """
+    按用户名加锁, 不同用户的同步互不阻塞
+    """
+    return cache.lock(
+        f"{SyncTaskLockKey.SingleUser.value}:{username}",  # type: ignore[attr-defined]
+        timeout=SYNC_USER_LOCK_TIMEOUT,
+        blocking_timeout=SYNC_USER_LOCK_BLOCKING_TIMEOUT,
+    )
+
 
 class Syncer:
     """
@@ -34,22 +54,71 @@ class Syncer:
         if User.objects.filter(username=username).exists():
             # 已存在则不需要再同步
             return
-        # TODO: 考虑并发情况，需要添加分布式锁
         # 2. 查询UserMgr API
         user_info = usermgr.retrieve_user(username)
-        # 3. 同步到DB
-        user, is_created = User.objects.get_or_create(
-            id=user_info["id"],
-            defaults={
-                "username": user_info["username"],
-                "display_name": user_info["display_name"] or user_info["username"],
-                "staff_status": user_info["staff_status"],
-                "category_id": user_info["category_id"],
-            },
-        )
-        # 4. 同步到IAM后台
-        if is_created:
-            iam.create_subjects([{"type": "user", "id": user.username, "name": user.display_name}])
+        # 3. 用户的分布式锁内同步到DB, 避免并发请求重复创建
+        with _user_lock(username):
+            user, is_created = User.objects.get_or_create(
+                id=user_info["id"],
+                defaults={
+                    "username": user_info["username"],
+                    "display_name": user_info["display_name"] or user_info["username"],
+                    "staff_status": user_info["staff_status"],
+                    "category_id": user_info["category_id"],
+                },
+            )
+            # 4. 同步到IAM后台
+            if is_created:
+                iam.create_subjects([{"type": "user", "id": user.username, "name": user.display_name}])
+                organization_search_index_cache.update([[user.username, user.display_name]])
+
+    def sync_multi_users(self, usernames: List[str]) -> List[str]:
+        """
+        批量同步用户，返回用户管理中不存在的用户名
+        1. 一次DB查询筛选出不存在的用户
+        2. 一次批量查询用户管理获取用户信息
+        3. 所有用户的分布式锁内再次检查后批量创建，避免并发请求重复创建
+        """
+        username_set = set(usernames)
+        exist_usernames = set(User.objects.filter(username__in=username_set).values_list("username", flat=True))
+        missing_usernames = username_set - exist_usernames
+        if not missing_usernames:
+            return []
+
+        users = usermgr.list_user_by_usernames(sorted(missing_usernames))
+        not_found_usernames = missing_usernames - {u["username"] for u in users}
+        if not users:
+            return sorted(not_found_usernames)
+
+        with ExitStack() as stack:
+            # 按用户名排序加锁, 避免并发批量同步时死锁
+            for username in sorted(u["username"] for u in users):
+                stack.enter_context(_user_lock(username))
+
+            exist_ids = set(User.objects.filter(id__in=[u["id"] for u in users]).values_list("id", flat=True))
+            users = [u for u in users if u["id"] not in exist_ids]
+            if users:
+                User.objects.bulk_create(
+                    [
+                        User(
+                            id=u["id"],
+                            username=u["username"],
+                            display_name=u["display_name"] or u["username"],
+                            staff_status=u["staff_status"],
+                            category_id=u["category_id"],
+                        )
+                        for u in users
+                    ],
+                    batch_size=1000,
+                )
+                iam.create_subjects(
+                    [{"type": "user", "id": u["username"], "name": u["display_name"] or u["username"]} for u in users]
+                )
+                organization_search_index_cache.update(
+                    [[u["username"], u["display_name"] or u["username"]] for u in users]
+                )
+
+        return sorted(not_found_usernames)
 
     def sync_new_users(self):
         """
@@ -91,6 +160,8 @@ class Syncer:
         User.objects.bulk_create(created_users, batch_size=1000)
         # 后台新建
         iam.create_subjects([{"type": "user", "id": user["username"], "name": user["display_name"]} for user in users])
+        # 新增用户需要能被搜索到, 原地更新索引, 不需要全量重建
+        organization_search_index_cache.update([[user["username"], user["display_name"]] for user in users])
 
     # def sync_full_organization(self):
     #     # TODO: 重构时将 backend.apps.organization.tasks里的全量同步迁移到这里
@@ -13,6 +13,8 @@ from typing import Dict
 from backend.component import usermgr
 from backend.util.cache import region
 
+DEFAULT_CATEGORY_NAME = "默认目录"
+
 
 @region.cache_on_arguments()
 def _get_category_dict() -> Dict[int, str]:
@@ -22,10 +24,15 @@ def _get_category_dict() -> Dict[int, str]:
     return {i["id"]: i["display_name"] for i in categories}
 
 
+def get_category_dict() -> Dict[int, str]:
+    """获取所有目录的ID与Name映射"""
+    return _get_category_dict()
+
+
 def get_category_name(category_id: int):
     """获取目录名称"""
     category_dict = _get_category_dict()
-    return category_dict.get(category_id) or "默认目录"
+    return category_dict.get(category_id) or DEFAULT_CATEGORY_NAME
 
 
 # ---------------------------------------------------------------------------------------------- #
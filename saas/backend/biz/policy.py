@@ -11,7 +11,7 @@ specific language governing permissions and limitations under the License.
 import time
 from copy import deepcopy
 from itertools import chain, groupby
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from django.utils.translation import gettext as _
 from pydantic.tools import parse_obj_as
@@ -38,8 +38,10 @@ from backend.service.policy.query import (
     PathNode,
     Policy,
     PolicyQueryService,
+    PolicySummary,
     RelatedResource,
     SystemCounter,
+    new_backend_policy_list_by_subject,
 )
 from backend.service.resource_type import ResourceTypeService
 from backend.service.system import SystemService
@@ -914,6 +916,33 @@ class PolicyQueryBiz:
         policy_list = self.new_policy_list(system_id, subject)
         return policy_list.policies
 
+    def list_summary_by_subject(self, system_id: str, subject: Subject) -> List[PolicySummary]:
+        """
+        查询subject指定系统的策略概要信息, 不包含资源条件
+        """
+        return self.svc.list_summary_by_subject(system_id, subject)
+
+    def new_paging_fetcher_by_subject(
+        self, system_id: str, subject: Subject
+    ) -> Callable[[int, int], Tuple[List[PolicyBean], Optional[int]]]:
+        """
+        生成游标分页查询subject指定系统策略的函数, 用于连续查询多页(如流式返回)
+
+        后端的策略列表只在生成时查询一次, 所有分页共用, 后端查询出错时在生成时即抛出异常
+        """
+        backend_policy_list = new_backend_policy_list_by_subject(system_id, subject)
+
+        def fetch(cursor: int, limit: int) -> Tuple[List[PolicyBean], Optional[int]]:
+            policies, next_cursor = self.svc.list_paging_by_subject(
+                system_id, subject, cursor, limit, backend_policy_list
+            )
+            policy_list = PolicyBeanList(
+                system_id, parse_obj_as(List[PolicyBean], policies), need_fill_empty_fields=True
+            )
+            return policy_list.policies, next_cursor
+
+        return fetch
+
     def new_policy_list(self, system_id: str, subject: Subject) -> PolicyBeanList:
         policies = self.svc.list_by_subject(system_id, subject)
         policy_list = PolicyBeanList(system_id, parse_obj_as(List[PolicyBean], policies), need_fill_empty_fields=True)
@@ -933,17 +962,31 @@ class PolicyQueryBiz:
         """
         查询subject有权限的系统-policy数量信息
         """
+        return self.list_system_counter_by_subjects(subject.type, [subject.id])[subject.id]
+
+    def list_system_counter_by_subjects(
+        self, subject_type: str, subject_ids: List[str]
+    ) -> Dict[str, List[SystemCounterBean]]:
+        """
+        批量查询subjects有权限的系统-policy数量信息
+        """
+        system_counters = self.svc.list_system_counter_by_subjects(subject_type, subject_ids)
+        if not system_counters:
+            return {subject_id: [] for subject_id in subject_ids}
+
         system_list = self.system_svc.new_system_list()
-        system_counts = self.svc.list_system_counter_by_subject(subject)
-        system_count_beans = parse_obj_as(List[SystemCounterBean], system_counts)
+        subject_system_counters = {}
+        for subject_id in subject_ids:
+            system_count_beans = parse_obj_as(List[SystemCounterBean], system_counters.get(subject_id, []))
+            for scb in system_count_beans:
+                system = system_list.get(scb.id)
+                if not system:
+                    continue
+                scb.fill_empty_fields(system)
 
-        for scb in system_count_beans:
-            system = system_list.get(scb.id)
-            if not system:
-                continue
-            scb.fill_empty_fields(system)
+            subject_system_counters[subject_id] = system_count_beans
 
-        return system_count_beans
+        return subject_system_counters
 
     def get_policy_resource_type_conditions(
         self, subject: Subject, policy_id: int, resource_system: str, resource_type: str
@@ -1042,10 +1085,11 @@ class PolicyOperationBiz:
 
         覆盖更新, 返回更新后的策略
         """
-        old_policy_list = self.query_biz.new_policy_list(system_id, subject)
+        # 只需要已有策略的过期时间与策略ID, 不需要查询资源条件
+        old_policy_dict = {p.action_id: p for p in self.query_biz.list_summary_by_subject(system_id, subject)}
         update_policy_list = PolicyBeanList(system_id, policies, need_fill_empty_fields=True)
         for policy in update_policy_list.policies:
-            old_policy = old_policy_list.get(policy.action_id)
+            old_policy = old_policy_dict.get(policy.action_id)
             if not old_policy:
                 raise error_codes.VALIDATE_ERROR.format(_("用户组没有{}操作的权限").format(policy.action_id))
             policy.expired_at = old_policy.expired_at
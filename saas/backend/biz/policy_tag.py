@@ -10,7 +10,7 @@ specific language governing permissions and limitations under the License.
 """
 from abc import ABC, abstractmethod
 from copy import deepcopy
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.biz.policy import (
     ConditionBean,
@@ -21,11 +21,17 @@ from backend.biz.policy import (
     RelatedResourceBean,
 )
 from backend.service.policy.query import Attribute, Value
-from backend.service.utils.translate import translate_path
 
 from .constants import ConditionTag, PolicyTag
 
 
+def _hash_path(nodes: List[PathNodeBean]) -> str:
+    """
+    路径的字符串表示, 与translate_path一致, 直接读取节点属性, 避免转换为dict
+    """
+    return "/" + "".join("{},{}/".format(node.type, node.id) for node in nodes)
+
+
 class AbstractTagBean(ABC):
     @abstractmethod
     def set_tag(self, tag: str):
@@ -76,31 +82,33 @@ class InstanceTagBean(TagNoneMixin, InstanceBean, AbstractTagBean):
         for node in self.iter_path_node():
             node.set_tag(tag)
 
-    def _get_path_set(self):
-        return {translate_path(PathNodeTagBeanList(p).dict()) for p in self.path}
-
     def compare_and_tag(self, instance: "InstanceTagBean") -> "InstanceTagBean":
+        """
+        对比实例的路径, 每条路径只计算一次hash
+
+        NOTE: 直接在双方的路径节点上打标签, 不再复制
+        """
         tag_instance = InstanceTagBean(tag=ConditionTag.UNCHANGED.value, type=self.type, name=self.name, path=[])
 
-        # 生成path hash set
-        new_path_set = self._get_path_set()
-        old_path_dict = {translate_path(PathNodeTagBeanList(p).dict()): p for p in instance.path}
+        old_path_hashes = [_hash_path(p) for p in instance.path]
+        old_path_set = set(old_path_hashes)
+        new_path_set = set()
 
         for p in self.path:
-            node_list = PathNodeTagBeanList(p)
+            _hash = _hash_path(p)
+            new_path_set.add(_hash)
             # 标记新增的path
-            if translate_path(node_list.dict()) not in old_path_dict:
-                node_list.set_tag(ConditionTag.ADD.value)
-            else:
-                node_list.set_tag(ConditionTag.UNCHANGED.value)
-            tag_instance.path.append(node_list.nodes)
+            tag = ConditionTag.UNCHANGED.value if _hash in old_path_set else ConditionTag.ADD.value
+            for node in p:
+                node.set_tag(tag)
+            tag_instance.path.append(p)
 
         # 标记删除的path
-        for p in instance.path:
-            node_list = PathNodeTagBeanList(p)
-            if translate_path(node_list.dict()) not in new_path_set:
-                node_list.set_tag(ConditionTag.DELETE.value)
-                tag_instance.path.append(node_list.nodes)
+        for p, _hash in zip(instance.path, old_path_hashes):
+            if _hash not in new_path_set:
+                for node in p:
+                    node.set_tag(ConditionTag.DELETE.value)
+                tag_instance.path.append(p)
 
         return tag_instance
 
@@ -127,7 +135,7 @@ class AttributeTagBean(TagNoneMixin, Attribute, AbstractTagBean):
         new_id_set = {v.id for v in self.values}
         old_id_set = {v.id for v in attribute.values}
 
-        for v in deepcopy(self.values):
+        for v in self.values:
             # 标记新增的属性
             if v.id not in old_id_set:
                 v.tag = ConditionTag.ADD.value
@@ -137,7 +145,7 @@ class AttributeTagBean(TagNoneMixin, Attribute, AbstractTagBean):
 
         # 标记删除的属性
         if old_id_set - new_id_set:
-            for v in deepcopy(attribute.values):
+            for v in attribute.values:
                 if v.id not in new_id_set:
                     v.tag = ConditionTag.DELETE.value
                     tag_attribute.values.append(v)
@@ -160,6 +168,8 @@ class ConditionTagBean(TagNoneMixin, ConditionBean, AbstractTagBean):
     def compare_and_tag(self, condition: "ConditionTagBean") -> "ConditionTagBean":
         """
         对比单个条件
+
+        NOTE: 新增/删除的实例与属性直接在原对象上打标签, 不再复制
         """
         tag_condition = ConditionTagBean(tag=ConditionTag.UNCHANGED.value, id=self.id, instances=[], attributes=[])
 
@@ -171,9 +181,8 @@ class ConditionTagBean(TagNoneMixin, ConditionBean, AbstractTagBean):
         for i in self.instances:
             # 如果实例类型在老的实例中不存在, 则属于新增
             if i.type not in old_instance_type_set:
-                tag_instance = deepcopy(i)
-                tag_instance.set_tag(ConditionTag.ADD.value)
-                tag_condition.instances.append(tag_instance)
+                i.set_tag(ConditionTag.ADD.value)
+                tag_condition.instances.append(i)
             # 已存在, 需要继续对比
             else:
                 tag_condition.instances.append(i.compare_and_tag(old_instance_type_dict[i.type]))
@@ -182,9 +191,8 @@ class ConditionTagBean(TagNoneMixin, ConditionBean, AbstractTagBean):
         if old_instance_type_set - new_instance_type_set:
             for i in condition.instances:
                 if i.type not in new_instance_type_set:
-                    tag_instance = deepcopy(i)
-                    tag_instance.set_tag(ConditionTag.DELETE.value)
-                    tag_condition.instances.append(tag_instance)
+                    i.set_tag(ConditionTag.DELETE.value)
+                    tag_condition.instances.append(i)
 
         new_attribute_id_set = {i.id for i in self.attributes}
         old_attribute_id_set = {i.id for i in condition.attributes}
@@ -194,9 +202,8 @@ class ConditionTagBean(TagNoneMixin, ConditionBean, AbstractTagBean):
         for a in self.attributes:
             # 如果属性的key不在老的属性数据中, 则属于新增
             if a.id not in old_attribute_id_set:
-                tag_attribute = deepcopy(a)
-                tag_attribute.set_tag(ConditionTag.ADD.value)
-                tag_condition.attributes.append(tag_attribute)
+                a.set_tag(ConditionTag.ADD.value)
+                tag_condition.attributes.append(a)
             # 如果在老的数据中, 则继续对比
             else:
                 tag_condition.attributes.append(a.compare_and_tag(old_attribute_id_dict[a.id]))
@@ -205,9 +212,8 @@ class ConditionTagBean(TagNoneMixin, ConditionBean, AbstractTagBean):
         if old_attribute_id_set - new_attribute_id_set:
             for a in condition.attributes:
                 if a.id not in new_attribute_id_set:
-                    tag_attribute = deepcopy(a)
-                    tag_attribute.set_tag(ConditionTag.DELETE.value)
-                    tag_condition.attributes.append(tag_attribute)
+                    a.set_tag(ConditionTag.DELETE.value)
+                    tag_condition.attributes.append(a)
 
         return tag_condition
 
@@ -270,58 +276,51 @@ class ConditionTagBiz:
         """
         delete_tag = ConditionTag.DELETE.value if is_template else ConditionTag.UNCHANGED.value
 
-        # 生成以属性的hash为key, 并且实例不为空的条件的字典
-        new_dict = {c.hash_attributes(): c for c in new_conditions if not c.has_no_instances()}
-        old_dict = {c.hash_attributes(): c for c in old_conditions if not c.has_no_instances()}
-
-        # 实例不为空条件的属性hash set
-        new_set = set(new_dict.keys())
-        old_set = set(old_dict.keys())
-
-        # 生成以属性的hash为key, 并且实例为空的条件的字典
-        new_empty_dict = {c.hash_attributes(): c for c in new_conditions if c.has_no_instances()}
-        old_empty_dict = {c.hash_attributes(): c for c in old_conditions if c.has_no_instances()}
-
-        # 实例为空的条件的属性hash set
-        new_empty_set = set(new_empty_dict.keys())
-        old_empty_set = set(old_empty_dict.keys())
+        # 以属性的hash为key, 分别索引实例不为空与实例为空的条件
+        new_dict, new_empty_dict = self._index_conditions(new_conditions)
+        old_dict, old_empty_dict = self._index_conditions(old_conditions)
 
         tag_condition = []
 
-        # 标记新增的条件
-        for key in new_set - old_set:
-            condition = new_dict[key]
-            condition.set_tag(ConditionTag.ADD.value)
-            tag_condition.append(condition)
-
-        # 标记变更或不变的条件
-        for key in new_set & old_set:
-            new_condition = new_dict[key]
-            old_condition = old_dict[key]
-            tag_condition.append(new_condition.compare_and_tag(old_condition))
-
-        # 标记移除的条件
-        for key in old_set - new_set:
-            condition = old_dict[key]
-            condition.set_tag(delete_tag)
-            tag_condition.append(condition)
+        # 实例不为空的条件: 新增/变更或不变
+        for key, condition in new_dict.items():
+            if key in old_dict:
+                tag_condition.append(condition.compare_and_tag(old_dict[key]))
+            else:
+                condition.set_tag(ConditionTag.ADD.value)
+                tag_condition.append(condition)
 
-        # 标记新增的只有属性的条件
-        for key in new_empty_set - old_empty_set:
-            condition = new_empty_dict[key]
-            condition.set_tag(ConditionTag.ADD.value)
+        # 只有属性的条件: 新增/不变
+        for key, condition in new_empty_dict.items():
+            condition.set_tag(ConditionTag.UNCHANGED.value if key in old_empty_dict else ConditionTag.ADD.value)
             tag_condition.append(condition)
 
-        # 标记未变的只有属性的条件
-        for key in new_empty_set & old_empty_set:
-            condition = new_empty_dict[key]
-            condition.set_tag(ConditionTag.UNCHANGED.value)
-            tag_condition.append(condition)
+        # 标记移除的条件
+        for key, condition in old_dict.items():
+            if key not in new_dict:
+                condition.set_tag(delete_tag)
+                tag_condition.append(condition)
 
         # 标记移除的只有属性的条件
-        for key in old_empty_set - new_empty_set:
-            condition = old_empty_dict[key]
-            condition.set_tag(delete_tag)
-            tag_condition.append(condition)
+        for key, condition in old_empty_dict.items():
+            if key not in new_empty_dict:
+                condition.set_tag(delete_tag)
+                tag_condition.append(condition)
 
         return sorted(tag_condition, key=lambda c: c.id)
+
+    def _index_conditions(
+        self, conditions: List[ConditionTagBean]
+    ) -> Tuple[Dict[Tuple, ConditionTagBean], Dict[Tuple, ConditionTagBean]]:
+        """
+        遍历一次条件列表, 每个条件只计算一次属性hash
+
+        return: 实例不为空的条件字典, 实例为空的条件字典
+        """
+        condition_dict, empty_condition_dict = {}, {}
+        for c in conditions:
+            if c.has_no_instances():
+                empty_condition_dict[c.hash_attributes()] = c
+            else:
+                condition_dict[c.hash_attributes()] = c
+        return condition_dict, empty_condition_dict
@@ -9,8 +9,7 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 import logging
-from collections import defaultdict
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from django.db.models import Q
 from django.utils.functional import cached_property
@@ -19,7 +18,8 @@ from pydantic import BaseModel, parse_obj_as
 
 from backend.apps.application.models import Application
 from backend.apps.group.models import Group
-from backend.apps.organization.models import Department, DepartmentMember, User
+from backend.apps.organization.closure import get_department_closure
+from backend.apps.organization.models import User
 from backend.apps.role.models import Role, RoleRelatedObject, RoleUser, ScopeSubject
 from backend.apps.template.models import PermTemplate
 from backend.biz.policy import (
@@ -257,7 +257,7 @@ class RoleListQuery:
         """
         assert self.user
 
-        template_ids = self._get_role_related_object_ids(RoleRelatedObjectType.TEMPLATE.value)
+        template_ids = self._query_role_related_object_ids(RoleRelatedObjectType.TEMPLATE.value)
         return PermTemplate.objects.filter(id__in=template_ids)
 
     def query_group(self):
@@ -266,45 +266,44 @@ class RoleListQuery:
         """
         assert self.user
 
-        group_ids = self._get_role_related_object_ids(RoleRelatedObjectType.GROUP.value)
+        group_ids = self._query_role_related_object_ids(RoleRelatedObjectType.GROUP.value)
         return Group.objects.filter(id__in=group_ids)
 
-    def _get_role_related_object_ids(self, object_type: str) -> List[int]:
+    def _query_role_related_object_ids(self, object_type: str):
+        """
+        角色关联对象id的子查询, 由调用方拼接为一次带子查询的SQL, 避免将大量id放入IN条件
+        """
         if self.role.type != RoleType.STAFF.value:
-            return list(
-                RoleRelatedObject.objects.filter(role_id=self.role.id, object_type=object_type).values_list(
-                    "object_id", flat=True
-                )
-            )
+            role_ids = [self.role.id]
+        else:
+            role_ids = self._query_authorization_scope_include_user_role_ids()
 
-        mgr_ids = self._list_authorization_scope_include_user_role_ids()
-        # 查询 所有这些管理员创建的 对象 ids
-        return list(
-            RoleRelatedObject.objects.filter(role_id__in=mgr_ids, object_type=object_type).values_list(
-                "object_id", flat=True
-            )
-        )
+        return RoleRelatedObject.objects.filter(role_id__in=role_ids, object_type=object_type).values("object_id")
 
-    def _list_authorization_scope_include_user_role_ids(self):
+    def _query_authorization_scope_include_user_role_ids(self):
         """
-        授权范围包含用户的角色id列表
+        授权范围包含用户的角色id子查询
+        1. 授权对象范围包含用户或用户所在部门及其祖先部门的角色, 部门祖先由进程内的部门闭包计算, 只有少量部门id
+        2. 授权对象范围为任意的角色
+        3. 超级管理员与系统管理员
         """
-        # 1. 查询普通用户所在的部门id
-        department_ids = self.user.ancestor_department_ids
+        department_ids = [str(_id) for _id in self.user.ancestor_department_ids]
 
-        # 2. 查询 subjects 相关的分级管理员
-        grade_mgr_ids = ScopeSubject.objects.filter(
+        scope_role_ids = ScopeSubject.objects.filter(
             Q(subject_type=RoleScopeSubjectType.DEPARTMENT.value, subject_id__in=department_ids)
             | Q(subject_type=RoleScopeSubjectType.USER.value, subject_id=self.user.username)  # noqa
             | Q(subject_type=SUBJECT_TYPE_ALL, subject_id=SUBJECT_ALL)  # noqa
-        ).values_list("role_id", flat=True)
+        ).values("role_id")
 
-        # 3. 查询 超级管理员 + 系统管理员的 ids
-        super_ids = Role.objects.filter(
-            Q(type=RoleType.SUPER_MANAGER.value) | Q(type=RoleType.SYSTEM_MANAGER.value)
-        ).values_list("id", flat=True)
+        return Role.objects.filter(
+            Q(type__in=[RoleType.SUPER_MANAGER.value, RoleType.SYSTEM_MANAGER.value]) | Q(id__in=scope_role_ids)
+        ).values("id")
 
-        return list(grade_mgr_ids) + list(super_ids)
+    def _list_authorization_scope_include_user_role_ids(self) -> List[int]:
+        """
+        授权范围包含用户的角色id列表
+        """
+        return list(self._query_authorization_scope_include_user_role_ids().values_list("id", flat=True))
 
     def list_role_scope_include_user(self):
         """
@@ -400,13 +399,29 @@ class RoleAuthorizationScopeChecker:
         """
         移除不在授权范围内的路径
         """
-        if self._check_action_in_scope(system_id, action_id) == ACTION_ALL:
+        scope_path_prefixes = self.list_scope_path_prefixes(system_id, action_id)
+        if scope_path_prefixes is None:
             return paths
 
+        return [
+            path
+            for path in paths
+            if self.is_path_in_scope(PathNodeBeanList(path).to_path_string(), scope_path_prefixes)
+        ]
+
+    def list_scope_path_prefixes(self, system_id: str, action_id: str) -> Optional[List[Tuple[str, ...]]]:
+        """
+        生成操作授权范围的路径前缀, 每个资源类型一组, 可用于批量检查路径
+
+        return: None表示操作的授权范围不限制
+        """
+        if self._check_action_in_scope(system_id, action_id) == ACTION_ALL:
+            return None
+
         policy_scope = PolicyBean.parse_obj(self.system_action_scope[system_id][action_id])
+        scope_path_prefixes = []
         for rrt in policy_scope.related_resource_types:
             scope_str_paths = []
-            inside_paths = []
             for path_list in rrt.iter_path_list(ignore_attribute=True):
                 sp = path_list.to_path_string()
                 # 处理路径中存在*的情况
@@ -415,20 +430,16 @@ class RoleAuthorizationScopeChecker:
 
                 scope_str_paths.append(sp)
 
-            for path in paths:
-                if self._is_path_match_scope_paths(path, scope_str_paths):
-                    inside_paths.append(path)
+            scope_path_prefixes.append(tuple(scope_str_paths))
 
-            paths = inside_paths
+        return scope_path_prefixes
 
-        return paths
-
-    def _is_path_match_scope_paths(self, path: List[PathNodeBean], scope_str_paths: List[str]):
-        tp = PathNodeBeanList(path).to_path_string()
-        for sp in scope_str_paths:
-            if tp.startswith(sp):
-                return True
-        return False
+    @staticmethod
+    def is_path_in_scope(path_string: str, scope_path_prefixes: List[Tuple[str, ...]]) -> bool:
+        """
+        路径需要在每个资源类型的授权范围中
+        """
+        return all(path_string.startswith(prefixes) for prefixes in scope_path_prefixes)
 
     def check_policies(self, system_id: str, policies: List[PolicyBean]):
         """
@@ -479,7 +490,6 @@ class RoleSubjectScopeChecker:
     def __init__(self, role: Role):
         self.role = role
 
-    # TODO 代码优化, 圈复杂度28, 规范要求20以下
     def check(self, subjects: List[Subject], raise_exception: bool = True) -> List[Subject]:
         if self.role.type == RoleType.STAFF.value:
             raise error_codes.FORBIDDEN  # 普通用户不能授权
@@ -500,61 +510,34 @@ class RoleSubjectScopeChecker:
         # 剩下需要的校验的subject，若是用户则需要其所有所在部门(包括祖先部门)在scope部门里，若是部门则需要其祖先部门在scope部门里
         department_scopes = {int(s.id) for s in scopes if s.type == SubjectType.DEPARTMENT.value}
 
-        # 【对于部门】则需要查询其祖先是否在department_scopes里，
-        # 【对于用户】则需要查询用户在的所有部门的祖先是否在department_scopes里
-        # 所有需要查询祖先的部门，为了减少DB查询，会先获取用户和部门需要查询祖先的所有部门，然后再一次性查询DB
-        need_query_ancestor_departments = set()
-        # 需要查询的用户
-        need_query_users = set()
-        for s in need_check_subject:
-            if s.type == SubjectType.DEPARTMENT.value:
-                need_query_ancestor_departments.add(int(s.id))
-            elif s.type == SubjectType.USER.value:
-                need_query_users.add(s.id)
-
-        # DB查询用户，需要知道用户的所有在的部门，不包含部门的祖先 username 对应的 set(DepartmentIDs)
-        user_direct_department = defaultdict(set)
-        if need_query_users:
-            users = User.objects.filter(username__in=need_query_users)
-            # 查询用户直接加入的部门
-            department_members = DepartmentMember.objects.filter(user_id__in=[i.id for i in users])
-            # 这里是记录user_id与其直接部门ID的集合, user_id 对应的 set(DepartmentIDs)
-            user_id_direct_departments = defaultdict(set)
-            for dm in department_members:
-                user_id_direct_departments[dm.user_id].add(dm.department_id)
-            # 遍历每个用户，获得其所有所在的部门
-            for u in users:
-                # 将user_id_direct_departments转换为user_direct_department
-                user_direct_department[u.username] = user_id_direct_departments[u.id]
-                # 每个部门也是需要查询其祖先部门的
-                need_query_ancestor_departments.update(user_id_direct_departments[u.id])
-
-        # DB查询所有部门的祖先部门，包括部门本身
-        department_ancestors = defaultdict(set)
-        if need_query_ancestor_departments:
-            departments = Department.objects.filter(id__in=need_query_ancestor_departments)
-            for d in departments:
-                department_ancestors[d.id] = set(d.ancestor_ids)
-                department_ancestors[d.id].add(d.id)
+        # 通过部门闭包索引批量判断，无需逐个部门解析祖先
+        closure = get_department_closure()
+
+        # 【对于部门】则需要其自身或祖先在department_scopes里
+        check_department_ids = {int(s.id) for s in need_check_subject if s.type == SubjectType.DEPARTMENT.value}
+        in_scope_department_ids = closure.filter_departments_in_scope(check_department_ids, department_scopes)
+
+        # 【对于用户】则需要用户所在的任一部门或其祖先在department_scopes里
+        check_usernames = {s.id for s in need_check_subject if s.type == SubjectType.USER.value}
+        in_scope_usernames = set()
+        if check_usernames:
+            user_id_names = dict(User.objects.filter(username__in=check_usernames).values_list("id", "username"))
+            in_scope_user_ids = closure.filter_users_in_scope(user_id_names.keys(), department_scopes)
+            in_scope_usernames = {user_id_names[_id] for _id in in_scope_user_ids}
 
         need_delete_set = set()
 
         # 开始校验
         for s in need_check_subject:
-            # 【对于部门】则需要查询其祖先是否在department_scopes里，
             if s.type == SubjectType.DEPARTMENT.value:
-                if len(department_ancestors[int(s.id)] & department_scopes) == 0:
+                if int(s.id) not in in_scope_department_ids:
                     if raise_exception:
                         raise error_codes.FORBIDDEN.format(message=_("部门({})不满足角色的授权范围").format(s.id), replace=True)
 
                     need_delete_set.add((s.type, s.id))
 
             elif s.type == SubjectType.USER.value:
-                # 校验用户，需要查询遍历用户的每个直接部门，然后再去每个直接部门的祖先，所有祖先和直接部门的集合即为用户所有所在的部门
-                department_set = set()
-                for d in user_direct_department[s.id]:
-                    department_set.update(department_ancestors[d])
-                if len(department_set & department_scopes) == 0:
+                if s.id not in in_scope_usernames:
                     if raise_exception:
                         raise error_codes.FORBIDDEN.format(message=_("用户({})不满足角色的授权范围").format(s.id), replace=True)
 
@@ -8,7 +8,7 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from django.db import transaction
 from django.http import Http404
@@ -16,6 +16,7 @@ from django.utils.translation import gettext as _
 from pydantic import BaseModel, parse_obj_as
 from pydantic.fields import Field
 
+from backend.apps.action.models import ActionRelatedObject
 from backend.apps.group.models import GroupAuthorizeLock
 from backend.apps.role.models import RoleRelatedObject
 from backend.apps.template.models import (
@@ -35,6 +36,7 @@ from backend.biz.policy import (
     group_paths,
 )
 from backend.biz.role import RoleAuthorizationScopeChecker
+from backend.common.concurrency import concurrent_map
 from backend.common.error_codes import error_codes
 from backend.common.time import PERMANENT_SECONDS
 from backend.service.action import ActionList, ActionService
@@ -42,6 +44,10 @@ from backend.service.constants import RoleRelatedObjectType, SubjectType, Templa
 from backend.service.models import Action, ChainNode, Subject
 from backend.service.policy.query import Policy
 from backend.service.template import TemplateGroupPreCommit, TemplateService
+from backend.service.utils.translate import translate_path
+from backend.util.basic import chunked
+
+from .constants import TEMPLATE_CLONE_POLICY_GROUP_CHUNK_SIZE, TEMPLATE_CLONE_POLICY_MAX_WORKERS
 
 
 class TemplateCreateBean(BaseModel):
@@ -94,6 +100,7 @@ class TemplateBiz:
             template.action_ids = info.action_ids
             template.save(force_insert=True)
             RoleRelatedObject.objects.create_template_relation(role_id, template.id)
+            ActionRelatedObject.objects.reset_template_actions(template.id, template.system_id, template.action_ids)
 
         return template
 
@@ -122,6 +129,7 @@ class TemplateBiz:
         with transaction.atomic():
             PermTemplate.objects.filter(id=template_id).delete()
             RoleRelatedObject.objects.delete_template_relation(template_id)
+            ActionRelatedObject.objects.delete_template(template_id)
 
     def grant_subject(self, system_id: str, template_id: int, subject: Subject, policies: List[PolicyBean]):
         """
@@ -138,12 +146,11 @@ class TemplateBiz:
         )
         return [s for s in subjects if s not in set(exists_subjects)]
 
-    def revoke_subjects(self, system_id: str, template_id: int, members: List[Subject]):
+    def revoke_subjects(self, system_id: str, template_id: int, members: List[Subject]) -> List[Dict]:
         """
-        批量移除模板成员
+        批量移除模板成员, 返回后端删除权限失败的成员
         """
-        for member in members:
-            self.svc.revoke_subject(system_id, template_id, member)
+        return self.svc.revoke_subjects(system_id, template_id, members)
 
     def delete_template_auth_by_subject(self, subject: Subject):
         """
@@ -152,9 +159,8 @@ class TemplateBiz:
         template_ids = list(
             PermTemplatePolicyAuthorized.objects.filter_by_subject(subject).values_list("template_id", flat=True)
         )
-        templates = PermTemplate.objects.filter(id__in=template_ids)
-        for template in templates:
-            self.svc.revoke_subject(template.system_id, template.id, subject)
+        templates = list(PermTemplate.objects.filter(id__in=template_ids).only("id", "system_id"))
+        self.svc.revoke_subject_templates(subject, templates)
 
     def create_or_update_group_pre_commit(self, template_id: int, pre_commits: List[TemplateGroupPreCommitBean]):
         """
@@ -208,6 +214,7 @@ class TemplateBiz:
         template.action_ids = lock.action_ids
         with transaction.atomic():
             template.save(update_fields=["_action_ids"])
+            ActionRelatedObject.objects.reset_template_actions(template.id, template.system_id, template.action_ids)
             lock.delete()
             PermTemplatePreGroupSync.objects.delete_by_template(template_id)
 
@@ -370,16 +377,6 @@ class ChainNodeList:
     def length(self) -> int:
         return len(self.nodes)
 
-    def is_match_path(self, path: List[PathNodeBean]) -> bool:
-        if len(path) > self.length:
-            return False
-
-        for path_node, chain_node in zip(path, self.nodes):
-            if not chain_node.match_resource_type(path_node.to_path_resource_type()):
-                return False
-
-        return True
-
 
 class ChainList:
     def __init__(self, chains: List[ChainNodeList]) -> None:
@@ -428,6 +425,45 @@ class ChainList:
         return len(self.chains)
 
 
+class ChainPrefixMatcher:
+    """
+    链路前缀匹配器
+
+    将ChainList中的所有链编译为前缀树, 节点为 resource_type_id -> system_id -> 子节点
+    路径能够沿前缀树走完即为匹配, 即路径是某条链的前缀
+    """
+
+    def __init__(self, chain_list: ChainList) -> None:
+        self._root: Dict[str, Dict[str, Dict]] = {}
+        for chain in chain_list.chains:
+            node = self._root
+            for chain_node in chain.nodes:
+                node = node.setdefault(chain_node.id, {}).setdefault(chain_node.system_id, {})
+
+    def is_match(self, path: List[Dict[str, Any]]) -> bool:
+        """
+        path: 原始的路径节点数据 [{"system_id": "", "type": "", "id": ""}]
+        """
+        if not self._root:
+            return False
+
+        frontier = [self._root]
+        for path_node in path:
+            children_list = [node[path_node["type"]] for node in frontier if path_node["type"] in node]
+
+            # 兼容无权限申请的system_id可能为空情况
+            system_id = path_node.get("system_id", "")
+            if system_id == "":
+                frontier = [child for children in children_list for child in children.values()]
+            else:
+                frontier = [children[system_id] for children in children_list if system_id in children]
+
+            if not frontier:
+                return False
+
+        return True
+
+
 class TemplatePolicyCloneBiz:
     """
     模板策略克隆BIZ
@@ -457,74 +493,100 @@ class TemplatePolicyCloneBiz:
         # 配置不存在
         if action_id not in config_dict or source_action_id not in config_dict[action_id]:
             return []
-        chain_list = config_dict[action_id][source_action_id]
 
         new_action = action_list.get(action_id)
         if new_action is None:
             return []
 
-        scope_check = RoleAuthorizationScopeChecker(role=role)
-        authorized_templates = PermTemplatePolicyAuthorized.objects.filter_by_template(template.id).filter(
-            subject_type=SubjectType.GROUP.value, subject_id__in=group_ids
+        # 前缀匹配器与role的授权范围对所有用户组都一样, 只生成一次
+        matcher = ChainPrefixMatcher(config_dict[action_id][source_action_id])
+        scope_path_prefixes = RoleAuthorizationScopeChecker(role=role).list_scope_path_prefixes(
+            template.system_id, action_id
         )
 
-        group_policies = []
-        for authorized_template in authorized_templates:
-            policy_list = PolicyBeanList(
-                template.system_id,
-                [PolicyBean.parse_obj(one) for one in authorized_template.data["actions"]],
+        def gen_chunk_clone_policies(chunk_group_ids: List[str]) -> List[Tuple[int, PolicyBean]]:
+            authorized_templates = (
+                PermTemplatePolicyAuthorized.objects.filter_by_template(template.id)
+                .filter(subject_type=SubjectType.GROUP.value, subject_id__in=chunk_group_ids)
+                .only("subject_id", "_data")
             )
-            source_policy = policy_list.get(source_action_id)
-            if source_policy is None:
-                continue
 
-            policy = self._gen_clone_policy(template.system_id, new_action, source_policy, chain_list, scope_check)
-            if not policy:
-                continue
+            chunk_policies = []
+            for authorized_template in authorized_templates:
+                source_policy = self._get_raw_policy(authorized_template.data["actions"], source_action_id)
+                if source_policy is None:
+                    continue
+
+                match_paths = self._list_clone_paths(source_policy, matcher, scope_path_prefixes)
+                if not match_paths:
+                    continue
 
-            # 填充名称
-            clone_policy_list = PolicyBeanList(template.system_id, [policy], need_fill_empty_fields=True)
-            group_policies.append(
-                GroupClonePolicy(group_id=int(authorized_template.subject_id), policy=clone_policy_list.policies[0])
+                chunk_policies.append(
+                    (int(authorized_template.subject_id), self._gen_policy_by_paths(new_action, match_paths))
+                )
+
+            return chunk_policies
+
+        group_policies = [
+            one
+            for chunk_policies in concurrent_map(
+                gen_chunk_clone_policies,
+                chunked(group_ids, TEMPLATE_CLONE_POLICY_GROUP_CHUNK_SIZE),
+                max_workers=TEMPLATE_CLONE_POLICY_MAX_WORKERS,
             )
+            for one in chunk_policies
+        ]
+        if not group_policies:
+            return []
 
-        return group_policies
+        # 填充名称, 所有用户组的策略一起填充
+        clone_policy_list = PolicyBeanList(
+            template.system_id, [policy for _, policy in group_policies], need_fill_empty_fields=True
+        )
+        return [
+            GroupClonePolicy(group_id=group_id, policy=policy)
+            for (group_id, _), policy in zip(group_policies, clone_policy_list.policies)
+        ]
+
+    def _get_raw_policy(self, policies: List[Dict[str, Any]], action_id: str) -> Optional[Dict[str, Any]]:
+        for policy in policies:
+            if policy["id"] == action_id:
+                return policy
+        return None
 
-    def _gen_clone_policy(
+    def _list_clone_paths(
         self,
-        system_id: str,
-        action: Action,
-        source_policy: PolicyBean,
-        chain_list: ChainList,
-        scope_checker: RoleAuthorizationScopeChecker,
-    ) -> Optional[PolicyBean]:
+        source_policy: Dict[str, Any],
+        matcher: ChainPrefixMatcher,
+        scope_path_prefixes: Optional[List[Tuple[str, ...]]],
+    ) -> List[List[PathNodeBean]]:
         """
-        生成clone的policy
+        遍历原始的源策略数据, 生成能clone的路径
+
+        只对匹配链路前缀, 去重并且在role授权范围内的路径生成PathNodeBean
         """
         match_paths = []  # 能匹配实例视图前缀的资源路径
         match_path_hash_set = set()  # 用于去重
-        for path_list in source_policy.related_resource_types[0].iter_path_list():
-            for chain in chain_list.chains:
-                if not chain.is_match_path(path_list.nodes):
-                    continue
-
-                _hash = path_list.to_path_string()
-                if _hash in match_path_hash_set:
-                    break
-
-                match_path_hash_set.add(_hash)
-                match_paths.append(path_list.nodes)
-                break
-
-        if not match_paths:
-            return None
-
-        # 检查role scope, 剔除不在范围的部分
-        match_paths = scope_checker.remove_path_outside_scope(system_id, action.id, match_paths)
-        if not match_paths:
-            return None
-
-        return self._gen_policy_by_paths(action, match_paths)
+        for condition in source_policy["related_resource_types"][0]["condition"]:
+            for instance in condition["instances"]:
+                for path in instance["path"]:
+                    if not matcher.is_match(path):
+                        continue
+
+                    _hash = translate_path(path)
+                    if _hash in match_path_hash_set:
+                        continue
+                    match_path_hash_set.add(_hash)
+
+                    # 检查role scope, 剔除不在范围的部分
+                    if scope_path_prefixes is not None and not RoleAuthorizationScopeChecker.is_path_in_scope(
+                        _hash, scope_path_prefixes
+                    ):
+                        continue
+
+                    match_paths.append([PathNodeBean.parse_obj(node) for node in path])
+
+        return match_paths
 
     def _gen_policy_by_paths(self, action: Action, paths: List[List[PathNodeBean]]) -> PolicyBean:
         """
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+并发执行相关
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+from django.db import connections
+
+from backend.common.local import local
+
+# 默认的最大并发数, 避免对后端服务造成过大的压力
+DEFAULT_MAX_WORKERS = 10
+
+
+def _wrap_thread_func(func: Callable, request) -> Callable:
+    def wrapper(*args):
+        # 透传当前请求, 保证线程中调用第三方接口时的request_id等上下文一致
+        local.request = request
+        try:
+            return func(*args)
+        finally:
+            # 线程中创建的DB连接不在Django请求的生命周期中, 需要主动关闭
+            connections.close_all()
+            local.release()
+
+    return wrapper
+
+
+def concurrent_map(func: Callable[[Any], Any], iterable: Iterable, max_workers: int = DEFAULT_MAX_WORKERS) -> List:
+    """
+    使用线程池并发执行func, 结果与iterable的顺序一致
+
+    任意一个调用异常时, 会抛出该异常
+    """
+    items = list(iterable)
+    # 只有一个元素时不需要启动线程
+    if len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_wrap_thread_func(func, local.request), items))
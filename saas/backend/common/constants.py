@@ -25,3 +25,14 @@ DJANGO_LANG_TO_BK_LANG = {
     DjangoLanguageEnum.ZH_HANS.value: BKLanguageEnum.ZH_CN.value,  # type: ignore[attr-defined]
     DjangoLanguageEnum.EN.value: BKLanguageEnum.EN.value,  # type: ignore[attr-defined]
 }
+
+
+class TranslateModeEnum(ChoicesEnum):
+    """
+    响应数据的翻译方式
+    """
+
+    # 兼容模式: 渲染时递归遍历整个响应数据, 处理所有_en结尾的字段
+    WALK = "walk"
+    # 序列化时已按Serializer/Model声明的双语字段完成翻译, 渲染时不再处理
+    SCHEMA = "schema"
@@ -8,7 +8,6 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import logging
 import re
 import traceback
@@ -23,7 +22,7 @@ from django.utils import timezone
 from django_redis import get_redis_connection
 
 from backend.common.local import Singleton, get_local
-from backend.util.json import json_dumps
+from backend.util.json import json_dumps, json_loads
 
 __all__ = ["RedisStorage", "http_trace", "log_api_error_trace", "log_task_error_trace"]
 
@@ -118,7 +117,7 @@ class RedisStorage:
 
     def get(self, key):
         value = self.cli.get(self._gen_redis_key(key))
-        return json.loads(value) if value else value
+        return json_loads(value) if value else value
 
     def list_task_debug(self, day):
         task_key = f"iam:debug:task:{day}"
@@ -132,7 +131,7 @@ class RedisStorage:
                 pipe.get(self._gen_redis_key(str(raw_key, encoding="utf-8")))
             results = pipe.execute()
 
-        return [json.loads(one) for one in results if one]
+        return [json_loads(one) for one in results if one]
 
     def set_api_data(self, data: Dict[str, Any]):
         self._set(data)
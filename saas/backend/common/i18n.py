@@ -8,9 +8,89 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from .constants import DJANGO_LANG_TO_BK_LANG, BKLanguageEnum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from django.utils import translation
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+from pydantic.utils import lenient_issubclass
+
+from .constants import DJANGO_LANG_TO_BK_LANG, BKLanguageEnum, DjangoLanguageEnum
 
 
 def get_bk_language(django_language):
     """转换django language TO bk language"""
     return DJANGO_LANG_TO_BK_LANG.get(django_language, BKLanguageEnum.ZH_CN.value)
+
+
+def is_en_language() -> bool:
+    return translation.get_language() == DjangoLanguageEnum.EN.value  # type: ignore[attr-defined]
+
+
+def localize_fields(data: Dict, fields: Iterable[str], is_en: Optional[bool] = None) -> Dict:
+    """
+    对声明的双语字段按当前语言选择字段值, 并移除对应的_en字段
+
+    与BKAPIRenderer中的handle_tranlate结果一致: 英文环境下_en字段有值时替换原字段
+    """
+    if is_en is None:
+        is_en = is_en_language()
+
+    for field in fields:
+        value_en = data.pop(field + "_en", None)
+        if is_en and value_en:
+            data[field] = value_en
+    return data
+
+
+def _field_contains_model(field: ModelField) -> bool:
+    if lenient_issubclass(field.type_, BaseModel):
+        return True
+    return any(_field_contains_model(f) for f in field.sub_fields or [])
+
+
+# {model_cls: (双语字段, 可能包含子Model的字段)}
+_model_translation_plans: Dict[Type[BaseModel], Tuple[List[str], List[str]]] = {}
+
+
+def _get_translation_plan(model_cls: Type[BaseModel]) -> Tuple[List[str], List[str]]:
+    """
+    根据Model的定义生成翻译计划, 同时存在 x 与 x_en 字段的即为双语字段
+    """
+    plan = _model_translation_plans.get(model_cls)
+    if plan is None:
+        fields = model_cls.__fields__
+        translated = [name for name in fields if name + "_en" in fields]
+        nested = [name for name, field in fields.items() if _field_contains_model(field)]
+        plan = _model_translation_plans[model_cls] = (translated, nested)
+    return plan
+
+
+def _localize_value(value: Any, data: Any, is_en: bool):
+    if isinstance(value, BaseModel):
+        if not isinstance(data, dict):
+            return
+
+        translated, nested = _get_translation_plan(type(value))
+        localize_fields(data, translated, is_en)
+        for name in nested:
+            if name in data:
+                _localize_value(getattr(value, name), data[name], is_en)
+    elif isinstance(value, (list, tuple)) and isinstance(data, list):
+        for one_value, one_data in zip(value, data):
+            _localize_value(one_value, one_data, is_en)
+    elif isinstance(value, dict) and isinstance(data, dict):
+        for key, one_value in value.items():
+            if key in data:
+                _localize_value(one_value, data[key], is_en)
+
+
+def localized_dict(model: BaseModel, **kwargs) -> Dict:
+    """
+    生成已按当前语言翻译的dict, 只处理Model定义中的双语字段, 无需再遍历整个响应数据
+
+    配合 translate_mode = TranslateModeEnum.SCHEMA.value 的视图使用
+    """
+    data = model.dict(**kwargs)
+    _localize_value(model, data, is_en_language())
+    return data
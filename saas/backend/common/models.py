@@ -8,16 +8,98 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import zlib
+from typing import Any, Callable, Dict, List, Optional
 
 from django.db import models
 from django.utils import timezone
 
-from backend.util.json import json_dumps
+from backend.util.json import json_dumps, json_loads
 
 
-class BaseModel(models.Model):
+class LazyJSONField(property):
+    """
+    基于原始JSON文本字段的属性, 替代 property + setter 的写法
+
+    - 读取: 每个实例只解析一次, 原始文本变更(如refresh_from_db)后才会重新解析;
+      原始字段被 .only()/.defer() 延迟加载时, 首次访问才会从DB加载
+    - 写入: 立即序列化到原始字段, 保证 bulk_create/bulk_update/update 可直接使用原始字段
+    - 原地修改: 继承 LazyJSONModelMixin 的Model在save前检查已访问过的值, 有变更时才重新序列化
+
+    用法: resources = LazyJSONField("_resources")
+
+    Note: 继承property, 以便Django Model初始化与get_or_create等能识别为可赋值的属性
+    """
+
+    def __init__(self, raw_field: str, default: Optional[Callable[[], Any]] = None):
+        super().__init__()
+        self.raw_field = raw_field
+        # 原始文本为空时的返回值, 为None时按JSON解析空文本(即抛出异常)
+        self.default = default
+        self.name = ""
+        self.cache_attr = ""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.cache_attr = f"_lazy_json_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        raw = getattr(instance, self.raw_field)
+        cached = instance.__dict__.get(self.cache_attr)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        value = self.default() if not raw and self.default is not None else json_loads(raw)
+        instance.__dict__[self.cache_attr] = (raw, value)
+        return value
+
+    def __set__(self, instance, value):
+        raw = json_dumps(value)
+        setattr(instance, self.raw_field, raw)
+        instance.__dict__[self.cache_attr] = (raw, value)
+
+    def flush(self, instance):
+        """
+        将已访问过的值的原地修改序列化到原始字段
+        """
+        cached = instance.__dict__.get(self.cache_attr)
+        # 未访问过, 或原始字段已被直接修改
+        if cached is None or instance.__dict__.get(self.raw_field) is not cached[0]:
+            return
+
+        raw, value = cached
+        # 通过重新解析比较是否变更, 未变更时保持原始文本不变
+        origin = self.default() if not raw and self.default is not None else json_loads(raw)
+        if origin != value:
+            self.__set__(instance, value)
+
+
+_lazy_json_fields: Dict[type, List[LazyJSONField]] = {}
+
+
+class LazyJSONModelMixin:
+    """
+    save前将LazyJSONField的原地修改序列化到原始字段
+    """
+
+    def save(self, *args, **kwargs):
+        cls = type(self)
+        fields = _lazy_json_fields.get(cls)
+        if fields is None:
+            fields = _lazy_json_fields[cls] = [
+                v for klass in cls.__mro__ for v in vars(klass).values() if isinstance(v, LazyJSONField)
+            ]
+
+        for field in fields:
+            field.flush(self)
+
+        super().save(*args, **kwargs)  # type: ignore[misc]
+
+
+class BaseModel(LazyJSONModelMixin, models.Model):
     """
     基础model
     """
@@ -48,7 +130,7 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class TimestampedModel(models.Model):
+class TimestampedModel(LazyJSONModelMixin, models.Model):
     """Model with 'created' and 'updated' fields."""
 
     created_time = models.DateTimeField(auto_now_add=True)
@@ -80,7 +162,7 @@ class CompressedJSONField(models.BinaryField):
 
     def to_python(self, value):
         value = super(CompressedJSONField, self).to_python(value)
-        return json.loads(zlib.decompress(value).decode("utf-8"))
+        return json_loads(zlib.decompress(value).decode("utf-8"))
 
     def from_db_value(self, value, expression, connection, context):
         return self.to_python(value)
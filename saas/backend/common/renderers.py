@@ -11,33 +11,35 @@ specific language governing permissions and limitations under the License.
 from django.utils import translation
 from rest_framework.renderers import JSONRenderer
 
-from backend.common.constants import DjangoLanguageEnum
+from backend.common.constants import DjangoLanguageEnum, TranslateModeEnum
+from backend.util.json import JSONCodec, codec
 
 
-def handle_tranlate(data):
+def handle_tranlate(data, is_en=None):
     """处理翻译"""
-    # 判断是否Dict或List
-    if not isinstance(data, dict) and not isinstance(data, list):
-        return data
+    if is_en is None:
+        is_en = translation.get_language() == DjangoLanguageEnum.EN.value
 
-    # 对于List，则进行遍历，并递归查询每个数据
+    # 对于List，则原地遍历，并递归处理每个数据
     if isinstance(data, list):
-        return [handle_tranlate(i) for i in data]
-
-    # 对于Dict，判断是否有_en结尾的
-    ens = []
-    for k in list(data.keys()):
-        if isinstance(k, str) and k.endswith("_en"):
-            ens.append(k)
-    # 对于_en的，看是否需要替换
+        for i, one in enumerate(data):
+            if isinstance(one, (dict, list)):
+                data[i] = handle_tranlate(one, is_en)
+        return data
+
+    if not isinstance(data, dict):
+        return data
+
+    # 对于Dict，判断是否有_en结尾的，看是否需要替换
+    ens = [k for k in data if isinstance(k, str) and k.endswith("_en")]
     for k_en in ens:
-        k = k_en[0:-3]
         value_en = data.pop(k_en)
-        if translation.get_language() == DjangoLanguageEnum.EN.value and value_en:
-            data[k] = value_en
+        if is_en and value_en:
+            data[k_en[0:-3]] = value_en
     # 对于其他字段，进行递归
     for k, v in data.items():
-        data[k] = handle_tranlate(v)
+        if isinstance(v, (dict, list)):
+            data[k] = handle_tranlate(v, is_en)
 
     return data
 
@@ -61,7 +63,11 @@ class BKAPIRenderer(JSONRenderer):
         # 处理翻译
         view = renderer_context.get("view")
 
-        translate_exempt = view and getattr(view, "translate_exempt", False)
+        # translate_mode为schema的视图在序列化时已完成翻译, 见backend.common.i18n.localized_dict
+        translate_exempt = view and (
+            getattr(view, "translate_exempt", False)
+            or getattr(view, "translate_mode", TranslateModeEnum.WALK.value) == TranslateModeEnum.SCHEMA.value
+        )
         if not translate_exempt and isinstance(data, dict) and "data" in data:
             data["data"] = handle_tranlate(data["data"])
 
@@ -71,5 +77,10 @@ class BKAPIRenderer(JSONRenderer):
         if renderer_context and "message" in renderer_context:
             data["message"] = renderer_context["message"]
 
-        response = super().render(data, accepted_media_type, renderer_context)
-        return response
+        # 标准库或需要格式化缩进(如可浏览的API)时, 使用DRF默认的渲染
+        if codec.name == JSONCodec.name or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = codec.dumps_bytes(data, default=self.encoder_class().default)
+        # 与DRF一致, 转义JavaScript中不合法的行分隔符
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -10,6 +10,8 @@ specific language governing permissions and limitations under the License.
 """
 from rest_framework import serializers
 
+from backend.common.i18n import localize_fields
+
 
 class SystemQuerySLZ(serializers.Serializer):
     system_id = serializers.CharField(required=True)
@@ -22,3 +24,15 @@ class ActionQuerySLZ(SystemQuerySLZ):
 class BaseAction(serializers.Serializer):
     system_id = serializers.CharField(label="系统ID")
     id = serializers.CharField(label="操作id")
+
+
+class TranslatedFieldsSLZMixin:
+    """
+    序列化时按当前语言选择双语字段的值, 双语字段在 Meta.translated_fields 中声明, 如 ("name",)
+
+    输出中只保留原字段, 配合 translate_mode = TranslateModeEnum.SCHEMA.value 的视图使用
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)  # type: ignore[misc]
+        return localize_fields(data, getattr(self.Meta, "translated_fields", ()))  # type: ignore[attr-defined]
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import logging
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.http import StreamingHttpResponse
+from django.utils import translation
+
+from backend.common.error_codes import CodeException, error_codes
+from backend.common.local import local
+from backend.common.renderers import BKAPIRenderer
+from backend.util.json import json_dumps
+
+logger = logging.getLogger("app")
+
+# 流式返回时每批从DB查询的数量
+STREAM_BATCH_SIZE = 100
+
+
+class CursorPager:
+    """
+    游标分页迭代器, 按批次查询数据并逐条输出
+
+    fetch(cursor, size): 查询游标之后的size条数据, 返回 (数据列表, 下一批的游标), 没有更多数据时游标为None
+    迭代结束后, next_cursor为下一页的游标
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int], Tuple[List[Any], Optional[int]]],
+        cursor: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> None:
+        self.fetch = fetch
+        self.cursor = cursor
+        self.limit = limit
+        self.batch_size = batch_size
+
+        self.next_cursor: Optional[int] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        cursor, remain = self.cursor, self.limit
+        while True:
+            size = self.batch_size if remain is None else min(self.batch_size, remain)
+            items, next_cursor = self.fetch(cursor, size)
+            yield from items
+
+            if remain is not None:
+                remain -= size
+
+            if next_cursor is None or remain == 0:
+                self.next_cursor = next_cursor
+                return
+
+            cursor = next_cursor
+
+
+class JSONStreamingResponse(StreamingHttpResponse):
+    """
+    流式返回列表数据, 字段与BKAPIRenderer一致: {"data": {"results": []}, "result": true, "code": 0, "message": "OK"}
+
+    results中的数据逐条序列化输出, 不会在内存中生成完整的响应
+    get_extra: 所有数据输出后调用, 返回的字段追加到data中, 如下一页的游标
+
+    NOTE:
+    1. 数据在中间件处理完成后才开始迭代, 需要还原请求上下文与语言
+    2. 返回响应前会先获取第一条数据, 此时出错按正常的异常处理返回错误;
+       之后出错时响应头已经发送, 在响应结尾输出result为false的错误信息, 保证响应仍是完整的JSON,
+       因此result/code/message放在data之后输出
+    """
+
+    def __init__(self, results: Iterable[Any], get_extra: Optional[Callable[[], Dict[str, Any]]] = None, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+
+        results = iter(results)
+        first = list(islice(results, 1))
+
+        super().__init__(
+            self._iter_with_context(chain(first, results), get_extra, local.request, translation.get_language()),
+            **kwargs,
+        )
+
+    def _iter_with_context(self, results, get_extra, request, language) -> Iterator[str]:
+        local.request = request
+        try:
+            with translation.override(language):
+                yield from self._iter_content(results, get_extra)
+        finally:
+            local.release()
+
+    def _iter_content(
+        self, results: Iterable[Any], get_extra: Optional[Callable[[], Dict[str, Any]]]
+    ) -> Iterator[str]:
+        yield '{"data":{"results":['
+
+        try:
+            for i, one in enumerate(results):
+                yield ("," if i else "") + json_dumps(one)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception("streaming response error")
+            error = e if isinstance(e, CodeException) else error_codes.COMMON_ERROR
+            yield ']}},"result":false,"code":{},"message":{}}}'.format(error.code, json_dumps(str(error.message)))
+            return
+
+        yield "]"
+        for key, value in (get_extra() if get_extra else {}).items():
+            yield ",{}:{}".format(json_dumps(key), json_dumps(value))
+        yield '}},"result":true,"code":{},"message":{}}}'.format(
+            BKAPIRenderer.SUCCESS_CODE, json_dumps(BKAPIRenderer.SUCCESS_MESSAGE)
+        )
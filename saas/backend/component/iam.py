@@ -13,9 +13,11 @@ from typing import Dict, List, Tuple
 
 from django.conf import settings
 
+from backend.common.concurrency import concurrent_map
 from backend.common.error_codes import error_codes
 from backend.common.local import local
 from backend.publisher import shortcut as publisher_shortcut
+from backend.publisher.buffer import buffered_publish
 from backend.util.cache import region
 
 from .http import http_delete, http_get, http_post, http_put, logger
@@ -25,6 +27,9 @@ DEFAULT_SYSTEM_FIELDS = "id,name,name_en,description,description_en"
 DEFAULT_ACTION_FIELDS = "id,name,name_en,description,description_en"
 DEFAULT_RESOURCE_TYPE_FIELDS = "id,name,name_en"
 
+# 批量删除权限模板授权信息时, 并发调用后端的最大并发数
+DELETE_TEMPLATE_POLICIES_MAX_WORKERS = 5
+
 permission_logger = logging.getLogger("permission")
 
 
@@ -198,7 +203,9 @@ def delete_subjects_by_auto_paging(subjects: List[Dict[str, str]]) -> None:
         # 发布订阅-删除策略
         publisher_shortcut.publish_delete_policies_by_subject(paging_data)
 
-    return execute_all_data_by_paging(delete_paging_subjects, subjects, 3000)
+    # 所有分页的删除策略事件合并后一次发布
+    with buffered_publish():
+        return execute_all_data_by_paging(delete_paging_subjects, subjects, 3000)
 
 
 def list_subject(_type: str, limit: int = 10, offset: int = 0) -> Dict:
@@ -480,6 +487,43 @@ def delete_template_policies(system_id: str, subject_type: str, subject_id: str,
     return result
 
 
+def batch_delete_template_policies(template_subjects: List[Dict]) -> List[Dict]:
+    """
+    批量删除权限模板授权信息
+
+    template_subjects: [{"system_id", "template_id", "subject_type", "subject_id"}, ...]
+
+    后端没有批量删除的接口, 并发调用单个删除的接口, 单个失败不影响其他subject的删除,
+    删除成功的subject合并后一次发布删除策略事件, 返回删除失败的template_subjects
+    """
+    url_path = "/api/v1/web/perm-templates/policies"
+
+    def delete_template_policies(data) -> bool:
+        permission_logger.info("iam delete template policies url: %s, data: %s", url_path, data)
+        try:
+            _call_iam_api(http_delete, url_path, data=data)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("iam delete template policies fail, data: %s", data)
+            return False
+        return True
+
+    results = concurrent_map(
+        delete_template_policies, template_subjects, max_workers=DELETE_TEMPLATE_POLICIES_MAX_WORKERS
+    )
+
+    succeed_subjects = [one for one, ok in zip(template_subjects, results) if ok]
+    if succeed_subjects:
+        # 发布订阅-删除策略
+        publisher_shortcut.publish_delete_policies_by_template_subjects(
+            [
+                {"template_id": one["template_id"], "subject": {"type": one["subject_type"], "id": one["subject_id"]}}
+                for one in succeed_subjects
+            ]
+        )
+
+    return [one for one, ok in zip(template_subjects, results) if not ok]
+
+
 def create_subject_role(subjects: List[Dict[str, str]], role_type: str, system_id: str = "SUPER"):
     """
     创建后台的subject角色信息
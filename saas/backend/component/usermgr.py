@@ -18,6 +18,9 @@ from .util import list_all_data_by_paging
 # 用户管理，分页的默认数量为1000（实际最大可支持2000）
 USERMGR_DEFAULT_PAGE_SIZE = 1000
 
+# 按用户名批量查询时，单次请求的用户名数量，避免GET请求的URL过长
+USERMGR_USERNAME_LOOKUP_CHUNK_SIZE = 100
+
 
 def list_category() -> List[Dict]:
     """获取目录列表"""
@@ -33,6 +36,21 @@ def retrieve_user(username) -> Dict:
     return _call_esb_api(http_get, url_path, data=params)
 
 
+def list_user_by_usernames(usernames: List[str]) -> List[Dict]:
+    """根据用户名批量查询用户信息，不存在的用户不会返回"""
+    url_path = "/api/c/compapi/v2/usermanage/list_users/"
+    users = []
+    for i in range(0, len(usernames), USERMGR_USERNAME_LOOKUP_CHUNK_SIZE):
+        params = {
+            "fields": "id,username,display_name,staff_status,category_id",
+            "no_page": True,
+            "lookup_field": "username",
+            "exact_lookups": ",".join(usernames[i : i + USERMGR_USERNAME_LOOKUP_CHUNK_SIZE]),
+        }
+        users.extend(_call_esb_api(http_get, url_path, data=params))
+    return users
+
+
 def list_new_user(end_utc_time: datetime.datetime, minute_delta: int = 0) -> List[Dict]:
     """查询新增用户，条件是时间"""
     # 生成要查询的条件
@@ -14,5 +14,7 @@ from . import views
 
 urlpatterns = [
     url(r"^healthz$", views.healthz, name="healthz"),
+    url(r"^readyz$", views.healthz, name="readyz"),
+    url(r"^livez$", views.livez, name="livez"),
     url(r"^ping$", views.pong, name="ping"),
 ]
@@ -9,31 +9,124 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 import copy
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from logging import getLogger
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseServerError
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
 from rest_framework import serializers
 
 from backend.component import usermgr
 
 logger = getLogger("app")
 
+# 依赖检查项
+HEALTHZ_CHECK_NAMES = ["mysql", "redis", "celery", "iam", "usermgr"]
+# 单个依赖检查的超时时间(秒)
+HEALTHZ_CHECK_TIMEOUT = 5
+# 每个依赖检查结果的缓存时间(秒), 避免频繁的探针请求都访问依赖服务
+HEALTHZ_CACHE_SECONDS = 5
+
 
 def pong(request):
     return HttpResponse("pong")
 
 
-def healthz(request):
-    checker = HealthChecker()
-    for name in ["mysql", "redis", "celery", "iam", "usermgr"]:
-        ok, message = getattr(checker, name)()
-        if not ok:
-            return HttpResponseServerError(message)
+def livez(request):
+    """
+    存活探针, 只检查进程本身是否可以处理请求, 不访问任何依赖服务
+    """
     return HttpResponse("ok")
 
 
+def healthz(request):
+    """
+    就绪探针, 并发检查所有依赖服务并返回每个依赖的检查结果与耗时
+    """
+    report = check_all(health_check_probes)
+    return JsonResponse(report, status=200 if report["ok"] else 500)
+
+
+# 所有依赖检查共用的线程池, 每个依赖同时最多只有一个检查在执行, 因此线程数不会超过依赖数
+_executor = ThreadPoolExecutor(max_workers=len(HEALTHZ_CHECK_NAMES), thread_name_prefix="healthz")
+
+
+class HealthCheckProbe:
+    """
+    单个依赖的检查
+
+    检查结果在进程内缓存ttl秒, 同一依赖同时只有一个检查在执行, 其他请求复用其结果;
+    超时未结束的检查不会被重复提交, 避免依赖服务卡住时不断占用新的线程
+    """
+
+    def __init__(self, name: str, ttl: int):
+        self.name = name
+        self.ttl = ttl
+        self._future: Optional[Future] = None
+        self._finished_at: float = 0
+        self._lock = threading.Lock()
+
+    def submit(self) -> Future:
+        with self._lock:
+            future = self._future
+            if future is None or (future.done() and time.time() - self._finished_at >= self.ttl):
+                future = self._future = _executor.submit(self._run)
+            return future
+
+    def _run(self) -> Tuple[bool, str, float]:
+        start = time.perf_counter()
+        try:
+            ok, message = getattr(HealthChecker(), self.name)()
+        finally:
+            # 线程中创建的DB连接不在Django请求的生命周期中, 需要主动关闭
+            connections.close_all()
+            self._finished_at = time.time()
+        return ok, message, round((time.perf_counter() - start) * 1000, 2)
+
+
+def check_all(probes: Dict[str, HealthCheckProbe]) -> Dict[str, Any]:
+    """
+    并发执行所有依赖检查, 超时的检查视为失败
+
+    result:
+
+    {
+        "ok": false,
+        "checks": {
+            "mysql": {"ok": true, "message": "ok", "latency_ms": 1.2},
+            "iam": {"ok": false, "message": "timeout after 5s", "latency_ms": 5000}
+        }
+    }
+    """
+    futures = {name: probe.submit() for name, probe in probes.items()}
+    # 不等待超时的检查结束, 避免阻塞探针请求
+    wait(futures.values(), timeout=HEALTHZ_CHECK_TIMEOUT)
+
+    checks = {}
+    for name, future in futures.items():
+        if not future.done():
+            checks[name] = {
+                "ok": False,
+                "message": f"timeout after {HEALTHZ_CHECK_TIMEOUT}s",
+                "latency_ms": HEALTHZ_CHECK_TIMEOUT * 1000,
+            }
+            continue
+
+        try:
+            ok, message, latency_ms = future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception(e)
+            ok, message, latency_ms = False, f"{name} check fail, error: {str(e)}", 0
+        checks[name] = {"ok": ok, "message": message, "latency_ms": latency_ms}
+
+    return {"ok": all(c["ok"] for c in checks.values()), "checks": checks}
+
+
 class HealthChecker:
     """
     健康检查
@@ -115,7 +208,7 @@ class HealthChecker:
     def iam(self):
         try:
             url = f"{settings.BK_IAM_HOST}/healthz"
-            resp = requests.get(url)
+            resp = requests.get(url, timeout=HEALTHZ_CHECK_TIMEOUT)
             if resp.status_code != requests.codes.ok:
                 return False, f"iam backend response status[{resp.status_code}] not OK"
         except Exception as e:  # pylint: disable=broad-except
@@ -153,3 +246,6 @@ class HealthChecker:
             logger.exception(e)
             return False, f"usermgr request fail, error: {str(e)}"
         return True, "ok"
+
+
+health_check_probes = {name: HealthCheckProbe(name, HEALTHZ_CACHE_SECONDS) for name in HEALTHZ_CHECK_NAMES}
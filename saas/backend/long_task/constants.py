@@ -26,3 +26,4 @@ class TaskStatus(ChoicesEnum):
 class TaskType(LowerStrEnum):
     TEMPLATE_UPDATE = auto()
     GROUP_AUTHORIZATION = auto()
+    TEMPLATE_MEMBER_REVOKE = auto()
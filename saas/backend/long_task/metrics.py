@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import logging
+
+from prometheus_client.core import GaugeMetricFamily
+
+from .constants import TaskStatus
+from .models import TaskDetail
+from .progress import calculate_progress
+
+logger = logging.getLogger("app")
+
+
+class LongTaskCollector:
+    """
+    运行中长时任务的进度指标
+
+    子任务在celery worker中执行, 指标在采集时根据DB中的子任务状态实时计算, 避免依赖worker进程的指标暴露
+    """
+
+    def _new_metrics(self):
+        labels = ["task_id", "type"]
+        return {
+            "total": GaugeMetricFamily("bkiam_long_task_items_total", "Number of sub task items", labels=labels),
+            "finished": GaugeMetricFamily(
+                "bkiam_long_task_items_finished", "Number of finished sub task items", labels=labels
+            ),
+            "failure": GaugeMetricFamily(
+                "bkiam_long_task_items_failure", "Number of failed sub task items", labels=labels
+            ),
+            "retry_count": GaugeMetricFamily(
+                "bkiam_long_task_items_retry", "Number of sub task item retries", labels=labels
+            ),
+            "items_per_second": GaugeMetricFamily(
+                "bkiam_long_task_items_per_second", "Sub task items processed per second", labels=labels
+            ),
+            "latency_p50": GaugeMetricFamily(
+                "bkiam_long_task_item_latency_p50_seconds", "P50 latency of sub task items", labels=labels
+            ),
+            "latency_p95": GaugeMetricFamily(
+                "bkiam_long_task_item_latency_p95_seconds", "P95 latency of sub task items", labels=labels
+            ),
+            "eta": GaugeMetricFamily("bkiam_long_task_eta_seconds", "Estimated remaining seconds", labels=labels),
+        }
+
+    def describe(self):
+        # 提供describe, 避免注册时触发collect查询DB
+        return list(self._new_metrics().values())
+
+    def collect(self):
+        metrics = self._new_metrics()
+
+        try:
+            tasks = list(TaskDetail.objects.filter(status=TaskStatus.RUNNING.value))  # type: ignore[attr-defined]
+            for task in tasks:
+                progress = calculate_progress(task)
+                label_values = [str(task.id), task.type]
+                for field, metric in metrics.items():
+                    value = getattr(progress, field)
+                    if value is not None:
+                        metric.add_metric(label_values, value)
+        except Exception:  # pylint: disable=broad-except
+            # 指标采集失败不能影响其他指标的暴露
+            logger.exception("collect long task metrics fail")
+
+        yield from metrics.values()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+# Generated by Django 2.2.14 on 2026-10-19 10:21
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('long_task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subtaskstate',
+            name='duration',
+            field=models.FloatField(default=0, verbose_name='执行耗时(秒)'),
+        ),
+        migrations.AddField(
+            model_name='subtaskstate',
+            name='retry_count',
+            field=models.IntegerField(default=0, verbose_name='重试次数'),
+        ),
+        migrations.AddField(
+            model_name='subtaskstate',
+            name='created_time',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
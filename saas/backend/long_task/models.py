@@ -8,7 +8,6 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 from typing import Any, List
 
 from django.core.cache import cache
@@ -16,6 +15,7 @@ from django.db import models
 
 from backend.common.error_codes import error_codes
 from backend.common.models import BaseModel
+from backend.util.json import json_dumps, json_loads
 
 from .constants import TaskStatus
 
@@ -45,15 +45,15 @@ class TaskDetail(BaseModel):
 
     @property
     def args(self):
-        return json.loads(self._args) if self._args else []
+        return json_loads(self._args) if self._args else []
 
     @property
     def params(self):
-        return json.loads(self._params) if self._params else []
+        return json_loads(self._params) if self._params else []
 
     @property
     def results(self):
-        results = json.loads(self._results) if self._results else []
+        results = json_loads(self._results) if self._results else []
 
         # 运行中的任务, 实时从redis中取结果
         if self.status == TaskStatus.RUNNING.value:
@@ -81,7 +81,7 @@ class TaskDetail(BaseModel):
 
     @classmethod
     def _create(cls, type_: str, args: List[Any], sign: str = ""):
-        task = cls(type=type_, _args=json.dumps(args), unique_sign=cls._gen_unique_sign(type_, sign) if sign else sign)
+        task = cls(type=type_, _args=json_dumps(args), unique_sign=cls._gen_unique_sign(type_, sign) if sign else sign)
 
         task.save(force_insert=True)
 
@@ -116,6 +116,9 @@ class SubTaskState(models.Model):
         "任务状态", choices=TaskStatus.get_choices(), default=TaskStatus.RUNNING.value  # type: ignore[attr-defined]
     )
     exception = models.TextField("任务异常", default="")
+    duration = models.FloatField("执行耗时(秒)", default=0)
+    retry_count = models.IntegerField("重试次数", default=0)
+    created_time = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "子任务状态"
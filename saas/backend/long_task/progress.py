@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import math
+from typing import Dict, List, Optional
+
+from django.utils import timezone
+from pydantic import BaseModel
+
+from .constants import TaskStatus
+from .models import TaskDetail
+
+
+class TaskProgress(BaseModel):
+    """
+    长时任务进度与吞吐
+    """
+
+    id: int
+    type: str
+    status: int
+    total: int = 0  # 子任务总数
+    finished: int = 0  # 已完成(成功+失败)的子任务数
+    success: int = 0
+    failure: int = 0
+    retry_count: int = 0  # 所有子任务的重试次数之和
+
+    elapsed: float = 0  # 已执行时长(秒)
+    items_per_second: float = 0
+    latency_p50: float = 0  # 单个子任务耗时(秒)
+    latency_p95: float = 0
+    eta: Optional[float] = None  # 预计剩余时间(秒), 无法估计时为None
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """
+    最近秩法计算百分位数, sorted_values必须已升序排列
+    """
+    if not sorted_values:
+        return 0
+
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def calculate_progress(task: TaskDetail) -> TaskProgress:
+    """
+    根据任务的子任务结果计算进度、吞吐、耗时分位数与ETA
+    """
+    total = len(task.params)
+    results: List[Dict] = task.results
+
+    progress = TaskProgress(id=task.id, type=task.type, status=task.status, total=total)
+
+    durations = []
+    for r in results:
+        if r["status"] == TaskStatus.SUCCESS.value:  # type: ignore[attr-defined]
+            progress.success += 1
+        elif r["status"] == TaskStatus.FAILURE.value:  # type: ignore[attr-defined]
+            progress.failure += 1
+        else:
+            continue
+
+        # 兼容历史任务的结果中没有耗时与重试次数
+        durations.append(r.get("duration", 0))
+        progress.retry_count += r.get("retry_count", 0)
+
+    progress.finished = progress.success + progress.failure
+
+    durations.sort()
+    progress.latency_p50 = percentile(durations, 50)
+    progress.latency_p95 = percentile(durations, 95)
+
+    if task.status == TaskStatus.RUNNING.value:  # type: ignore[attr-defined]
+        # 运行中的任务使用墙上时间, 包含了子任务之间celery调度的耗时
+        from .task import ResultStore
+
+        started_time = ResultStore(task.id).started_time()
+        progress.elapsed = (timezone.now() - started_time).total_seconds() if started_time else 0
+    else:
+        # 已结束的任务子任务状态已清理, 只能使用子任务耗时之和
+        progress.elapsed = sum(durations)
+
+    if progress.elapsed > 0 and progress.finished:
+        progress.items_per_second = progress.finished / progress.elapsed
+
+    if task.status == TaskStatus.RUNNING.value:  # type: ignore[attr-defined]
+        if progress.items_per_second:
+            progress.eta = (total - progress.finished) / progress.items_per_second
+    elif task.status != TaskStatus.PENDING.value:  # type: ignore[attr-defined]
+        progress.eta = 0
+
+    return progress
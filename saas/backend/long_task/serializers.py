@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from rest_framework import serializers
+
+
+class TaskProgressSLZ(serializers.Serializer):
+    id = serializers.IntegerField(label="任务ID")
+    type = serializers.CharField(label="任务类型")
+    status = serializers.IntegerField(label="任务状态")
+    total = serializers.IntegerField(label="子任务总数")
+    finished = serializers.IntegerField(label="已完成子任务数")
+    success = serializers.IntegerField(label="成功子任务数")
+    failure = serializers.IntegerField(label="失败子任务数")
+    retry_count = serializers.IntegerField(label="重试次数")
+    elapsed = serializers.FloatField(label="已执行时长(秒)")
+    items_per_second = serializers.FloatField(label="每秒处理子任务数")
+    latency_p50 = serializers.FloatField(label="子任务耗时P50(秒)")
+    latency_p95 = serializers.FloatField(label="子任务耗时P95(秒)")
+    eta = serializers.FloatField(label="预计剩余时间(秒)", allow_null=True)
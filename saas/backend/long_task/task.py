@@ -8,17 +8,19 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import logging
 import random
 import sys
 import time
 import traceback
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, List, Type
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
 
 from celery import Task
-from django.db.models import Max
+from django.db.models import Max, Min
+
+from backend.util.json import json_dumps
 
 from .constants import TaskStatus
 from .models import SubTaskState, TaskDetail
@@ -76,9 +78,11 @@ class Retry:
     def __init__(self, func, tries=1):
         self.func = func
         self._tries = tries
+        self.retry_count = 0  # 最近一次调用的重试次数
 
     def __call__(self, item: Any):
         _tries = self._tries
+        self.retry_count = 0
 
         while _tries:
             try:
@@ -88,6 +92,7 @@ class Retry:
                 if not _tries:
                     raise
 
+                self.retry_count += 1
                 time.sleep(random.randint(0, 100) / 1000)  # 随机sleep 100毫秒
 
 
@@ -102,13 +107,24 @@ class ResultStore:
     def create(self, celery_id: str, index: int):
         SubTaskState.objects.create(task_id=self._task_id, celery_id=celery_id, index=index)
 
-    def update(self, index: int, status: int, exception=""):
-        SubTaskState.objects.filter(task_id=self._task_id, index=index).update(status=status, exception=exception)
+    def update(self, index: int, status: int, exception="", duration: float = 0, retry_count: int = 0):
+        SubTaskState.objects.filter(task_id=self._task_id, index=index).update(
+            status=status, exception=exception, duration=duration, retry_count=retry_count
+        )
 
     def list(self) -> List[Dict]:
-        q = SubTaskState.objects.filter(task_id=self._task_id).values("index", "status", "exception")
+        q = SubTaskState.objects.filter(task_id=self._task_id).values(
+            "index", "status", "exception", "duration", "retry_count"
+        )
         return list(q)
 
+    def started_time(self) -> Optional[datetime]:
+        """
+        第一个子任务的开始时间, 即任务实际开始执行的时间
+        """
+        q = SubTaskState.objects.filter(task_id=self._task_id).aggregate(Min("created_time"))
+        return q["created_time__min"]
+
     def clear(self):
         SubTaskState.objects.filter(task_id=self._task_id).delete()
 
@@ -141,10 +157,16 @@ class SubTask(Task):
             celery_id = self.request.id
 
             store.create(celery_id, index)
+            start = time.perf_counter()
             try:
                 retry_run(param)
 
-                store.update(index, TaskStatus.SUCCESS.value)  # type: ignore[attr-defined]
+                store.update(
+                    index,
+                    TaskStatus.SUCCESS.value,  # type: ignore[attr-defined]
+                    duration=time.perf_counter() - start,
+                    retry_count=retry_run.retry_count,
+                )
 
                 logger.debug("long task {} sub task item: {} execute success".format(id, param))
             except Exception:  # pylint: disable=broad-except
@@ -153,6 +175,8 @@ class SubTask(Task):
                     index,
                     TaskStatus.FAILURE.value,  # type: ignore[attr-defined]
                     traceback.format_exc(),
+                    duration=time.perf_counter() - start,
+                    retry_count=retry_run.retry_count,
                 )
 
                 logger.warning(
@@ -180,7 +204,7 @@ class SubTask(Task):
 
     def _update_status(self, task: TaskDetail, status: int):
         results = task.results
-        TaskDetail.objects.filter(id=task.id).update(status=status, _results=json.dumps(results))
+        TaskDetail.objects.filter(id=task.id).update(status=status, _results=json_dumps(results))
         ResultStore(task.id).clear()
 
 
@@ -205,7 +229,7 @@ class TaskFactory(Task):
         TaskDetail.objects.filter(pk=id).update(
             celery_id=celery_id,
             status=TaskStatus.RUNNING.value,  # type: ignore[attr-defined]
-            _params=json.dumps(params),
+            _params=json_dumps(params),
         )
 
         SubTask().delay(id)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from backend.api.authentication import BasicAppCodeAuthentication
+from backend.common.swagger import ResponseSwaggerAutoSchema
+
+from .constants import TaskStatus
+from .models import TaskDetail
+from .progress import calculate_progress
+from .serializers import TaskProgressSLZ
+
+
+class TaskProgressViewSet(GenericViewSet):
+
+    authentication_classes = [BasicAppCodeAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    paginator = None  # 去掉swagger中的limit offset参数
+
+    queryset = TaskDetail.objects.all()
+    lookup_field = "id"
+
+    @swagger_auto_schema(
+        operation_description="运行中的长时任务进度列表",
+        auto_schema=ResponseSwaggerAutoSchema,
+        responses={status.HTTP_200_OK: TaskProgressSLZ(label="任务进度", many=True)},
+        tags=["long_task"],
+    )
+    def list(self, request, *args, **kwargs):
+        tasks = TaskDetail.objects.filter(status=TaskStatus.RUNNING.value)  # type: ignore[attr-defined]
+        data = [calculate_progress(task).dict() for task in tasks]
+        return Response(data)
+
+    @swagger_auto_schema(
+        operation_description="长时任务进度详情",
+        auto_schema=ResponseSwaggerAutoSchema,
+        responses={status.HTTP_200_OK: TaskProgressSLZ(label="任务进度")},
+        tags=["long_task"],
+    )
+    def retrieve(self, request, *args, **kwargs):
+        task = self.get_object()
+        return Response(calculate_progress(task).dict())
@@ -8,19 +8,28 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from typing import List
+import hashlib
+import logging
+import time
+from typing import Dict, List
 
+from django.core.cache import cache
 from django.utils.translation import gettext as _
+from pydantic import parse_obj_as
 
+from backend.common.concurrency import concurrent_map
 from backend.common.error_codes import error_codes
 from backend.component import itsm
 from backend.service.constants import IAM_SUPPORT_PROCESSOR_TYPES, ApplicationTypeEnum, ProcessorSourceEnum
 from backend.service.models import ApprovalProcess, ApprovalProcessNode, ApprovalProcessWithNode
 from backend.util.cache import region
 from backend.util.enum import ChoicesEnum
+from backend.util.json import json_dumps
 
 from .base import ApprovalProcessProvider
 
+logger = logging.getLogger("app")
+
 
 class DefaultProcessNameEnum(ChoicesEnum):
     """默认流程名称枚举"""
@@ -35,6 +44,18 @@ APPLICATION_TYPE_DEFAULT_PROCESS_DICT = {
 }
 
 
+# 带节点的流程列表的缓存
+PROCESS_WITH_NODES_CACHE_KEY = "bk_iam:itsm:process_with_nodes"
+PROCESS_WITH_NODES_REFRESH_LOCK_KEY = "bk_iam:itsm:process_with_nodes:refresh_lock"
+PROCESS_WITH_NODES_CACHE_TIMEOUT = 24 * 60 * 60
+# 带节点的流程列表超过该时间(秒)后在后台刷新
+PROCESS_WITH_NODES_REFRESH_INTERVAL = 60
+# 后台刷新锁的兜底过期时间(秒)，正常情况下刷新任务结束后主动释放
+PROCESS_WITH_NODES_REFRESH_LOCK_TIMEOUT = 10 * 60
+# 流程节点的缓存时间(秒)，缓存key包含流程版本，这里只是兜底的过期时间
+PROCESS_NODES_CACHE_TIMEOUT = 60 * 60
+
+
 class ITSMApprovalProcessProvider(ApprovalProcessProvider):
     """ITSM提供审批流程"""
 
@@ -44,23 +65,75 @@ class ITSMApprovalProcessProvider(ApprovalProcessProvider):
         processes = itsm.list_process()
         return [ApprovalProcess(**p) for p in processes]
 
-    @region.cache_on_arguments(expiration_time=60)  # 缓存1分钟
     def list_with_nodes(self, application_type: ApplicationTypeEnum) -> List[ApprovalProcessWithNode]:
         """审批流程列表，查询指定申请类型的流程列表，并附带流程节点
         1. 对于ITSM, 不支持通过条件过滤出指定申请类型的，只能手动匹配
         2. 对于ITSM，不支持查询流程时附带节点名称，所有都需要单独查询
+        3. 带节点的流程列表由后台任务刷新，请求中不会同步查询ITSM:
+           超过刷新间隔后返回旧数据并触发后台刷新；缓存完全不存在时(如首次部署)触发后台刷新并先返回空列表
         """
-        processes = itsm.list_process()
+        data = cache.get(PROCESS_WITH_NODES_CACHE_KEY)
+        if data is None:
+            self._trigger_background_refresh()
+            return []
 
-        process_list = []
-        # 遍历，并查询流程节点
-        for p in processes:
-            nodes = self.get_process_nodes(p["id"])
-            process_list.append(ApprovalProcessWithNode(id=p["id"], name=p["name"], nodes=nodes))
+        if time.time() - data["refreshed_at"] >= PROCESS_WITH_NODES_REFRESH_INTERVAL:
+            self._trigger_background_refresh()
+
+        process_list = parse_obj_as(List[ApprovalProcessWithNode], data["processes"])
 
         # 过滤出满足对应申请类型的流程
         return [p for p in process_list if p.is_match_application_type(application_type)]
 
+    def _trigger_background_refresh(self):
+        """
+        触发后台刷新带节点的流程列表，通过cache.add保证同一时间只有一个刷新任务，任务结束后释放锁
+        """
+        if not cache.add(PROCESS_WITH_NODES_REFRESH_LOCK_KEY, 1, timeout=PROCESS_WITH_NODES_REFRESH_LOCK_TIMEOUT):
+            return
+
+        from backend.apps.approval.tasks import refresh_approval_process_with_nodes
+
+        try:
+            refresh_approval_process_with_nodes.delay()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("trigger refresh_approval_process_with_nodes error")
+            cache.delete(PROCESS_WITH_NODES_REFRESH_LOCK_KEY)
+
+    def refresh_list_with_nodes(self) -> List[Dict]:
+        """
+        查询所有流程并并发查询流程节点，刷新带节点的流程列表缓存
+        """
+        processes = itsm.list_process()
+        nodes_list = concurrent_map(self._get_process_nodes_by_version, processes)
+
+        process_list = [
+            ApprovalProcessWithNode(id=p["id"], name=p["name"], nodes=nodes).dict()
+            for p, nodes in zip(processes, nodes_list)
+        ]
+        cache.set(
+            PROCESS_WITH_NODES_CACHE_KEY,
+            {"refreshed_at": time.time(), "processes": process_list},
+            timeout=PROCESS_WITH_NODES_CACHE_TIMEOUT,
+        )
+        return process_list
+
+    def _get_process_nodes_by_version(self, process: Dict) -> List[ApprovalProcessNode]:
+        """
+        按流程版本缓存流程节点
+        ITSM流程列表中未提供明确的版本号，使用流程数据的摘要作为版本，流程变更后缓存自然失效
+        """
+        version = hashlib.md5(json_dumps(process, sort_keys=True).encode()).hexdigest()
+        cache_key = f"bk_iam:itsm:process_nodes:{process['id']}:{version}"
+
+        nodes = cache.get(cache_key)
+        if nodes is not None:
+            return parse_obj_as(List[ApprovalProcessNode], nodes)
+
+        process_nodes = self.get_process_nodes(process["id"])
+        cache.set(cache_key, [n.dict() for n in process_nodes], timeout=PROCESS_NODES_CACHE_TIMEOUT)
+        return process_nodes
+
     def get_default_process(self, application_type: ApplicationTypeEnum) -> ApprovalProcess:
         """获取某种申请类型的默认流程
         application_type只需要实现两种，（1）加入用户组（2）申请自定义权限
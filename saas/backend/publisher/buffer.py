@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from .constants import (
+    DELETE_POLICY_COMPACT_MESSAGE_MAX_ITEMS,
+    DELETE_POLICY_MESSAGE_MAX_ITEMS,
+    DeletePolicyTypeEnum,
+    MessageFormatEnum,
+)
+
+_local = threading.local()
+
+
+class DeletePolicyPublishBuffer:
+    """
+    删除策略事件缓冲区, 按类型合并数据后生成尽量少的消息
+    """
+
+    def __init__(self):
+        # {type: {data_key: [item, ...]}}
+        self._events: Dict[str, Dict[str, List]] = defaultdict(lambda: defaultdict(list))
+
+    def add(self, _type: DeletePolicyTypeEnum, data: Dict):
+        for key, items in data.items():
+            self._events[_type][key].extend(items)
+
+    def pop_messages(self) -> List[Dict]:
+        """
+        生成合并后的消息并清空缓冲区
+        """
+        timestamp = int(time.time())
+        max_items = (
+            DELETE_POLICY_COMPACT_MESSAGE_MAX_ITEMS
+            if getattr(settings, "PUB_SUB_MESSAGE_FORMAT", "") == MessageFormatEnum.COMPACT.value
+            else DELETE_POLICY_MESSAGE_MAX_ITEMS
+        )
+        messages = []
+        for _type, data in self._events.items():
+            for key, items in data.items():
+                for i in range(0, len(items), max_items):
+                    messages.append(
+                        {
+                            "timestamp": timestamp,
+                            "type": _type,
+                            "data": {key: items[i : i + max_items]},
+                        }
+                    )
+
+        self._events.clear()
+        return messages
+
+
+def get_current_buffer() -> Optional[DeletePolicyPublishBuffer]:
+    return getattr(_local, "buffer", None)
+
+
+@contextmanager
+def buffered_publish():
+    """
+    上下文中发布的删除策略事件会被缓冲, 退出上下文时合并为一个celery任务发布
+
+    适用于批量清理等会产生大量删除策略事件的场景, 嵌套使用时由最外层统一发布
+    """
+    from .tasks import send_delete_policies_messages
+
+    if get_current_buffer() is not None:
+        yield
+        return
+
+    buffer = DeletePolicyPublishBuffer()
+    _local.buffer = buffer
+    try:
+        yield
+    finally:
+        _local.buffer = None
+        send_delete_policies_messages(buffer.pop_messages())
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+删除策略订阅消息的编解码
+
+v1: JSON文本, 如 {"timestamp": 1, "type": "policy", "data": {"policy_ids": [1, 2]}}
+v2: 紧凑的二进制格式, 以版本号字节开头
+
+    | version(1B)=0x02 | type(1B) | timestamp(varint) | body |
+
+    - type=policy: body为 | count(varint) | delta(varint) ... |, policy_id升序排列后按与前一个的差值编码
+    - 其他类型: body为zlib压缩的data的JSON文本
+"""
+import zlib
+from typing import Dict, Iterable, List, Tuple, Union
+
+from backend.util.json import json_dumps, json_loads
+
+from .constants import DeletePolicyTypeEnum
+
+MESSAGE_VERSION_V2 = 2
+
+_TYPE_CODES = {
+    DeletePolicyTypeEnum.POLICY.value: 1,
+    DeletePolicyTypeEnum.SUBJECT.value: 2,
+    DeletePolicyTypeEnum.SUBJECT_TEMPLATE.value: 3,
+}
+_CODE_TYPES = {code: _type for _type, code in _TYPE_CODES.items()}
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    无符号整数的varint编码, 每个字节低7位存储数据, 最高位表示是否还有后续字节
+    """
+    if value < 0:
+        raise ValueError(f"varint value must not be negative: {value}")
+
+    buf = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            buf.append(byte | 0x80)
+        else:
+            buf.append(byte)
+            return bytes(buf)
+
+
+def decode_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """
+    从offset开始解码varint, 返回值与下一个offset
+    """
+    value, shift = 0, 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_policy_ids(policy_ids: Iterable[int]) -> bytes:
+    """
+    去重排序后使用差值varint编码
+    """
+    sorted_ids = sorted(set(policy_ids))
+    buf = bytearray(encode_varint(len(sorted_ids)))
+    prev = 0
+    for _id in sorted_ids:
+        buf += encode_varint(_id - prev)
+        prev = _id
+    return bytes(buf)
+
+
+def decode_policy_ids(data: bytes, offset: int) -> Tuple[List[int], int]:
+    count, offset = decode_varint(data, offset)
+    policy_ids, prev = [], 0
+    for _ in range(count):
+        delta, offset = decode_varint(data, offset)
+        prev += delta
+        policy_ids.append(prev)
+    return policy_ids, offset
+
+
+def encode_message(message: Dict) -> bytes:
+    """
+    将消息编码为v2格式
+    """
+    _type = message["type"]
+    buf = bytearray([MESSAGE_VERSION_V2, _TYPE_CODES[_type]])
+    buf += encode_varint(message["timestamp"])
+
+    if _type == DeletePolicyTypeEnum.POLICY.value:
+        buf += encode_policy_ids(message["data"]["policy_ids"])
+    else:
+        buf += zlib.compress(json_dumps(message["data"]).encode())
+
+    return bytes(buf)
+
+
+def decode_message(raw: Union[bytes, str]) -> Dict:
+    """
+    解码队列中的消息, 兼容v1的JSON与v2的紧凑格式, 供订阅方使用
+    """
+    # v1: JSON文本, 注意v2消息需要使用decode_responses=False的连接读取
+    if isinstance(raw, str) or raw[:1] == b"{":
+        return json_loads(raw)
+
+    if raw[0] != MESSAGE_VERSION_V2:
+        raise ValueError(f"unsupported delete policy message version: {raw[0]}")
+
+    _type = _CODE_TYPES[raw[1]]
+    timestamp, offset = decode_varint(raw, 2)
+
+    if _type == DeletePolicyTypeEnum.POLICY.value:
+        policy_ids, _ = decode_policy_ids(raw, offset)
+        data = {"policy_ids": policy_ids}
+    else:
+        data = json_loads(zlib.decompress(raw[offset:]))
+
+    return {"timestamp": timestamp, "type": _type, "data": data}
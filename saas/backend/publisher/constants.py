@@ -12,6 +12,15 @@ from aenum import LowerStrEnum, auto
 
 DELETE_POLICY_PUB_SUB_KEY = "bk_iam:deleted_policy"
 DELETE_POLICY_REDIS_LIST_MAX_LENGTH = 10000
+# 合并后单条消息中最多包含的数据条数, 避免单条消息过大
+DELETE_POLICY_MESSAGE_MAX_ITEMS = 1000
+# 紧凑格式下单条消息可携带更多的数据
+DELETE_POLICY_COMPACT_MESSAGE_MAX_ITEMS = 10000
+
+
+class MessageFormatEnum(LowerStrEnum):
+    JSON = auto()
+    COMPACT = auto()
 
 
 # 枚举策略删除时的方式：用策略ID删除、直接删除Subject导致策略删除
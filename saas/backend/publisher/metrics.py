@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import logging
+
+from prometheus_client.core import CounterMetricFamily
+from redis.exceptions import RedisError
+
+from backend.util.cache import redis_region
+
+logger = logging.getLogger("app")
+
+# 删除策略订阅消息数量的计数, hash: {status: count}
+DELETE_POLICY_MESSAGES_METRICS_KEY = "bk_iam:publisher:delete_policy_messages_total"
+
+
+def incr_delete_policy_messages(status: str, count: int):
+    """
+    累加删除策略订阅消息的数量, status: published/trimmed/dropped
+    trimmed: 队列超过最大长度被裁剪掉的旧消息; dropped: 推送celery或Redis失败而丢弃的消息
+
+    消息主要在celery worker中推送, 而worker进程不暴露/metrics, 所以计数记录在共享的Redis中, 由web进程采集时读取
+    """
+    try:
+        redis_region.backend.client.hincrby(DELETE_POLICY_MESSAGES_METRICS_KEY, status, count)
+    except RedisError:
+        # 指标记录失败不能影响消息推送
+        logger.exception(f"incr delete policy messages metrics fail, status: {status}, count: {count}")
+
+
+class DeletePolicyMessageCollector:
+    """
+    删除策略订阅消息数量的指标, 采集时从Redis中读取所有进程累加的计数
+    """
+
+    def _new_metric(self):
+        return CounterMetricFamily(
+            "bk_iam_delete_policy_pub_sub_messages", "delete policy pub/sub messages", labels=["status"]
+        )
+
+    def describe(self):
+        # 提供describe, 避免注册时触发collect查询Redis
+        return [self._new_metric()]
+
+    def collect(self):
+        metric = self._new_metric()
+
+        try:
+            counts = redis_region.backend.client.hgetall(DELETE_POLICY_MESSAGES_METRICS_KEY)
+            for status, count in counts.items():
+                metric.add_metric([status], int(count))
+        except RedisError:
+            # 指标采集失败不能影响其他指标的暴露
+            logger.exception("collect delete policy messages metrics fail")
+
+        yield metric
@@ -28,7 +28,14 @@ def publish_delete_policies_by_subject(subjects: List[Dict]):
 
 
 def publish_delete_policies_by_template_subject(template_id: int, subject_type: str, subject_id: str):
-    publish_delete_policies(
-        DeletePolicyTypeEnum.SUBJECT_TEMPLATE.value,
-        {"subject_templates": [{"template_id": template_id, "subject": {"type": subject_type, "id": subject_id}}]},
+    publish_delete_policies_by_template_subjects(
+        [{"template_id": template_id, "subject": {"type": subject_type, "id": subject_id}}]
     )
+
+
+def publish_delete_policies_by_template_subjects(subject_templates: List[Dict]):
+    """
+    subject_templates: [{"template_id", "subject": {"type", "id"}}, ...]
+    """
+    if len(subject_templates) > 0:
+        publish_delete_policies(DeletePolicyTypeEnum.SUBJECT_TEMPLATE.value, {"subject_templates": subject_templates})
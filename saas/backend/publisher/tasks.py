@@ -10,7 +10,7 @@ specific language governing permissions and limitations under the License.
 """
 import logging
 import time
-from typing import Dict
+from typing import Dict, List, Optional, Union
 
 import redis
 from celery import task
@@ -18,51 +18,91 @@ from django.conf import settings
 
 from backend.util.json import json_dumps
 
-from .constants import DELETE_POLICY_PUB_SUB_KEY, DELETE_POLICY_REDIS_LIST_MAX_LENGTH, DeletePolicyTypeEnum
+from .buffer import get_current_buffer
+from .codec import encode_message
+from .constants import (
+    DELETE_POLICY_PUB_SUB_KEY,
+    DELETE_POLICY_REDIS_LIST_MAX_LENGTH,
+    DeletePolicyTypeEnum,
+    MessageFormatEnum,
+)
+from .metrics import incr_delete_policy_messages
 
 logger = logging.getLogger("celery")
 
+# 进程内复用的Redis连接池
+_redis_pool: Optional[redis.ConnectionPool] = None
+
+
+def _get_redis() -> redis.Redis:
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool(
+            host=settings.PUB_SUB_REDIS_HOST,
+            port=int(settings.PUB_SUB_REDIS_PORT),
+            db=int(settings.PUB_SUB_REDIS_DB),
+            password=settings.PUB_SUB_REDIS_PASSWORD,
+            decode_responses=True,
+        )
+    return redis.Redis(connection_pool=_redis_pool)
+
+
+def _serialize_message(message: Dict) -> Union[str, bytes]:
+    """
+    按配置的格式序列化消息, 默认使用JSON, 兼容旧版本的订阅方
+    """
+    if getattr(settings, "PUB_SUB_MESSAGE_FORMAT", "") == MessageFormatEnum.COMPACT.value:
+        return encode_message(message)
+    return json_dumps(message)
+
 
 @task(ignore_result=True)
-def publish_delete_policies_message(message: Dict):
+def publish_delete_policies_message(message: Union[Dict, List[Dict]]):
     """
     删除策略订阅推送
+    message: 单条消息或多条消息，兼容旧版本投递的单条消息任务
     """
     # 1. 查询用于订阅推送的Redis信息
     # 若没有Redis配置，则直接忽略
     if not getattr(settings, "PUB_SUB_REDIS_HOST", None):
         return
 
-    rds = redis.Redis(
-        host=settings.PUB_SUB_REDIS_HOST,
-        port=int(settings.PUB_SUB_REDIS_PORT),
-        db=int(settings.PUB_SUB_REDIS_DB),
-        password=settings.PUB_SUB_REDIS_PASSWORD,
-        decode_responses=True,
-    )
+    messages = message if isinstance(message, list) else [message]
+    if not messages:
+        return
 
-    # 2. 将消息添加到Redis队列里
-    rds.lpush(DELETE_POLICY_PUB_SUB_KEY, json_dumps(message))
-    # 队列长度最多1万，避免长时间不消费导致的问题
-    rds.ltrim(DELETE_POLICY_PUB_SUB_KEY, 0, DELETE_POLICY_REDIS_LIST_MAX_LENGTH - 1)
+    # 2. 使用Pipeline将消息批量添加到Redis队列里
+    try:
+        with _get_redis().pipeline(transaction=False) as pipe:
+            pipe.lpush(DELETE_POLICY_PUB_SUB_KEY, *[_serialize_message(m) for m in messages])
+            # 队列长度最多1万，避免长时间不消费导致的问题
+            pipe.ltrim(DELETE_POLICY_PUB_SUB_KEY, 0, DELETE_POLICY_REDIS_LIST_MAX_LENGTH - 1)
+            length, _ = pipe.execute()
+    except Exception:  # pylint: disable=broad-except
+        incr_delete_policy_messages("dropped", len(messages))
+        logger.exception(f"publish {len(messages)} delete policy messages to redis error")
+        return
 
+    incr_delete_policy_messages("published", len(messages))
+    trimmed = max(0, length - DELETE_POLICY_REDIS_LIST_MAX_LENGTH)
+    if trimmed:
+        incr_delete_policy_messages("trimmed", trimmed)
+        logger.warning(f"delete policy pub/sub queue is full, {trimmed} old messages trimmed")
 
-def publish_delete_policies(_type: DeletePolicyTypeEnum, data: Dict):
+
+def send_delete_policies_messages(messages: List[Dict]):
     """
-    data: 需要根据type传入对应的数据
+    将多条消息作为一个celery任务发布
     """
-    # 构造要push event message
-    message = {"timestamp": int(time.time()), "type": _type, "data": data}
-
     # 提前多判断一次：若没有Redis配置，则直接忽略，避免发起celery任务
-    if not getattr(settings, "PUB_SUB_REDIS_HOST", None):
+    if not messages or not getattr(settings, "PUB_SUB_REDIS_HOST", None):
         return
 
     # 由于订阅并非主要流程，所以错误不能引发调用者的任何异常
     try:
         # 连接不上broker，只做3次重试即可，否则会阻塞调用者，所以需要覆盖Broker默认全局配置BROKER_CONNECTION_MAX_RETRIES=100
         publish_delete_policies_message.apply_async(
-            args=(message,),
+            args=(messages,),
             retry=True,
             retry_policy={
                 # 为了避免出现：许多 Web 请求进程正在等待重试，从而阻止了其他传入请求
@@ -74,4 +114,20 @@ def publish_delete_policies(_type: DeletePolicyTypeEnum, data: Dict):
             },
         )
     except Exception as error:  # pylint: disable=broad-except
+        incr_delete_policy_messages("dropped", len(messages))
         logger.exception(f"publish_delete_policies task push celery queue error: {error}")
+
+
+def publish_delete_policies(_type: DeletePolicyTypeEnum, data: Dict):
+    """
+    data: 需要根据type传入对应的数据
+    在buffered_publish上下文中时, 只缓冲事件, 退出上下文时合并发布
+    """
+    buffer = get_current_buffer()
+    if buffer is not None:
+        buffer.add(_type, data)
+        return
+
+    # 构造要push event message
+    message = {"timestamp": int(time.time()), "type": _type, "data": data}
+    send_delete_policies_messages([message])
@@ -91,6 +91,15 @@ class RoleRelatedObjectType(ChoicesEnum, LowerStrEnum):
     _choices_labels = skip(((TEMPLATE, "权限模板"), (GROUP, "用户组")))
 
 
+class ActionRelatedObjectType(ChoicesEnum, LowerStrEnum):
+    """引用操作的对象类型"""
+
+    TEMPLATE = auto()
+    ROLE_SCOPE = auto()
+
+    _choices_labels = skip(((TEMPLATE, "权限模板"), (ROLE_SCOPE, "角色授权范围")))
+
+
 class RoleScopeSubjectType(ChoicesEnum, LowerStrEnum):
     USER = auto()
     DEPARTMENT = auto()
@@ -8,7 +8,7 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from pydantic import BaseModel
 
@@ -17,8 +17,12 @@ from backend.common.error_codes import error_codes
 from backend.component.engine import batch_query_subjects
 from backend.service.policy.query import Condition, PathNode, Policy, RelatedResource
 from backend.service.utils.translate import translate_path
+from backend.util.json import json_dumps
 
+# 单次请求engine的最大查询数
 MAX_ENGINE_SEARCH_RESOURCE_COUNT = 20
+# 分批请求engine的最大查询总数
+MAX_ENGINE_SEARCH_QUERY_COUNT = 100
 
 
 class PolicyResource(BaseModel):
@@ -33,39 +37,52 @@ class EngineService:
         """
         使用policies查询相关有权限的subjects
         """
+        return list(self.iter_query_subjects_by_policy_resources(system_id, policy_resources, subject_type, limit))
+
+    def iter_query_subjects_by_policy_resources(
+        self, system_id: str, policy_resources: List[PolicyResource], subject_type: str, limit: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        使用policies流式查询相关有权限的subjects
+
+        按MAX_ENGINE_SEARCH_RESOURCE_COUNT分批请求engine, 逐个返回每个查询的结果,
+        调用方可以在不需要后续结果时提前结束迭代, 剩余的批次不会再请求
+        """
+        query_data = self._gen_query_data(system_id, policy_resources, subject_type, limit)
+        if len(query_data) > MAX_ENGINE_SEARCH_QUERY_COUNT:
+            raise error_codes.ENGINE_REQUEST_ERROR.format("查询的资源实例不能超过{}个".format(MAX_ENGINE_SEARCH_QUERY_COUNT))
+
+        for i in range(0, len(query_data), MAX_ENGINE_SEARCH_RESOURCE_COUNT):
+            resp_data = batch_query_subjects(query_data[i : i + MAX_ENGINE_SEARCH_RESOURCE_COUNT])
+            yield from resp_data["results"]
+
+    def _gen_query_data(
+        self, system_id: str, policy_resources: List[PolicyResource], subject_type: str, limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        生成engine的查询数据, 相同的查询只保留一个
+        """
         query_data = []
+        query_keys = set()
         for p in policy_resources:
-            if len(p.resources) == 0:
-                query_data.append(
-                    {
-                        "system": system_id,
-                        "action": {"id": p.action_id},
-                        "resource": [],
-                        "subject_type": subject_type,
-                        "limit": limit,
-                    }
-                )
-                continue
+            resources = [[resource] for resource in p.resources] if p.resources else [[]]
+            for resource in resources:
+                key = json_dumps([p.action_id, resource], sort_keys=True)
+                if key in query_keys:
+                    continue
+                query_keys.add(key)
 
-            for resource in p.resources:
                 query_data.append(
                     {
                         "system": system_id,
                         "action": {"id": p.action_id},
-                        "resource": [resource],
+                        "resource": resource,
                         "subject_type": subject_type,
                         "limit": limit,
                     }
                 )
 
-        if not query_data:
-            return []
-
-        if len(query_data) > MAX_ENGINE_SEARCH_RESOURCE_COUNT:
-            raise error_codes.ENGINE_REQUEST_ERROR.format("查询的资源实例不能超过{}个".format(MAX_ENGINE_SEARCH_RESOURCE_COUNT))
-
-        resp_data = batch_query_subjects(query_data)
-        return resp_data["results"]
+        return query_data
 
     def gen_search_policy_resources(self, policies: List[Policy]) -> List[PolicyResource]:
         """
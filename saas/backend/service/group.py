@@ -9,21 +9,32 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 import logging
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from django.db import transaction
 from django.db.models import F
+from dogpile.cache.api import NO_VALUE
 from pydantic import BaseModel, parse_obj_as
 
 from backend.apps.group.models import Group
 from backend.apps.organization.models import Department, DepartmentMember, User
+from backend.common.concurrency import concurrent_map
 from backend.component import iam
+from backend.util.cache import RedisJSONCache
 
 from .constants import SubjectType
 from .models import Subject
 
 logger = logging.getLogger(__name__)
 
+# 部门的Group关系缓存时间, 只做短时间缓存, 避免成员变更后长时间不生效
+DEPARTMENT_RELATION_CACHE_EXPIRATION_TIME = 30
+
+# 多进程共享缓存, 部门成员变更后所有进程的缓存同时失效
+department_relation_cache = RedisJSONCache(
+    "bk_iam:subject_relation:department", DEPARTMENT_RELATION_CACHE_EXPIRATION_TIME
+)
+
 
 class SubjectGroup(BaseModel):
     """
@@ -108,6 +119,7 @@ class GroupService:
             user_count=F("user_count") + type_count[SubjectType.USER.value],
             department_count=F("department_count") + type_count[SubjectType.DEPARTMENT.value],
         )
+        self._invalidate_department_relation_cache(members)
 
     def remove_members(self, group_id: str, subjects: List[Subject]):
         """
@@ -118,6 +130,7 @@ class GroupService:
             user_count=F("user_count") - type_count[SubjectType.USER.value],
             department_count=F("department_count") - type_count[SubjectType.DEPARTMENT.value],
         )
+        self._invalidate_department_relation_cache(subjects)
 
     def list_subject_group(self, subject: Subject, is_recursive: bool = False) -> List[SubjectGroup]:
         """
@@ -139,24 +152,63 @@ class GroupService:
         """
         查询user的部门递归的Group
         """
-        relations = []
         user = User.objects.get(username=user_id)
         # 查询用户直接加入的部门
         department_ids = DepartmentMember.objects.filter(user_id=user.id).values_list("department_id", flat=True)
-        department_set = set()
-        for department in Department.objects.filter(id__in=department_ids):
-            # 查询部门继承的所有部门
-            for ancestor in department.get_ancestors(include_self=True):
-                if ancestor.id in department_set:
-                    continue
-                department_set.add(ancestor.id)
-                iam_data = iam.get_subject_relation("department", str(ancestor.id))
-                dep_relations = [
-                    SubjectGroup(department_id=ancestor.id, department_name=ancestor.name, **one) for one in iam_data
+
+        # 从冗余的ancestors字段获取部门继承的所有部门, 不需要逐个部门查询树
+        department_names: Dict[int, str] = {}
+        for department in Department.objects.filter(id__in=department_ids).only("id", "name", "ancestors"):
+            for ancestor in department.parse_ancestors():
+                department_names.setdefault(ancestor["id"], ancestor["name"])
+            department_names.setdefault(department.id, department.name)
+
+        department_relations = self.list_department_subject_relation(list(department_names.keys()))
+
+        relations = []
+        for department_id, iam_data in department_relations.items():
+            relations.extend(
+                [
+                    SubjectGroup(department_id=department_id, department_name=department_names[department_id], **one)
+                    for one in iam_data
                 ]
-                relations.extend(dep_relations)
+            )
         return relations
 
+    def list_department_subject_relation(self, department_ids: List[int]) -> Dict[int, List[Dict]]:
+        """
+        批量查询部门的Group关系
+
+        后端没有批量查询的接口, 对未缓存的部门并发查询, 结果短时间缓存
+        """
+        cached_values = department_relation_cache.get_multi(department_ids)
+
+        department_relations: Dict[int, List[Dict]] = {}
+        missing_ids = []
+        for _id, value in zip(department_ids, cached_values):
+            if value is NO_VALUE:
+                missing_ids.append(_id)
+            else:
+                department_relations[_id] = value
+
+        if missing_ids:
+            results = concurrent_map(
+                lambda _id: iam.get_subject_relation(SubjectType.DEPARTMENT.value, str(_id)), missing_ids
+            )
+            department_relation_cache.set_multi(dict(zip(missing_ids, results)))
+            department_relations.update(zip(missing_ids, results))
+
+        # 保持与输入的部门顺序一致
+        return {_id: department_relations[_id] for _id in department_ids}
+
+    def _invalidate_department_relation_cache(self, subjects: List[Subject]):
+        """
+        部门成员变更后, 清理部门的Group关系缓存
+        """
+        department_relation_cache.delete_multi(
+            [int(one.id) for one in subjects if one.type == SubjectType.DEPARTMENT.value]
+        )
+
     def list_subject_group_before_expired_at(self, subject: Subject, expired_at: int) -> List[SubjectGroup]:
         """
         查询subject在指定过期时间之前的相关Group
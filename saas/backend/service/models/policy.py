@@ -382,6 +382,29 @@ class Condition(BaseModel):
                 instances_dict[_type] - instance
         self.instances = [instance for instance in self.instances if len(instance.path)]
 
+    def subtract_instances(self, instances: List[Instance]) -> "Condition":
+        """
+        返回移除传入实例后的新条件, 不修改自身
+
+        未变更的实例直接复用, 避免deepcopy整个条件
+        """
+        remove_path_set_dict: Dict[str, Set[str]] = {}
+        for instance in instances:
+            remove_path_set_dict.setdefault(instance.type, set()).update(instance._get_path_set())
+
+        new_instances = []
+        for instance in self.instances:
+            if instance.type in remove_path_set_dict:
+                path_set = remove_path_set_dict[instance.type]
+                path = [p for p in instance.path if translate_path(p) not in path_set]
+                if len(path) != len(instance.path):
+                    instance = instance.copy(update={"path": path})
+
+            if len(instance.path):
+                new_instances.append(instance)
+
+        return self.copy(update={"instances": new_instances})
+
     def diff(self, condition: "Condition") -> "Condition":
         """
         对比单个条件
@@ -633,6 +656,38 @@ class RelatedResource(BaseModel):
         self.condition = conditions
         self._is_empty = len(conditions) == 0  # 如果所有的条件都被删完了, 记录状态
 
+    def subtract_conditions(self, conditions: List[Condition]) -> "RelatedResource":
+        """
+        返回删除已有条件后的新资源类型, 结果与remove_conditions一致, 但不修改自身
+
+        未变更的条件直接复用, 避免deepcopy整个资源类型
+        """
+        related_resource = self.copy()
+        # 如果新旧条件都是任意, 相当于清空
+        if self.is_any():
+            if len(conditions) == 0:
+                related_resource._is_empty = True
+            return related_resource
+
+        empty_instance_contions = {c.hash_attributes(): c for c in self.condition if c.is_instances_empty()}
+        condition_dict = {c.hash_attributes(): c for c in self.condition if not c.is_instances_empty()}
+
+        for c in conditions:
+            _hash = c.hash_attributes()
+            if c.is_instances_empty():
+                empty_instance_contions.pop(_hash, None)
+            elif _hash in condition_dict:
+                # 移除条件中需要删除的部分实例, 如果条件的所有实例都删空了, 需要移除整组条件
+                condition = condition_dict[_hash].subtract_instances(c.instances)
+                if condition.is_instances_empty():
+                    condition_dict.pop(_hash)
+                else:
+                    condition_dict[_hash] = condition
+
+        related_resource.condition = list(chain(condition_dict.values(), empty_instance_contions.values()))
+        related_resource._is_empty = len(related_resource.condition) == 0
+        return related_resource
+
     def has_conditions(self, conditions: List[Condition]) -> bool:
         """
         是否包含所有的条件
@@ -958,16 +1013,20 @@ class Policy(BaseModel):
             self.is_diff_only_expired_at = is_diff  # 需要有一个是否变更的标志
             return is_diff
 
-        related_resource_types = deepcopy(self.related_resource_types)
+        # NOTE: 使用subtract_conditions生成新的资源类型, 只复制有变更的部分, 避免deepcopy
+        related_resource_types = []
         rt_dict = {(rt.system_id, rt.type): rt for rt in policy.related_resource_types}
-        for rt in related_resource_types:
+        for rt in self.related_resource_types:
             key = (rt.system_id, rt.type)
-            if key in rt_dict:
-                # 如果从有限权限变更成任意, 可以确定有变更
-                if rt.is_any() and not rt_dict[key].is_any():
-                    return False
+            if key not in rt_dict:
+                related_resource_types.append(rt.copy())
+                continue
+
+            # 如果从有限权限变更成任意, 可以确定有变更
+            if rt.is_any() and not rt_dict[key].is_any():
+                return False
 
-                rt.remove_conditions(rt_dict[key].condition)
+            related_resource_types.append(rt.subtract_conditions(rt_dict[key].condition))
 
         # 如果所有的资源类型都被删空, 返回True
         is_empty = all([rt.is_empty() for rt in related_resource_types])
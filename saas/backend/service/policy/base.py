@@ -28,6 +28,7 @@ from backend.util.json import json_dumps
 
 from ..action import ActionList, ActionService
 from ..resource_type import ResourceTypeService
+from .query import PolicySummary
 
 permission_logger = logging.getLogger("permission")
 
@@ -71,6 +72,26 @@ class PolicyQueryMixin:
 
         return policies
 
+    def list_system_policy_summary_by_subject(self, system_id: str, subject: Subject) -> List[PolicySummary]:
+        """
+        获取subject的所有policy的概要信息, 只查询元数据字段, 不加载与解析资源条件
+        """
+        policy_dict = self._get_backend_policy_dict(system_id, subject)
+
+        qs = PolicyModel.objects.filter(
+            system_id=system_id,
+            subject_type=subject.type,
+            subject_id=subject.id,
+            policy_id__in=list(policy_dict.keys()),
+        ).only("action_id", "policy_id")
+
+        return [
+            PolicySummary(
+                action_id=p.action_id, policy_id=p.policy_id, expired_at=policy_dict[p.policy_id]["expired_at"]
+            )
+            for p in qs
+        ]
+
     # TODO 针对backend返回的policy可以订一个结构, 封装相关的方法
     def _get_backend_policy_dict(self, system_id: str, subject: Subject) -> Dict:
         backend_policies = iam.list_system_policy(system_id, subject.type, subject.id)
@@ -474,12 +495,13 @@ class PolicyService(PolicyQueryMixin):
             grant_policies = self._grant_resources_instance(
                 system_id, actions, subject, resource_instances, expired_at
             )
-            policies = self.list_system_policy_by_subject(system_id, subject, False)
+            action_ids = {ac.id for ac in actions}
+            policies = self.list_system_policy_summary_by_subject(system_id, subject)
             return (
                 [
-                    {"action": {"id": p.id}, "policy_id": p.policy_id}
+                    {"action": {"id": p.action_id}, "policy_id": p.policy_id}
                     for p in policies
-                    if p.id in {ac.id for ac in actions}
+                    if p.action_id in action_ids
                 ],
                 grant_policies,
             )
@@ -544,9 +566,13 @@ class PolicyService(PolicyQueryMixin):
         # 变更权限
         grant_policies = self.alter_subject_policies(system_id, subject, policies)
 
-        subject_policies = self.list_system_policy_by_subject(system_id, subject, False)
+        subject_policies = self.list_system_policy_summary_by_subject(system_id, subject)
         return (
-            [{"action": {"id": p.id}, "policy_id": p.policy_id} for p in subject_policies if p.id in set(action_ids)],
+            [
+                {"action": {"id": p.action_id}, "policy_id": p.policy_id}
+                for p in subject_policies
+                if p.action_id in set(action_ids)
+            ],
             grant_policies,
         )
 
@@ -8,6 +8,7 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple
 
 from django.db.models import Count
@@ -173,6 +174,16 @@ class BackendThinPolicy(BaseModel):
     expired_at: int
 
 
+class PolicySummary(BaseModel):
+    """
+    策略的概要信息, 不包含资源条件
+    """
+
+    action_id: str
+    policy_id: int
+    expired_at: int
+
+
 class SystemCounter(BaseModel):
     id: str
     count: int
@@ -202,12 +213,57 @@ class PolicyQueryService:
 
         return self._trans_from_queryset(system_id, subject, qs)
 
-    def _trans_from_queryset(self, system_id: str, subject: Subject, queryset) -> List[Policy]:
+    def list_summary_by_subject(self, system_id: str, subject: Subject) -> List[PolicySummary]:
         """
-        db policy queryset 转换为List[Policy]
+        查询subject指定系统下所有Policy的概要信息, 只查询元数据字段, 不加载与解析资源条件
         """
         backend_policy_list = new_backend_policy_list_by_subject(system_id, subject)
 
+        qs = PolicyModel.objects.filter(system_id=system_id, subject_type=subject.type, subject_id=subject.id).only(
+            "action_id", "policy_id"
+        )
+        return [
+            PolicySummary(
+                action_id=one.action_id,
+                policy_id=one.policy_id,
+                expired_at=backend_policy_list.get(one.action_id).expired_at,  # type: ignore
+            )
+            for one in qs
+            if backend_policy_list.get(one.action_id)
+        ]
+
+    def list_paging_by_subject(
+        self,
+        system_id: str,
+        subject: Subject,
+        cursor: int,
+        limit: int,
+        backend_policy_list: Optional[BackendThinPolicyList] = None,
+    ) -> Tuple[List[Policy], Optional[int]]:
+        """
+        按db id游标分页查询subject指定系统下的Policy
+
+        backend_policy_list: 后端的Policy List, 连续查询多页时由调用方查询一次后传入, 避免每一页都请求后端
+        return: 策略列表, 下一页的游标(没有更多数据时为None)
+        """
+        qs = PolicyModel.objects.filter(
+            system_id=system_id, subject_type=subject.type, subject_id=subject.id, id__gt=cursor
+        ).order_by("id")
+        # 多查一条用于判断是否有下一页
+        db_policies = list(qs[: limit + 1])
+        next_cursor = db_policies[limit - 1].id if len(db_policies) > limit else None
+
+        return self._trans_from_queryset(system_id, subject, db_policies[:limit], backend_policy_list), next_cursor
+
+    def _trans_from_queryset(
+        self, system_id: str, subject: Subject, queryset, backend_policy_list: Optional[BackendThinPolicyList] = None
+    ) -> List[Policy]:
+        """
+        db policy queryset 转换为List[Policy]
+        """
+        if backend_policy_list is None:
+            backend_policy_list = new_backend_policy_list_by_subject(system_id, subject)
+
         policies = [
             Policy.from_db_model(one, backend_policy_list.get(one.action_id).expired_at)  # type: ignore
             for one in queryset
@@ -228,13 +284,25 @@ class PolicyQueryService:
         """
         查询subject有权限的系统-policy数量信息
         """
+        return self.list_system_counter_by_subjects(subject.type, [subject.id]).get(subject.id, [])
+
+    def list_system_counter_by_subjects(
+        self, subject_type: str, subject_ids: List[str]
+    ) -> Dict[str, List[SystemCounter]]:
+        """
+        批量查询subjects有权限的系统-policy数量信息, 只需一次分组聚合查询
+        """
         qs = (
-            PolicyModel.objects.filter(subject_type=subject.type, subject_id=subject.id)
-            .values("system_id")
+            PolicyModel.objects.filter(subject_type=subject_type, subject_id__in=subject_ids)
+            .values("subject_id", "system_id")
             .annotate(count=Count("system_id"))
+            .order_by()
         )
 
-        return [SystemCounter(id=one["system_id"], count=one["count"]) for one in qs]
+        counters: Dict[str, List[SystemCounter]] = defaultdict(list)
+        for one in qs:
+            counters[one["subject_id"]].append(SystemCounter(id=one["system_id"], count=one["count"]))
+        return dict(counters)
 
     def get_system_policy(self, policy_id: int, subject: Subject) -> Tuple[str, Policy]:
         """
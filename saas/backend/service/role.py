@@ -8,14 +8,15 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-import json
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from django.db import transaction
 from django.utils.translation import gettext as _
+from dogpile.cache.api import NO_VALUE
 from pydantic import BaseModel, parse_obj_as
 
+from backend.apps.action.models import ActionRelatedObject
 from backend.apps.role.models import (
     Role,
     RoleRelatedObject,
@@ -27,14 +28,19 @@ from backend.apps.role.models import (
 )
 from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthorized
 from backend.common.error_codes import error_codes
+from backend.common.local import local
 from backend.component import iam
 from backend.service.constants import RoleRelatedObjectType, RoleScopeType, RoleSourceTypeEnum, RoleType, SubjectType
 from backend.service.models import Subject
 from backend.service.policy.query import RelatedResource
-from backend.util.json import json_dumps
+from backend.util.cache import RedisJSONCache
+from backend.util.json import json_dumps, json_loads
 
 logger = logging.getLogger("app")
 
+# 角色授权范围的跨请求缓存时间，角色授权范围变更时会主动失效
+ROLE_SCOPE_CACHE_EXPIRATION_TIME = 10 * 60
+
 
 class AuthScopeAction(BaseModel):
     id: str
@@ -73,22 +79,98 @@ class CommonAction(BaseModel):
     action_ids: List[str]
 
 
+class RoleScopeCache:
+    """
+    角色授权范围缓存
+
+    1. 跨请求: Redis中缓存RoleScope的原始内容，避免每个请求都查询DB
+    2. 请求内: 在当前request上缓存解析后的授权范围，同一个请求中多次查询只解析一次
+    """
+
+    request_attr = "_role_scope_context"
+
+    def __init__(self):
+        self.cache = RedisJSONCache("bk_iam:role_scope", ROLE_SCOPE_CACHE_EXPIRATION_TIME)
+
+    def _gen_cache_key(self, role_id: int, scope_type: str) -> str:
+        return f"{role_id}:{scope_type}"
+
+    def _get_request_context(self) -> Optional[Dict[Tuple[int, str], Any]]:
+        request = local.request
+        # celery等后台任务中没有request
+        if request is None:
+            return None
+
+        context = getattr(request, self.request_attr, None)
+        if context is None:
+            context = {}
+            setattr(request, self.request_attr, context)
+        return context
+
+    def get_content(self, role_id: int, scope_type: str) -> str:
+        """
+        获取RoleScope的原始内容，不存在时返回空字符串
+        """
+        key = self._gen_cache_key(role_id, scope_type)
+        # 缓存有问题，不影响正常逻辑
+        content = self.cache.get(key)
+        if content is not NO_VALUE:
+            return content
+
+        role_scope = RoleScope.objects.filter(role_id=role_id, type=scope_type).only("content").first()
+        content = role_scope.content if role_scope else ""
+        self.cache.set(key, content)
+
+        return content
+
+    def get_parsed(self, role_id: int, scope_type: str, parse_func) -> List:
+        """
+        获取解析后的授权范围，同一个请求中只解析一次
+        """
+        context = self._get_request_context()
+        if context is not None and (role_id, scope_type) in context:
+            # 返回新的列表，避免调用方修改列表影响缓存
+            return list(context[(role_id, scope_type)])
+
+        content = self.get_content(role_id, scope_type)
+        parsed = parse_func(json_loads(content)) if content else []
+
+        if context is not None:
+            context[(role_id, scope_type)] = parsed
+        return list(parsed)
+
+    def delete(self, role_ids: List[int]):
+        """
+        角色授权范围变更后失效缓存
+        """
+        keys = [
+            self._gen_cache_key(role_id, scope_type)
+            for role_id in role_ids
+            for scope_type in [RoleScopeType.AUTHORIZATION.value, RoleScopeType.SUBJECT.value]
+        ]
+        self.cache.delete_multi(keys)
+
+        context = self._get_request_context()
+        if context is not None:
+            for key in [k for k in context if k[0] in set(role_ids)]:
+                context.pop(key)
+
+
+role_scope_cache = RoleScopeCache()
+
+
 class RoleService:
     def list_subject_scope(self, role_id: int) -> List[Subject]:
         """查询role的subject授权范围"""
-        role_scope = RoleScope.objects.filter(role_id=role_id, type=RoleScopeType.SUBJECT.value).first()
-        if not role_scope:
-            return []
-
-        return parse_obj_as(List[Subject], json.loads(role_scope.content))
+        return role_scope_cache.get_parsed(
+            role_id, RoleScopeType.SUBJECT.value, lambda data: parse_obj_as(List[Subject], data)
+        )
 
     def list_auth_scope(self, role_id: int) -> List[AuthScopeSystem]:
         """查询role的policy授权范围"""
-        role_scope = RoleScope.objects.filter(role_id=role_id, type=RoleScopeType.AUTHORIZATION.value).first()
-        if not role_scope:
-            return []
-
-        return parse_obj_as(List[AuthScopeSystem], json.loads(role_scope.content))
+        return role_scope_cache.get_parsed(
+            role_id, RoleScopeType.AUTHORIZATION.value, lambda data: parse_obj_as(List[AuthScopeSystem], data)
+        )
 
     def list_user_role(self, user_id: str) -> List[UserRole]:
         """查询用户的角色列表"""
@@ -138,6 +220,7 @@ class RoleService:
             content=json_dumps([system.dict() for system in systems]),
         )
         system_scope.save(force_insert=True)
+        ActionRelatedObject.objects.reset_role_scope_actions(role_id, self._list_scope_system_actions(systems))
 
         # 2. 创建授权对象的限制范围
         subject_scope = RoleScope(
@@ -217,6 +300,7 @@ class RoleService:
         RoleScope.objects.filter(role_id=role_id, type=RoleScopeType.AUTHORIZATION.value).update(
             content=json_dumps([system.dict() for system in systems])
         )
+        ActionRelatedObject.objects.reset_role_scope_actions(role_id, self._list_scope_system_actions(systems))
 
         # 2. 修改授权对象的限制范围
         RoleScope.objects.filter(role_id=role_id, type=RoleScopeType.SUBJECT.value).update(
@@ -226,6 +310,14 @@ class RoleService:
         # 3. 更新role subject scope 关系
         self._update_scope_subject(role_id, subjects)
 
+        # 4. 失效授权范围缓存，事务提交后需再次失效，避免提交前被其他请求回填了旧数据
+        role_scope_cache.delete([role_id])
+        transaction.on_commit(lambda: role_scope_cache.delete([role_id]))
+
+    @staticmethod
+    def _list_scope_system_actions(systems: List[AuthScopeSystem]) -> List[Tuple[str, str]]:
+        return [(system.system_id, action.id) for system in systems for action in system.actions]
+
     def _update_scope_subject(self, role_id: int, subjects: List[Subject]):
         """更新scope subject关系"""
         role_scope = RoleScope.objects.filter(role_id=role_id, type=RoleScopeType.SUBJECT.value).only("id").first()
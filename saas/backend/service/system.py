@@ -8,12 +8,21 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from dogpile.cache.api import NO_VALUE
 
 from backend.component import iam
+from backend.util.cache import RedisJSONCache
 
 from .models import System
 
+# 系统信息变更不频繁, 允许短时间的不一致
+SYSTEM_CACHE_EXPIRATION_TIME = 60
+SYSTEM_LIST_CACHE_KEY = "list"
+
+system_cache = RedisJSONCache("bk_iam:system", SYSTEM_CACHE_EXPIRATION_TIME)
+
 
 class SystemList:
     def __init__(self, systems: List[System]) -> None:
@@ -27,13 +36,47 @@ class SystemList:
 class SystemService:
     def list(self) -> List[System]:
         """获取所有系统"""
-        systems = iam.list_system()
+        systems = self._list_raw_systems()
         # 组装为返回结构
         return [System(**i) for i in systems]
 
     def get(self, system_id: str) -> System:
-        system = iam.get_system(system_id)
-        return System(**system)
+        system = self.new_system_list().get(system_id)
+        if system is not None:
+            return system
+
+        # 缓存中不存在时可能是新注册的系统, 直接查询后端并失效缓存
+        system = System(**iam.get_system(system_id))
+        self.invalidate()
+        return system
+
+    def get_many(self, system_ids: List[str]) -> Dict[str, System]:
+        """
+        批量获取系统, 不存在的系统不返回
+        """
+        system_list = self.new_system_list()
+        systems = {}
+        for system_id in system_ids:
+            system = system_list.get(system_id)
+            if system is not None:
+                systems[system_id] = system
+        return systems
 
     def new_system_list(self) -> SystemList:
         return SystemList(self.list())
+
+    def invalidate(self):
+        """
+        失效系统信息缓存
+        """
+        system_cache.delete_multi([SYSTEM_LIST_CACHE_KEY])
+
+    def _list_raw_systems(self) -> List[Dict]:
+        """
+        从缓存中获取后端返回的系统列表, 缓存不存在或不可用时查询后端
+        """
+        systems = system_cache.get(SYSTEM_LIST_CACHE_KEY)
+        if systems is NO_VALUE:
+            systems = iam.list_system()
+            system_cache.set(SYSTEM_LIST_CACHE_KEY, systems)
+        return systems
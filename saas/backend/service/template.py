@@ -8,10 +8,12 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+import logging
+from collections import defaultdict
 from typing import Any, Dict, List
 
 from django.db import transaction
-from django.db.models import Count, F
+from django.db.models import Count, F, Q
 from django.utils.translation import gettext as _
 from pydantic import BaseModel, parse_obj_as
 
@@ -19,9 +21,15 @@ from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthori
 from backend.common.error_codes import error_codes
 from backend.component import iam
 from backend.service.policy.query import Policy, PolicyList, SystemCounter, new_backend_policy_list_by_subject
+from backend.util.basic import chunked
 
 from .models import Subject
 
+logger = logging.getLogger(__name__)
+
+# 批量移除模板成员时, 每批删除的成员数量
+TEMPLATE_REVOKE_SUBJECT_CHUNK_SIZE = 100
+
 
 class TemplateGroupPreCommit(BaseModel):
     group_id: str
@@ -49,6 +57,96 @@ class TemplateService:
                 # 调用后端删除权限
                 iam.delete_template_policies(system_id, subject.type, subject.id, template_id)
 
+    def revoke_subjects(self, system_id: str, template_id: int, subjects: List[Subject]) -> List[Dict]:
+        """
+        批量移除模板成员
+
+        每批成员只执行一次删除与一次计数更新, DB删除提交后再并发调用后端删除权限,
+        后端删除失败的subject不回滚DB, 记录日志并返回
+        """
+        failed_subjects: List[Dict] = []
+        for part_subjects in chunked(subjects, TEMPLATE_REVOKE_SUBJECT_CHUNK_SIZE):
+            type_ids: Dict[str, List[str]] = defaultdict(list)
+            for subject in part_subjects:
+                type_ids[subject.type].append(subject.id)
+
+            subject_filter = Q()
+            for subject_type, subject_ids in type_ids.items():
+                subject_filter |= Q(subject_type=subject_type, subject_id__in=subject_ids)
+
+            with transaction.atomic():
+                authorized_subjects = list(
+                    PermTemplatePolicyAuthorized.objects.filter(subject_filter, template_id=template_id).values_list(
+                        "id", "subject_type", "subject_id"
+                    )
+                )
+                if not authorized_subjects:
+                    continue
+
+                PermTemplatePolicyAuthorized.objects.filter(id__in=[one[0] for one in authorized_subjects]).delete()
+
+                # 更新冗余count
+                PermTemplate.objects.filter(id=template_id).update(
+                    subject_count=F("subject_count") - len(authorized_subjects)
+                )
+
+            # 调用后端删除权限
+            failed_subjects.extend(
+                iam.batch_delete_template_policies(
+                    [
+                        {
+                            "system_id": system_id,
+                            "template_id": template_id,
+                            "subject_type": subject_type,
+                            "subject_id": subject_id,
+                        }
+                        for _id, subject_type, subject_id in authorized_subjects
+                    ]
+                )
+            )
+
+        if failed_subjects:
+            logger.error("revoke template subjects, backend delete policies fail: %s", failed_subjects)
+
+        return failed_subjects
+
+    def revoke_subject_templates(self, subject: Subject, templates: List[PermTemplate]) -> List[Dict]:
+        """
+        移除subject的多个模板授权
+
+        DB删除提交后再调用后端删除权限, 返回后端删除失败的模板授权
+        """
+        with transaction.atomic():
+            queryset = PermTemplatePolicyAuthorized.objects.filter(
+                template_id__in=[t.id for t in templates], subject_type=subject.type, subject_id=subject.id
+            )
+            template_ids = set(queryset.values_list("template_id", flat=True))
+            if not template_ids:
+                return []
+
+            queryset.delete()
+
+            # 更新冗余count, 每个模板下subject只有一条授权
+            PermTemplate.objects.filter(id__in=template_ids).update(subject_count=F("subject_count") - 1)
+
+        # 调用后端删除权限
+        failed_subjects = iam.batch_delete_template_policies(
+            [
+                {
+                    "system_id": t.system_id,
+                    "template_id": t.id,
+                    "subject_type": subject.type,
+                    "subject_id": subject.id,
+                }
+                for t in templates
+                if t.id in template_ids
+            ]
+        )
+        if failed_subjects:
+            logger.error("revoke subject templates, backend delete policies fail: %s", failed_subjects)
+
+        return failed_subjects
+
     def grant_subject(self, system_id: str, template_id: int, subject: Subject, policies: List[Policy]):
         """
         模板增加成员
@@ -144,14 +242,25 @@ class TemplateService:
         """
         查询subject有权限的系统-模板数量信息
         """
+        return self.list_system_counter_by_subjects(subject.type, [subject.id]).get(subject.id, [])
+
+    def list_system_counter_by_subjects(
+        self, subject_type: str, subject_ids: List[str]
+    ) -> Dict[str, List[SystemCounter]]:
+        """
+        批量查询subjects有权限的系统-模板数量信息, 只需一次分组聚合查询
+        """
         qs = (
-            PermTemplatePolicyAuthorized.objects.filter_by_subject(subject)
-            .values("system_id")
+            PermTemplatePolicyAuthorized.objects.filter(subject_type=subject_type, subject_id__in=subject_ids)
+            .values("subject_id", "system_id")
             .annotate(count=Count("system_id"))
             .order_by()
         )
 
-        return [SystemCounter(id=one["system_id"], count=one["count"]) for one in qs]
+        counters: Dict[str, List[SystemCounter]] = defaultdict(list)
+        for one in qs:
+            counters[one["subject_id"]].append(SystemCounter(id=one["system_id"], count=one["count"]))
+        return dict(counters)
 
     def create_or_update_group_pre_commit(self, template_id: int, pre_commits: List[TemplateGroupPreCommit]):
         """
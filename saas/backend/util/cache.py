@@ -8,11 +8,22 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
-from typing import Any, Dict
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 import redis
 from django.conf import settings
+from django.core.cache import cache
 from dogpile.cache import make_region
+from dogpile.cache.api import NO_VALUE
+from redis.exceptions import RedisError
+
+from backend.util.json import json_dumps, json_loads
+from backend.util.uuid import gen_uuid
+
+logger = logging.getLogger(__name__)
 
 # 默认是内存的Cache
 cache_dictionary: Dict[str, Any] = {}  # 内存cache是使用Python dictionary来作为Cache的
@@ -41,3 +52,182 @@ redis_region = make_region().configure(
 
 # Note: 使用region.cache_on_arguments() 对类的相关方法应用时，会忽略self和cls参数，进而是在类的所有对象上缓存的，并不是针对某个对象
 # 如果需要针对对象缓存，则需要自定义 function_key_generator参数传入cache_on_arguments()里
+
+
+class RedisJSONCache:
+    """
+    多进程共享的Redis缓存, 数据以JSON格式存储
+
+    Note: rd_pool开启了decode_responses, 不能通过redis_region存取pickle后的数据, 所以直接使用redis client读写JSON
+    """
+
+    def __init__(self, prefix: str, expiration_time: int):
+        self.prefix = prefix
+        self.expiration_time = expiration_time
+
+    def _gen_key(self, key: Any) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get_multi(self, keys: List[Any]) -> List[Any]:
+        """
+        批量获取, 不存在的key返回NO_VALUE, 缓存有问题时不影响正常逻辑, 都当作不存在
+        """
+        if not keys:
+            return []
+
+        try:
+            values = redis_region.backend.client.mget([self._gen_key(key) for key in keys])
+        except RedisError as error:
+            logger.exception(f"get redis json cache error: {error}")
+            return [NO_VALUE] * len(keys)
+
+        return [NO_VALUE if value is None else json_loads(value) for value in values]
+
+    def get(self, key: Any) -> Any:
+        return self.get_multi([key])[0]
+
+    def set_multi(self, mapping: Dict[Any, Any]):
+        if not mapping:
+            return
+
+        try:
+            with redis_region.backend.client.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(self._gen_key(key), json_dumps(value), ex=self.expiration_time)
+                pipe.execute()
+        except RedisError as error:
+            logger.exception(f"set redis json cache error: {error}")
+
+    def set(self, key: Any, value: Any):
+        self.set_multi({key: value})
+
+    def delete_multi(self, keys: List[Any]):
+        if not keys:
+            return
+
+        try:
+            redis_region.backend.client.delete(*[self._gen_key(key) for key in keys])
+        except RedisError as error:
+            logger.exception(f"delete redis json cache error: {error}")
+
+
+class VersionedLocalCache:
+    """
+    进程内缓存, 通过共享缓存中的版本号在多进程间失效
+
+    适用于数据量较大、变更不频繁且需要在内存中建立索引的数据, 如组织架构
+
+    如果提供了updater, 可以通过update()发布增量变更, 所有进程在下次检查版本时原地应用变更, 不需要全量重建,
+    增量变更超过max_updates条时退化为全量重建, 避免变更列表无限增长
+    """
+
+    def __init__(
+        self,
+        version_key: str,
+        builder: Callable[[], Any],
+        check_interval: int = 5,
+        updater: Optional[Callable[[Any, Any], None]] = None,
+        max_updates: int = 10000,
+    ):
+        self.version_key = version_key
+        self.builder = builder
+        # 检查版本号的最小间隔(秒), 避免每次获取都访问Redis
+        self.check_interval = check_interval
+        # 增量变更处理函数: updater(value, item)
+        self.updater = updater
+        self.updates_key = f"{version_key}:updates"
+        self.max_updates = max_updates
+
+        self._value: Any = None
+        self._version: Optional[str] = None
+        self._checked_at: float = 0
+        # 已应用的增量变更数量
+        self._update_offset = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        now = time.time()
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return self._value
+
+        version = cache.get(self.version_key) or ""
+        with self._lock:
+            if self._version != version:
+                # 先记录变更位置再重建, 重建期间发布的变更会再应用一次, 由updater保证幂等
+                update_offset = self._count_updates()
+                self._value = self.builder()
+                self._version = version
+                self._update_offset = update_offset
+            self._apply_updates()
+            self._checked_at = now
+
+            # 在锁内获取引用, 避免并发的invalidate()导致返回None
+            return self._value
+
+    def update(self, items: List[Any]):
+        """
+        发布增量变更, item需要可以JSON序列化
+        """
+        if not items:
+            return
+
+        try:
+            count = redis_region.backend.client.rpush(self.updates_key, *[json_dumps(item) for item in items])
+        except RedisError as error:
+            # 发布失败时退化为全量重建
+            logger.exception(f"push versioned local cache updates error: {error}")
+            self.invalidate()
+            return
+
+        # 变更过多时全量重建, 同时清空变更列表
+        if count > self.max_updates:
+            self.invalidate()
+            return
+
+        with self._lock:
+            # 当前进程下次获取时立即应用
+            self._checked_at = 0
+
+    def _count_updates(self) -> int:
+        if self.updater is None:
+            return 0
+
+        try:
+            return redis_region.backend.client.llen(self.updates_key)
+        except RedisError as error:
+            logger.exception(f"count versioned local cache updates error: {error}")
+            return 0
+
+    def _apply_updates(self):
+        count = self._count_updates()
+        # 变更列表已被invalidate()清空, 新版本会在下次检查时重建
+        if count < self._update_offset:
+            self._update_offset = 0
+        if count == self._update_offset:
+            return
+
+        try:
+            items = redis_region.backend.client.lrange(self.updates_key, self._update_offset, count - 1)
+        except RedisError as error:
+            logger.exception(f"get versioned local cache updates error: {error}")
+            return
+
+        for item in items:
+            self.updater(self._value, json_loads(item))  # type: ignore
+        self._update_offset = count
+
+    def invalidate(self):
+        """
+        变更版本号, 所有进程在下次检查版本时重建
+        """
+        if self.updater is not None:
+            try:
+                redis_region.backend.client.delete(self.updates_key)
+            except RedisError as error:
+                logger.exception(f"delete versioned local cache updates error: {error}")
+
+        cache.set(self.version_key, gen_uuid(), timeout=None)
+        with self._lock:
+            self._version = None
+            self._value = None
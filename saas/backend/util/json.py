@@ -9,8 +9,143 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 import json
-from typing import Any
+import math
+import re
+from typing import Any, Callable, Optional, Union
 
+from django.conf import settings
 
-def json_dumps(data: Any, cls=None) -> str:
-    return json.dumps(data, separators=(",", ":"), cls=cls)
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# json.dumps(ensure_ascii=True) 会转义的字符
+_ESCAPE_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+
+# orjson输出的科学计数法浮点数与标准库不一致, 如1e16/1e-7, 标准库为1e+16/1e-07
+# 字符串中的内容(如十六进制摘要)也可能匹配, 此时只是回退到标准库, 不影响结果
+_EXPONENT_FLOAT = re.compile(rb"[0-9]e")
+
+
+def _escape_non_ascii(match) -> str:
+    n = ord(match.group(0))
+    if n < 0x10000:
+        return "\\u{0:04x}".format(n)
+    # 与标准库一致, 超出BMP的字符转义为UTF-16代理对
+    n -= 0x10000
+    return "\\u{0:04x}\\u{1:04x}".format(0xD800 | ((n >> 10) & 0x3FF), 0xDC00 | (n & 0x3FF))
+
+
+def _contains_non_finite_float(data: Any) -> bool:
+    """
+    数据中是否有NaN/Infinity, orjson会将其序列化为null
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_contains_non_finite_float(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_contains_non_finite_float(v) for v in data)
+    return False
+
+
+class JSONCodec:
+    """
+    标准库实现, 输出与原有的json.dumps完全一致
+    """
+
+    name = "json"
+
+    def dumps(self, data: Any, sort_keys: bool = False) -> str:
+        """
+        紧凑且仅包含ASCII字符的JSON, 用于DB存储、缓存Key等
+        """
+        return json.dumps(data, separators=(",", ":"), sort_keys=sort_keys)
+
+    def dumps_bytes(self, data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        紧凑的UTF-8编码的JSON, 用于接口响应, 与DRF的STRICT_JSON一致, 不允许NaN/Infinity
+        """
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=default).encode(
+            "utf-8"
+        )
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return json.loads(s)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    orjson实现, 遇到orjson不支持的数据时回退到标准库
+    """
+
+    name = "orjson"
+
+    # datetime等类型交给default处理, 与标准库及DRF的格式保持一致(如UTC时间为Z结尾)
+    OPTION = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+    @staticmethod
+    def _need_fallback(data: Any, ret: bytes) -> bool:
+        """
+        orjson的输出与标准库不一致时需要回退: 科学计数法的浮点数, 以及被序列化为null的NaN/Infinity
+        """
+        return bool(_EXPONENT_FLOAT.search(ret)) or (b"null" in ret and _contains_non_finite_float(data))
+
+    def dumps(self, data: Any, sort_keys: bool = False) -> str:
+        option = self.OPTION | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            ret = orjson.dumps(data, option=option)
+        except TypeError:
+            # 如超过64位的整数, 或标准库不支持的datetime等类型
+            return super().dumps(data, sort_keys)
+
+        if self._need_fallback(data, ret):
+            return super().dumps(data, sort_keys)
+
+        s = ret.decode("utf-8")
+        # orjson不支持ensure_ascii, 需要转义非ASCII字符, 与标准库输出保持一致, 避免写入utf8字符集的DB字段时出错
+        if not _ESCAPE_NON_ASCII.search(s):
+            return s
+        return _ESCAPE_NON_ASCII.sub(_escape_non_ascii, s)
+
+    def dumps_bytes(self, data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        try:
+            ret = orjson.dumps(data, default=default, option=self.OPTION)
+        except TypeError:
+            return super().dumps_bytes(data, default)
+
+        # NaN/Infinity回退到标准库时会抛出ValueError
+        if self._need_fallback(data, ret):
+            return super().dumps_bytes(data, default)
+        return ret
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # 如标准库允许的NaN/Infinity
+            return super().loads(s)
+
+
+def _get_codec() -> JSONCodec:
+    """
+    默认使用标准库, 通过settings.JSON_CODEC显式开启orjson
+    """
+    if orjson is not None and getattr(settings, "JSON_CODEC", JSONCodec.name) == OrjsonCodec.name:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+codec = _get_codec()
+
+
+def json_dumps(data: Any, cls=None, sort_keys: bool = False) -> str:
+    # 自定义JSONEncoder时只能使用标准库
+    if cls is not None:
+        return json.dumps(data, separators=(",", ":"), cls=cls, sort_keys=sort_keys)
+    return codec.dumps(data, sort_keys=sort_keys)
+
+
+def json_loads(s: Union[str, bytes]) -> Any:
+    return codec.loads(s)
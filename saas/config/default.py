@@ -60,6 +60,7 @@ INSTALLED_APPS += (
     "backend.apps.user",
     "backend.apps.model_builder",
     "backend.long_task",
+    "backend.publisher",
     "backend.audit",
     "backend.debug",
 )
@@ -208,6 +209,10 @@ CELERYBEAT_SCHEDULE = {
         "task": "backend.apps.policy.tasks.execute_model_change_event",
         "schedule": crontab(minute="*/30"),  # 每30分钟执行一次
     },
+    "periodic_refresh_approval_process_with_nodes": {
+        "task": "backend.apps.approval.tasks.refresh_approval_process_with_nodes",
+        "schedule": crontab(minute="*/5"),  # 每5分钟执行一次
+    },
 }
 
 # celery settings
@@ -333,6 +338,11 @@ PUB_SUB_REDIS_HOST = os.environ.get("BKAPP_PUB_SUB_REDIS_HOST", "")
 PUB_SUB_REDIS_PORT = os.environ.get("BKAPP_PUB_SUB_REDIS_PORT", "")
 PUB_SUB_REDIS_PASSWORD = os.environ.get("BKAPP_PUB_SUB_REDIS_PASSWORD", "")
 PUB_SUB_REDIS_DB = os.environ.get("BKAPP_PUB_SUB_REDIS_DB", 0)
+# 删除策略消息格式: json/compact, compact需要订阅方支持v2格式(见backend.publisher.codec)
+PUB_SUB_MESSAGE_FORMAT = os.environ.get("BKAPP_PUB_SUB_MESSAGE_FORMAT", "json")
+
+# JSON编解码实现: json/orjson, 默认使用标准库, orjson需要显式开启(见backend.util.json)
+JSON_CODEC = os.environ.get("BKAPP_JSON_CODEC", "json")
 
 # 前端页面功能开关
 ENABLE_FRONT_END_FEATURES = {
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+
+from backend.apps.organization.closure import DepartmentClosure
+from backend.apps.organization.models import Department
+
+
+class TestDepartmentClosure(TestCase):
+    def setUp(self):
+        # 1 -> 2 -> 3, 1 -> 4
+        parents = {1: None, 2: 1, 3: 2, 4: 1, 5: None}
+        names = {1: "总公司", 2: "子公司", 3: "分公司", 4: "子公司2", 5: "其他"}
+        self.closure = DepartmentClosure(parents, names)
+
+    def test_get_ancestor_ids(self):
+        self.assertEqual(self.closure.get_ancestor_ids(3), [1, 2])
+        self.assertEqual(self.closure.get_ancestor_ids(1), [])
+        # 不存在的部门
+        self.assertEqual(self.closure.get_ancestor_ids(100), [])
+
+    def test_get_path_names(self):
+        self.assertEqual(self.closure.get_path_names(3), ["总公司", "子公司", "分公司"])
+
+    def test_list_self_and_ancestor_ids(self):
+        self.assertEqual(self.closure.list_self_and_ancestor_ids([3, 4]), {1, 2, 3, 4})
+
+    def test_filter_departments_in_scope(self):
+        self.assertEqual(self.closure.filter_departments_in_scope([1, 2, 3, 4, 5], {2}), {2, 3})
+        self.assertEqual(self.closure.filter_departments_in_scope([3, 5], {1}), {3})
+        self.assertEqual(self.closure.filter_departments_in_scope([3, 5], set()), set())
+
+    def test_not_exists_department_in_scope(self):
+        # 不存在的部门即使ID在范围内也不满足
+        self.assertFalse(self.closure.is_department_in_scope(100, {100}))
+        self.assertEqual(self.closure.filter_departments_in_scope([2, 100], {2, 100}), {2})
+
+    @mock.patch("backend.apps.organization.closure.get_category_dict", return_value={1: "默认目录1"})
+    def test_get_category_name(self, mock_get_category_dict):
+        self.assertEqual(self.closure.get_category_name(1), "默认目录1")
+        self.assertEqual(self.closure.get_category_name(2), "默认目录")
+        # 目录映射只加载一次
+        mock_get_category_dict.assert_called_once()
+
+    def test_cycle(self):
+        closure = DepartmentClosure({1: 2, 2: 1}, {})
+        self.assertEqual(closure.get_ancestor_ids(1), [2])
+        self.assertFalse(closure.is_department_in_scope(1, {3}))
+
+    def test_fallback_to_mptt(self):
+        # 同步后闭包还未重建, 新部门不在闭包中
+        root = Department.objects.create(id=10, name="新公司", order=1, ancestors="[]")
+        child = Department.objects.create(id=11, name="新部门", parent=root, order=1, ancestors="[]")
+
+        self.assertEqual(self.closure.get_ancestor_ids(child.id), [root.id])
+        self.assertEqual(self.closure.get_path_names(child.id), ["新公司", "新部门"])
+        self.assertEqual(self.closure.list_self_and_ancestor_ids([child.id, 3]), {1, 2, 3, 10, 11})
+        self.assertEqual(self.closure.filter_departments_in_scope([child.id, 3], {root.id}), {child.id})
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+
+from backend.apps.organization.search import NGramIndex
+
+
+class TestNGramIndex(TestCase):
+    def setUp(self):
+        self.index = NGramIndex()
+        self.index.add(1, ["admin", "管理员"])
+        self.index.add(2, ["administrator", "超级管理员"])
+        self.index.add(3, ["badmin", "张三"])
+        self.index.add(4, ["lisi", "李四"])
+
+    def test_rank(self):
+        count, docs = self.index.search("admin", 10)
+        self.assertEqual(count, 3)
+        # 完全匹配 > 前缀匹配 > 包含匹配
+        self.assertEqual(docs, [1, 2, 3])
+
+    def test_limit(self):
+        count, docs = self.index.search("admin", 2)
+        self.assertEqual(count, 3)
+        self.assertEqual(docs, [1, 2])
+
+    def test_case_insensitive(self):
+        count, docs = self.index.search(" ADMIN ", 10)
+        self.assertEqual(count, 3)
+
+    def test_single_char(self):
+        # 单个字符匹配字段的任意位置, 前缀匹配排在前面
+        self.assertEqual(self.index.search("李", 10), (1, [4]))
+        self.assertEqual(self.index.search("四", 10), (1, [4]))
+        self.assertEqual(self.index.search("b", 10), (1, [3]))
+
+    def test_update_in_place(self):
+        self.index.add(5, ["zhangsan", "张三"], key=3)
+        count, docs = self.index.search("admin", 10)
+        self.assertEqual(docs, [1, 2])
+        count, docs = self.index.search("张三", 10)
+        self.assertEqual(docs, [5])
+        self.assertEqual(len(self.index), 4)
+
+    def test_chinese(self):
+        count, docs = self.index.search("管理员", 10)
+        self.assertEqual(docs, [1, 2])
+
+    def test_exact(self):
+        count, docs = self.index.search("admin", 10, is_exact=True)
+        self.assertEqual(docs, [1])
+
+    def test_fuzzy(self):
+        # 没有子串匹配时, 容错匹配字段前缀, 编辑距离小的排在前面
+        self.assertEqual(self.index.search("admni", 10), (2, [1, 2]))
+        self.assertEqual(self.index.search("adminstrator", 10), (1, [2]))
+        self.assertEqual(self.index.search("lisj", 10), (1, [4]))
+        # 有子串匹配时不进行容错匹配
+        self.assertEqual(self.index.search("dmin", 10), (3, [1, 3, 2]))
+        # 精确匹配与过短的关键字不进行容错匹配
+        self.assertEqual(self.index.search("admni", 10, is_exact=True), (0, []))
+        self.assertEqual(self.index.search("lsi", 10), (0, []))
+
+    def test_not_found(self):
+        self.assertEqual(self.index.search("xyz", 10), (0, []))
+        self.assertEqual(self.index.search("", 10), (0, []))
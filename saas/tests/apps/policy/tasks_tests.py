@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.action.models import ActionRelatedObject
+from backend.apps.policy import tasks
+from backend.apps.policy.models import Policy
+from backend.apps.role.models import RoleScope
+from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthorized
+from backend.util.json import json_loads
+
+
+class BatchDeleteTests(TestCase):
+    @mock.patch.object(tasks, "MODEL_CHANGE_EVENT_BATCH_SIZE", 2)
+    def test_batch_delete(self):
+        for action_id in ["view", "view", "view", "view", "view", "edit"]:
+            G(
+                Policy,
+                subject_type="user",
+                subject_id="admin",
+                system_id="bk_job",
+                action_id=action_id,
+                _resources="[]",
+            )
+
+        tasks._batch_delete(Policy.objects.filter(system_id="bk_job", action_id="view"))
+
+        self.assertEqual(list(Policy.objects.values_list("action_id", flat=True)), ["edit"])
+
+
+class DeleteActionFromPermTemplateTests(TestCase):
+    @mock.patch.object(tasks, "MODEL_CHANGE_EVENT_BATCH_SIZE", 1)
+    def test_delete_action_from_perm_template(self):
+        template = G(PermTemplate, system_id="bk_job", _action_ids='["view", "edit"]')
+        other = G(PermTemplate, system_id="bk_job", _action_ids='["view_host"]')
+        ActionRelatedObject.objects.reset_template_actions(template.id, "bk_job", ["view", "edit"])
+        ActionRelatedObject.objects.reset_template_actions(other.id, "bk_job", ["view_host"])
+        for subject_id in ["1", "2"]:
+            G(
+                PermTemplatePolicyAuthorized,
+                template_id=template.id,
+                subject_type="group",
+                subject_id=subject_id,
+                system_id="bk_job",
+                _data='{"actions": [{"id": "view"}, {"id": "edit"}]}',
+            )
+
+        tasks._delete_action_from_perm_template("bk_job", "view")
+
+        self.assertEqual(PermTemplate.objects.get(id=template.id).action_ids, ["edit"])
+        self.assertEqual(PermTemplate.objects.get(id=other.id).action_ids, ["view_host"])
+        for authorized in PermTemplatePolicyAuthorized.objects.filter(template_id=template.id):
+            self.assertEqual(authorized.data, {"actions": [{"id": "edit"}]})
+        self.assertEqual(ActionRelatedObject.objects.list_template_ids("bk_job", "view"), [])
+        self.assertEqual(ActionRelatedObject.objects.list_template_ids("bk_job", "edit"), [template.id])
+
+
+class DeleteActionFromRoleScopeTests(TestCase):
+    @mock.patch.object(tasks, "role_scope_cache", mock.Mock())
+    def test_delete_action_from_role_scope(self):
+        content = '[{"system_id": "bk_job", "actions": [{"id": "view"}, {"id": "edit"}]}]'
+        G(RoleScope, role_id=1001, type="authorization", content=content)
+        G(RoleScope, role_id=1002, type="authorization", content=content)
+        ActionRelatedObject.objects.reset_role_scope_actions(1001, [("bk_job", "view"), ("bk_job", "edit")])
+
+        tasks._delete_action_from_role_scope("bk_job", "view")
+
+        # 只更新引用关系中包含该操作的角色
+        self.assertEqual(
+            json_loads(RoleScope.objects.get(role_id=1001, type="authorization").content),
+            [{"system_id": "bk_job", "actions": [{"id": "edit"}]}],
+        )
+        self.assertEqual(RoleScope.objects.get(role_id=1002, type="authorization").content, content)
+        self.assertEqual(ActionRelatedObject.objects.list_role_ids("bk_job", "view"), [])
+
+
+class ExecuteModelChangeEventTests(TestCase):
+    @mock.patch.object(tasks, "ModelChangeEventCheckpoint", mock.Mock())
+    @mock.patch.object(tasks, "delete_action")
+    @mock.patch.object(tasks, "delete_action_policies")
+    @mock.patch.object(tasks, "iam")
+    def test_execute_model_change_event(self, mock_iam, mock_delete_action_policies, mock_delete_action):
+        mock_iam.list_model_change_event.return_value = [
+            {"pk": 1, "type": "action_policy_deleted", "system_id": "bk_job", "model_id": "view"},
+            {"pk": 2, "type": "action_deleted", "system_id": "bk_job", "model_id": "view"},
+            {"pk": 3, "type": "action_policy_deleted", "system_id": "bk_job", "model_id": "edit"},
+            {"pk": 4, "type": "action_deleted", "system_id": "bk_job", "model_id": "edit"},
+            {"pk": 5, "type": "unknown", "system_id": "bk_job", "model_id": "edit"},
+        ]
+
+        def delete_action_policies(system_id, action_id, checkpoint):
+            if action_id == "edit":
+                raise Exception("fail")
+
+        # 操作edit的策略删除失败, 不继续删除edit, 也不影响view
+        mock_delete_action_policies.side_effect = delete_action_policies
+
+        tasks.execute_model_change_event()
+
+        mock_delete_action.assert_called_once_with("bk_job", "view")
+        self.assertEqual([c[0][0] for c in mock_iam.update_model_change_event.call_args_list], [1, 2])
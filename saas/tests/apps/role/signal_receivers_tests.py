@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.action.models import ActionRelatedObject
+from backend.apps.role.models import Role
+
+
+class DeleteRoleScopeActionsTests(TestCase):
+    def test_delete_role(self):
+        role = G(Role, type="rating_manager")
+        other = G(Role, type="rating_manager")
+        ActionRelatedObject.objects.reset_role_scope_actions(role.id, [("bk_job", "view")])
+        ActionRelatedObject.objects.reset_role_scope_actions(other.id, [("bk_job", "view")])
+
+        Role.objects.filter(id=role.id).delete()
+
+        # 删除角色时同时删除其操作引用关系
+        self.assertEqual(ActionRelatedObject.objects.list_role_ids("bk_job", "view"), [other.id])
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+from django.urls import Resolver404, resolve
+
+# 直接解析subject的路由, 避免被根路由的前端页面兜底路由匹配
+SUBJECT_URLCONF = "backend.apps.subject.urls"
+
+
+class SubjectUrlsTests(TestCase):
+    def test_list_subjects_policy_system(self):
+        match = resolve("/api/v1/subjects/user/systems/")
+        self.assertEqual(match.url_name, "subject.list_subjects_policy_system")
+        self.assertEqual(match.kwargs, {"subject_type": "user"})
+
+        match = resolve("/api/v1/subjects/department/systems/")
+        self.assertEqual(match.kwargs, {"subject_type": "department"})
+
+    def test_subject_id_systems(self):
+        # ID为systems的Subject不会被批量查询的路由匹配
+        match = resolve("/api/v1/subjects/user/systems/systems/")
+        self.assertEqual(match.url_name, "subject.list_policy_system")
+        self.assertEqual(match.kwargs, {"subject_type": "user", "subject_id": "systems"})
+
+    def test_invalid_subject_type(self):
+        with self.assertRaises(Resolver404):
+            resolve("/group/systems/", urlconf=SUBJECT_URLCONF)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.application.models import Application
+from backend.biz.application import ApplicationBiz
+from backend.service.constants import ApplicationStatus
+
+
+class ApplicationBizHandleResultTests(TestCase):
+    def test_handle_application_result_idempotent(self):
+        application = G(Application, status=ApplicationStatus.PENDING.value, _data="{}")
+        # 模拟审批回调与周期补偿任务各自加载了同一张单据
+        another = Application.objects.get(id=application.id)
+
+        biz = ApplicationBiz()
+        with mock.patch.object(biz.approved_pass_biz, "handle") as handle:
+            biz.handle_application_result(application, ApplicationStatus.PASS.value)
+            biz.handle_application_result(another, ApplicationStatus.PASS.value)
+
+        self.assertEqual(handle.call_count, 1)
+        self.assertEqual(Application.objects.get(id=application.id).status, ApplicationStatus.PASS.value)
+
+    def test_query_application_approval_status_in_chunks(self):
+        applications = [Application(id=i, sn=f"sn{i}") for i in range(1, 151)]
+
+        biz = ApplicationBiz()
+        with mock.patch.object(biz.svc, "query_ticket_approval_status", return_value=[]) as query:
+            biz.query_application_approval_status(applications)
+
+        self.assertEqual(query.call_count, 2)
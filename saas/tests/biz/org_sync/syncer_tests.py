@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.organization.constants import SyncTaskLockKey
+from backend.apps.organization.models import User
+from backend.biz.org_sync.syncer import Syncer
+
+USER_INFO = {"id": 1000, "username": "test_user", "display_name": "", "staff_status": "IN", "category_id": 1}
+
+
+def user_lock_key(username: str) -> str:
+    return f"{SyncTaskLockKey.SingleUser.value}:{username}"
+
+
+@mock.patch("backend.biz.org_sync.syncer.organization_search_index_cache", mock.Mock())
+@mock.patch("backend.biz.org_sync.syncer.usermgr.retrieve_user", mock.Mock(return_value=USER_INFO))
+class SyncSingleUserTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch("backend.biz.org_sync.syncer.cache.lock")
+        self.mock_lock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("backend.biz.org_sync.syncer.iam.create_subjects")
+    def test_acquire_lock(self, mock_create_subjects):
+        Syncer().sync_single_user("test_user")
+
+        # 按用户名加锁, 且等待锁有超时
+        self.mock_lock.assert_called_once_with(user_lock_key("test_user"), timeout=10, blocking_timeout=5)
+        self.assertTrue(User.objects.filter(username="test_user").exists())
+        mock_create_subjects.assert_called_once_with([{"type": "user", "id": "test_user", "name": "test_user"}])
+        self.mock_lock.return_value.__exit__.assert_called_once()
+
+    @mock.patch("backend.biz.org_sync.syncer.iam.create_subjects")
+    def test_contention(self, mock_create_subjects):
+        def lock(*args, **kwargs):
+            # 等待锁期间, 持有锁的并发请求已创建了用户
+            G(User, id=USER_INFO["id"], username="test_user", display_name="test_user")
+            return mock.MagicMock()
+
+        self.mock_lock.side_effect = lock
+
+        Syncer().sync_single_user("test_user")
+
+        mock_create_subjects.assert_not_called()
+        self.assertEqual(User.objects.filter(username="test_user").count(), 1)
+
+    @mock.patch("backend.biz.org_sync.syncer.iam.create_subjects", side_effect=Exception("backend error"))
+    def test_release_on_exception(self, mock_create_subjects):
+        with self.assertRaises(Exception):
+            Syncer().sync_single_user("test_user")
+
+        self.mock_lock.return_value.__exit__.assert_called_once()
+
+
+@mock.patch("backend.biz.org_sync.syncer.organization_search_index_cache", mock.Mock())
+class SyncMultiUsersTests(TestCase):
+    @mock.patch("backend.biz.org_sync.syncer.iam.create_subjects")
+    @mock.patch("backend.biz.org_sync.syncer.usermgr.list_user_by_usernames")
+    @mock.patch("backend.biz.org_sync.syncer.cache.lock")
+    def test_lock_per_user(self, mock_lock, mock_list_user, mock_create_subjects):
+        mock_list_user.return_value = [
+            dict(USER_INFO, id=1002, username="user_b"),
+            dict(USER_INFO, id=1001, username="user_a"),
+        ]
+
+        not_found = Syncer().sync_multi_users(["user_b", "user_a", "user_c"])
+
+        self.assertEqual(not_found, ["user_c"])
+        # 按用户名排序逐个加锁
+        self.assertEqual(
+            [c[0][0] for c in mock_lock.call_args_list], [user_lock_key("user_a"), user_lock_key("user_b")]
+        )
+        self.assertEqual(User.objects.filter(username__in=["user_a", "user_b"]).count(), 2)
+        mock_create_subjects.assert_called_once()
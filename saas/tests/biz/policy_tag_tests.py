@@ -80,6 +80,27 @@ class CompareAndTagInstanceTests(TestCase):
         self.assertEqual(diff_instance.path[1][-1].tag, "unchanged")
         self.assertEqual(diff_instance.path[2][-1].tag, "delete")
 
+    def test_compare_and_tag_instance_many_paths(self):
+        new_instance = self.instance_factory.new(
+            "type",
+            "name",
+            [[{"type": "type", "type_name": "name", "id": f"id{i}", "name": f"name{i}"}] for i in range(500, 2000)],
+        )
+        old_instance = self.instance_factory.new(
+            "type",
+            "name",
+            [[{"type": "type", "type_name": "name", "id": f"id{i}", "name": f"name{i}"}] for i in range(1000)],
+        )
+
+        diff_instance = InstanceTagBean(**new_instance.dict()).compare_and_tag(InstanceTagBean(**old_instance.dict()))
+
+        tags = [p[-1].tag for p in diff_instance.path]
+        self.assertEqual(len(tags), 2000)
+        self.assertEqual(tags[:500], ["unchanged"] * 500)
+        self.assertEqual(tags[500:1500], ["add"] * 1000)
+        self.assertEqual(tags[1500:], ["delete"] * 500)
+        self.assertEqual(diff_instance.path[-1][-1].id, "id499")
+
 
 class CompareAndTagConditionTests(TestCase):
     def setUp(self):
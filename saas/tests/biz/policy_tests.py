@@ -20,9 +20,11 @@ from backend.biz.policy import (
     PolicyBean,
     PolicyBeanList,
     PolicyEmptyException,
+    PolicyQueryBiz,
     RelatedResourceBean,
 )
 from backend.common.error_codes import CodeException
+from backend.service.models import Subject
 from backend.service.models.instance_selection import ChainNode, InstanceSelection
 from backend.service.models.resource_type import ResourceTypeDict
 from backend.service.policy.query import Attribute
@@ -869,3 +871,19 @@ class InstanceCloneAndFilterTests(TestCase):
         instance = InstanceBean(path=[path], type="host")
         new_instance = instance.clone_and_filter_by_instance_selections("bk_cmdb", "host", selections)
         self.assertEqual(new_instance.path, [[PathNodeBean(**one) for one in path]])
+
+
+class PolicyQueryBizPagingTests(TestCase):
+    @mock.patch("backend.biz.policy.new_backend_policy_list_by_subject")
+    def test_paging_fetcher_query_backend_once(self, mock_new_backend_policy_list):
+        subject = Subject(type="user", id="admin")
+        biz = PolicyQueryBiz()
+        fetch = biz.new_paging_fetcher_by_subject("bk_job", subject)
+
+        with mock.patch.object(biz.svc, "list_paging_by_subject", return_value=([], None)) as list_paging:
+            for cursor in [0, 100, 200]:
+                fetch(cursor, 100)
+
+        # 所有分页共用一次查询的后端策略列表
+        mock_new_backend_policy_list.assert_called_once_with("bk_job", subject)
+        list_paging.assert_called_with("bk_job", subject, 200, 100, mock_new_backend_policy_list.return_value)
@@ -8,10 +8,24 @@ Unless required by applicable law or agreed to in writing, software distributed
 an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
+from unittest import mock
+
 from django.test import TestCase
+from django_dynamic_fixture import G
 
+from backend.apps.group.models import Group
+from backend.apps.organization.closure import DepartmentClosure
+from backend.apps.organization.models import DepartmentMember, User
+from backend.apps.role.models import Role, RoleRelatedObject, ScopeSubject
 from backend.biz.policy import InstanceBean
-from backend.biz.role import ActionScopeDiffer
+from backend.biz.role import ActionScopeDiffer, RoleListQuery
+from backend.service.constants import (
+    SUBJECT_ALL,
+    SUBJECT_TYPE_ALL,
+    RoleRelatedObjectType,
+    RoleScopeSubjectType,
+    RoleType,
+)
 
 
 class TestInstanceDiff(TestCase):
@@ -60,3 +74,46 @@ class TestInstanceDiff(TestCase):
         ]
 
         self.assertFalse(ActionScopeDiffer(None, None)._diff_instances(template_instances, scope_instances))
+
+
+@mock.patch(
+    "backend.apps.organization.closure.get_department_closure",
+    mock.Mock(return_value=DepartmentClosure({1: None, 2: 1, 3: None}, {1: "总公司", 2: "子公司", 3: "其他"})),
+)
+class RoleListQueryScopeTests(TestCase):
+    def setUp(self):
+        self.user = G(User, id=1, username="admin")
+        # 用户加入子公司, 其祖先部门为总公司
+        G(DepartmentMember, department_id=2, user_id=self.user.id)
+
+        self.staff = G(Role, type=RoleType.STAFF.value)
+        self.super_manager = G(Role, type=RoleType.SUPER_MANAGER.value)
+        self.department_manager = self._create_rating_manager(RoleScopeSubjectType.DEPARTMENT.value, "1")
+        self.user_manager = self._create_rating_manager(RoleScopeSubjectType.USER.value, "admin")
+        self.all_manager = self._create_rating_manager(SUBJECT_TYPE_ALL, SUBJECT_ALL)
+        # 授权对象范围不包含用户的分级管理员
+        self.other_department_manager = self._create_rating_manager(RoleScopeSubjectType.DEPARTMENT.value, "3")
+        self.other_user_manager = self._create_rating_manager(RoleScopeSubjectType.USER.value, "test")
+
+    @staticmethod
+    def _create_rating_manager(subject_type: str, subject_id: str) -> Role:
+        role = G(Role, type=RoleType.RATING_MANAGER.value)
+        G(ScopeSubject, role_scope_id=role.id, role_id=role.id, subject_type=subject_type, subject_id=subject_id)
+        return role
+
+    def test_list_authorization_scope_include_user_role_ids(self):
+        role_ids = RoleListQuery(self.staff, self.user)._list_authorization_scope_include_user_role_ids()
+        self.assertEqual(
+            set(role_ids),
+            {self.super_manager.id, self.department_manager.id, self.user_manager.id, self.all_manager.id},
+        )
+
+    def test_query_group(self):
+        groups = {}
+        for role in [self.department_manager, self.other_department_manager, self.other_user_manager]:
+            group = G(Group)
+            G(RoleRelatedObject, role_id=role.id, object_type=RoleRelatedObjectType.GROUP.value, object_id=group.id)
+            groups[role.id] = group
+
+        group_ids = set(RoleListQuery(self.staff, self.user).query_group().values_list("id", flat=True))
+        self.assertEqual(group_ids, {groups[self.department_manager.id].id})
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+
+from backend.biz.template import ChainList, ChainNodeList, ChainPrefixMatcher, TemplatePolicyCloneBiz
+from backend.service.models import ChainNode
+
+
+def new_chain(*nodes):
+    return ChainNodeList([ChainNode(system_id=system_id, id=_id) for system_id, _id in nodes])
+
+
+def new_path(*nodes):
+    return [{"system_id": system_id, "type": _type, "id": _id, "name": _id} for system_id, _type, _id in nodes]
+
+
+class ChainPrefixMatcherTests(TestCase):
+    def setUp(self):
+        self.matcher = ChainPrefixMatcher(
+            ChainList(
+                [
+                    new_chain(("bk_cmdb", "biz"), ("bk_cmdb", "set"), ("bk_cmdb", "host")),
+                    new_chain(("bk_cmdb", "biz"), ("bk_job", "script")),
+                ]
+            )
+        )
+
+    def test_match_prefix(self):
+        self.assertTrue(self.matcher.is_match(new_path(("bk_cmdb", "biz", "1"))))
+        self.assertTrue(self.matcher.is_match(new_path(("bk_cmdb", "biz", "1"), ("bk_cmdb", "set", "2"))))
+        self.assertTrue(self.matcher.is_match(new_path(("bk_cmdb", "biz", "1"), ("bk_job", "script", "3"))))
+
+    def test_not_match(self):
+        self.assertFalse(self.matcher.is_match(new_path(("bk_cmdb", "set", "2"))))
+        self.assertFalse(self.matcher.is_match(new_path(("bk_job", "biz", "1"))))
+        self.assertFalse(
+            self.matcher.is_match(
+                new_path(
+                    ("bk_cmdb", "biz", "1"),
+                    ("bk_cmdb", "set", "2"),
+                    ("bk_cmdb", "host", "3"),
+                    ("bk_cmdb", "host", "4"),
+                )
+            )
+        )
+
+    def test_empty_system_id(self):
+        self.assertTrue(self.matcher.is_match(new_path(("", "biz", "1"), ("", "script", "3"))))
+        self.assertFalse(self.matcher.is_match(new_path(("", "biz", "1"), ("", "module", "3"))))
+
+    def test_empty_chain_list(self):
+        self.assertFalse(ChainPrefixMatcher(ChainList([])).is_match(new_path(("bk_cmdb", "biz", "1"))))
+
+
+class ListClonePathsTests(TestCase):
+    def setUp(self):
+        self.biz = TemplatePolicyCloneBiz()
+        self.matcher = ChainPrefixMatcher(ChainList([new_chain(("bk_cmdb", "biz"), ("bk_cmdb", "set"))]))
+        self.source_policy = {
+            "id": "view_set",
+            "related_resource_types": [
+                {
+                    "system_id": "bk_cmdb",
+                    "type": "set",
+                    "condition": [
+                        {
+                            "instances": [
+                                {
+                                    "type": "set",
+                                    "path": [
+                                        new_path(("bk_cmdb", "biz", "1"), ("bk_cmdb", "set", "2")),
+                                        new_path(("bk_cmdb", "biz", "1"), ("bk_cmdb", "set", "2")),
+                                        new_path(("bk_cmdb", "biz", "2")),
+                                        new_path(("bk_cmdb", "host", "3")),
+                                    ],
+                                }
+                            ],
+                            "attributes": [],
+                        }
+                    ],
+                }
+            ],
+        }
+
+    def test_list_clone_paths(self):
+        paths = self.biz._list_clone_paths(self.source_policy, self.matcher, None)
+        self.assertEqual(
+            [[(node.type, node.id) for node in path] for path in paths],
+            [[("biz", "1"), ("set", "2")], [("biz", "2")]],
+        )
+
+    def test_list_clone_paths_with_scope(self):
+        paths = self.biz._list_clone_paths(self.source_policy, self.matcher, [("/biz,1/",)])
+        self.assertEqual([[(node.type, node.id) for node in path] for path in paths], [[("biz", "1"), ("set", "2")]])
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from copy import deepcopy
+
+from django.test import TestCase
+from django.utils import translation
+
+from backend.biz.policy import ConditionBean, InstanceBean, PathNodeBean, PolicyBean, RelatedResourceBean
+from backend.common.i18n import localized_dict
+from backend.common.renderers import handle_tranlate
+
+
+def gen_policy() -> PolicyBean:
+    path = [
+        [PathNodeBean(system_id="bk_cmdb", type="host", id="1", name="host1", type_name="主机", type_name_en="Host")],
+        [PathNodeBean(system_id="bk_cmdb", type="host", id="2", name="host2", type_name="主机", type_name_en="")],
+    ]
+    instance = InstanceBean(type="host", name="主机", name_en="Host", path=path)
+    resource = RelatedResourceBean(
+        system_id="bk_cmdb",
+        type="host",
+        name="主机",
+        name_en="Host",
+        condition=[ConditionBean(id="1", instances=[instance], attributes=[])],
+    )
+    return PolicyBean(id="view_host", name="查看主机", name_en="View Host", related_resource_types=[resource])
+
+
+class LocalizedDictTests(TestCase):
+    def test_same_as_walk(self):
+        policy = gen_policy()
+        for language in ["en", "zh-hans"]:
+            with translation.override(language):
+                expected = handle_tranlate(deepcopy(policy.dict()))
+                self.assertEqual(localized_dict(policy), expected)
+
+    def test_en(self):
+        with translation.override("en"):
+            data = localized_dict(gen_policy())
+
+        self.assertEqual(data["name"], "View Host")
+        self.assertNotIn("name_en", data)
+        instance = data["related_resource_types"][0]["condition"][0]["instances"][0]
+        self.assertEqual(instance["name"], "Host")
+        self.assertEqual(instance["path"][0][0]["type_name"], "Host")
+        # 英文为空时保留原值
+        self.assertEqual(instance["path"][1][0]["type_name"], "主机")
+        self.assertNotIn("type_name_en", instance["path"][1][0])
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.organization.models import Department
+from backend.apps.template.models import PermTemplate
+
+
+class LazyJSONFieldTests(TestCase):
+    def setUp(self):
+        self.template = G(PermTemplate, system_id="bk_cmdb", _action_ids='["view_host", "edit_host"]')
+
+    def test_parse_once(self):
+        template = PermTemplate.objects.get(id=self.template.id)
+
+        action_ids = template.action_ids
+        self.assertEqual(action_ids, ["view_host", "edit_host"])
+        self.assertIs(template.action_ids, action_ids)
+
+        # 原始文本变更后重新解析
+        template._action_ids = '["view_host"]'
+        self.assertEqual(template.action_ids, ["view_host"])
+
+    def test_setter(self):
+        template = PermTemplate(system_id="bk_cmdb", action_ids=["view_host"])
+
+        self.assertEqual(template._action_ids, '["view_host"]')
+        self.assertEqual(template.action_ids, ["view_host"])
+
+    def test_save_mutation(self):
+        template = PermTemplate.objects.get(id=self.template.id)
+        template.action_ids.remove("edit_host")
+        template.save()
+
+        self.assertEqual(PermTemplate.objects.get(id=self.template.id).action_ids, ["view_host"])
+
+    def test_save_without_mutation(self):
+        template = PermTemplate.objects.get(id=self.template.id)
+        self.assertEqual(len(template.action_ids), 2)
+        template.save()
+
+        # 未修改时保持原始文本不变
+        self.assertEqual(PermTemplate.objects.get(id=self.template.id)._action_ids, '["view_host", "edit_host"]')
+
+    def test_deferred(self):
+        template = PermTemplate.objects.only("id").get(id=self.template.id)
+
+        self.assertEqual(template.action_ids, ["view_host", "edit_host"])
+
+    def test_default(self):
+        self.assertEqual(Department(id=1, name="test", ancestors="").parse_ancestors(), [])
+        self.assertEqual(Department(id=1, name="test", ancestors="invalid").parse_ancestors(), [])
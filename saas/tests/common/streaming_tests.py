@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import json
+
+from django.test import TestCase
+
+from backend.common.error_codes import error_codes
+from backend.common.streaming import CursorPager, JSONStreamingResponse
+
+
+def gen_fetch(data, calls):
+    def fetch(cursor, size):
+        calls.append((cursor, size))
+        items = [one for one in data if one > cursor][: size + 1]
+        next_cursor = items[size - 1] if len(items) > size else None
+        return items[:size], next_cursor
+
+    return fetch
+
+
+class CursorPagerTests(TestCase):
+    def test_iter_all(self):
+        calls = []
+        pager = CursorPager(gen_fetch(list(range(1, 11)), calls), batch_size=3)
+
+        self.assertEqual(list(pager), list(range(1, 11)))
+        self.assertEqual(calls, [(0, 3), (3, 3), (6, 3), (9, 3)])
+        self.assertIsNone(pager.next_cursor)
+
+    def test_iter_limit(self):
+        calls = []
+        pager = CursorPager(gen_fetch(list(range(1, 11)), calls), cursor=2, limit=5, batch_size=3)
+
+        self.assertEqual(list(pager), [3, 4, 5, 6, 7])
+        self.assertEqual(calls, [(2, 3), (5, 2)])
+        self.assertEqual(pager.next_cursor, 7)
+
+
+class JSONStreamingResponseTests(TestCase):
+    def test_content(self):
+        pager = CursorPager(gen_fetch([1, 2, 3], []), batch_size=2)
+        response = JSONStreamingResponse(({"id": i} for i in pager), get_extra=lambda: {"next_cursor": None})
+
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            data,
+            {
+                "result": True,
+                "code": 0,
+                "message": "OK",
+                "data": {"results": [{"id": 1}, {"id": 2}, {"id": 3}], "next_cursor": None},
+            },
+        )
+
+    def test_empty(self):
+        response = JSONStreamingResponse([])
+
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["data"], {"results": []})
+
+    def test_error_before_first_chunk(self):
+        def fetch(cursor, size):
+            raise error_codes.IAM_REQUEST_ERROR
+
+        # 第一条数据出错时在返回响应前抛出, 由异常处理返回错误
+        with self.assertRaises(type(error_codes.IAM_REQUEST_ERROR)):
+            JSONStreamingResponse(CursorPager(fetch))
+
+    def test_error_terminator(self):
+        def results():
+            yield {"id": 1}
+            raise error_codes.IAM_REQUEST_ERROR
+
+        response = JSONStreamingResponse(results(), get_extra=lambda: {"next_cursor": 1})
+
+        # 中途出错时仍输出完整的JSON, 且result为false
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertFalse(data["result"])
+        self.assertEqual(data["code"], error_codes.IAM_REQUEST_ERROR.code)
+        self.assertEqual(data["data"], {"results": [{"id": 1}]})
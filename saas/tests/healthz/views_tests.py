@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import threading
+
+import mock
+from django.test import TestCase
+
+from backend.healthz.views import HEALTHZ_CHECK_NAMES, HealthChecker, HealthCheckProbe, check_all
+
+
+class HealthCheckerTests(TestCase):
+    def _patch_checks(self, **results):
+        patchers = []
+        for name in HEALTHZ_CHECK_NAMES:
+            patcher = mock.patch.object(HealthChecker, name, return_value=results.get(name, (True, "ok")))
+            patcher.start()
+            patchers.append(patcher)
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _new_probes(ttl=60):
+        return {name: HealthCheckProbe(name, ttl) for name in HEALTHZ_CHECK_NAMES}
+
+    def test_check_all_ok(self):
+        self._patch_checks()
+        report = check_all(self._new_probes())
+
+        self.assertTrue(report["ok"])
+        self.assertEqual(set(report["checks"].keys()), set(HEALTHZ_CHECK_NAMES))
+        self.assertIn("latency_ms", report["checks"]["mysql"])
+
+    def test_check_all_report_every_failure(self):
+        self._patch_checks(mysql=(False, "mysql fail"), iam=(False, "iam fail"))
+        report = check_all(self._new_probes())
+
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["checks"]["mysql"]["message"], "mysql fail")
+        self.assertEqual(report["checks"]["iam"]["message"], "iam fail")
+        self.assertTrue(report["checks"]["redis"]["ok"])
+
+    def test_probe_cache(self):
+        probe = HealthCheckProbe("mysql", ttl=60)
+        with mock.patch.object(HealthChecker, "mysql", return_value=(True, "ok")) as m:
+            probe.submit().result()
+            probe.submit().result()
+
+        self.assertEqual(m.call_count, 1)
+
+    def test_hung_probe_not_resubmitted(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def hang():
+            release.wait()
+            return True, "ok"
+
+        self._patch_checks()
+        probes = self._new_probes(ttl=0)
+        with mock.patch("backend.healthz.views.HEALTHZ_CHECK_TIMEOUT", 0.1), mock.patch.object(
+            HealthChecker, "iam", side_effect=hang
+        ) as m:
+            report = check_all(probes)
+            self.assertFalse(report["checks"]["iam"]["ok"])
+            # 其他依赖不受卡住的依赖影响
+            self.assertTrue(report["checks"]["mysql"]["ok"])
+
+            check_all(probes)
+            self.assertEqual(m.call_count, 1)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+
+from backend.long_task.constants import TaskStatus
+from backend.long_task.models import TaskDetail
+from backend.long_task.progress import calculate_progress, percentile
+from backend.util.json import json_dumps
+
+
+class TestPercentile(TestCase):
+    def test_empty(self):
+        self.assertEqual(percentile([], 95), 0)
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 100), 100)
+
+    def test_single(self):
+        self.assertEqual(percentile([0.3], 50), 0.3)
+
+
+class TestCalculateProgress(TestCase):
+    def test_finished_task(self):
+        results = [
+            {"index": 0, "status": TaskStatus.SUCCESS.value, "exception": "", "duration": 1, "retry_count": 0},
+            {"index": 1, "status": TaskStatus.FAILURE.value, "exception": "err", "duration": 3, "retry_count": 2},
+            # 历史任务结果中没有耗时与重试次数
+            {"index": 2, "status": TaskStatus.SUCCESS.value, "exception": ""},
+        ]
+        task = TaskDetail(
+            id=1,
+            type="template_update",
+            status=TaskStatus.SUCCESS.value,
+            _params=json_dumps([1, 2, 3]),
+            _results=json_dumps(results),
+        )
+
+        progress = calculate_progress(task)
+
+        self.assertEqual(progress.total, 3)
+        self.assertEqual(progress.finished, 3)
+        self.assertEqual(progress.success, 2)
+        self.assertEqual(progress.failure, 1)
+        self.assertEqual(progress.retry_count, 2)
+        self.assertEqual(progress.elapsed, 4)
+        self.assertEqual(progress.items_per_second, 0.75)
+        self.assertEqual(progress.latency_p50, 1)
+        self.assertEqual(progress.latency_p95, 3)
+        self.assertEqual(progress.eta, 0)
+
+    def test_pending_task(self):
+        task = TaskDetail(id=1, type="template_update", status=TaskStatus.PENDING.value)
+
+        progress = calculate_progress(task)
+
+        self.assertEqual(progress.total, 0)
+        self.assertEqual(progress.finished, 0)
+        self.assertIsNone(progress.eta)
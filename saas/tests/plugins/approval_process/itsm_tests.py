@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import time
+
+import mock
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+
+from backend.apps.approval.tasks import refresh_approval_process_with_nodes
+from backend.plugins.approval_process.itsm import (
+    PROCESS_WITH_NODES_CACHE_KEY,
+    PROCESS_WITH_NODES_REFRESH_LOCK_KEY,
+    ITSMApprovalProcessProvider,
+)
+from backend.service.constants import ApplicationTypeEnum
+from tests.test_util.helpers import generate_random_string
+
+PROCESSES = [{"id": 1, "name": "默认审批流程"}, {"id": 2, "name": "用户组审批流程"}]
+NODES = [{"id": 1, "name": "提单", "processors_type": "OTHER", "processors": "CREATOR"}]
+
+
+class ITSMApprovalProcessProviderTests(TestCase):
+    def setUp(self):
+        # LocMemCache按名称共享存储, 每个用例使用独立的名称避免互相影响
+        self.cache = LocMemCache(generate_random_string(), {})
+        for target in ["backend.plugins.approval_process.itsm.cache", "backend.apps.approval.tasks.cache"]:
+            patcher = mock.patch(target, self.cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.provider = ITSMApprovalProcessProvider()
+
+    def test_process_nodes_cached_by_version(self):
+        with mock.patch("backend.component.itsm.list_process", return_value=PROCESSES), mock.patch(
+            "backend.component.itsm.get_process_nodes", return_value=NODES
+        ) as get_process_nodes:
+            self.provider.refresh_list_with_nodes()
+            self.provider.refresh_list_with_nodes()
+        # 流程未变更时不再查询节点
+        self.assertEqual(get_process_nodes.call_count, 2)
+
+        changed_processes = [{"id": 1, "name": "默认审批流程v2"}, PROCESSES[1]]
+        with mock.patch("backend.component.itsm.list_process", return_value=changed_processes), mock.patch(
+            "backend.component.itsm.get_process_nodes", return_value=NODES
+        ) as get_process_nodes:
+            processes = self.provider.refresh_list_with_nodes()
+        # 只有变更的流程需要重新查询节点
+        self.assertEqual(get_process_nodes.call_count, 1)
+        self.assertEqual(processes[0]["name"], "默认审批流程v2")
+
+    def test_list_with_nodes_stale_refresh_in_background(self):
+        with mock.patch("backend.component.itsm.list_process", return_value=PROCESSES), mock.patch(
+            "backend.component.itsm.get_process_nodes", return_value=NODES
+        ):
+            self.provider.refresh_list_with_nodes()
+
+        data = self.cache.get(PROCESS_WITH_NODES_CACHE_KEY)
+        data["refreshed_at"] = time.time() - 3600
+        self.cache.set(PROCESS_WITH_NODES_CACHE_KEY, data)
+
+        with mock.patch("backend.component.itsm.list_process") as list_process, mock.patch(
+            "backend.apps.approval.tasks.refresh_approval_process_with_nodes.delay"
+        ) as delay:
+            processes = self.provider.list_with_nodes(ApplicationTypeEnum.GRANT_ACTION.value)
+            self.provider.list_with_nodes(ApplicationTypeEnum.GRANT_ACTION.value)
+
+        # 返回旧数据，不同步查询ITSM，且只触发一次后台刷新
+        self.assertEqual(len(processes), 2)
+        list_process.assert_not_called()
+        self.assertEqual(delay.call_count, 1)
+
+    def test_list_with_nodes_cold_cache_not_block(self):
+        with mock.patch("backend.component.itsm.list_process") as list_process, mock.patch(
+            "backend.apps.approval.tasks.refresh_approval_process_with_nodes.delay"
+        ) as delay:
+            processes = self.provider.list_with_nodes(ApplicationTypeEnum.GRANT_ACTION.value)
+
+        # 缓存不存在时不同步查询ITSM，只触发后台刷新
+        self.assertEqual(processes, [])
+        list_process.assert_not_called()
+        self.assertEqual(delay.call_count, 1)
+
+    def test_refresh_task_release_lock(self):
+        self.cache.add(PROCESS_WITH_NODES_REFRESH_LOCK_KEY, 1)
+        with mock.patch("backend.component.itsm.list_process", side_effect=Exception("itsm error")):
+            refresh_approval_process_with_nodes()
+
+        # 刷新失败也会释放锁，下次请求可以重新触发刷新
+        self.assertIsNone(self.cache.get(PROCESS_WITH_NODES_REFRESH_LOCK_KEY))
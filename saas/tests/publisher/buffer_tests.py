@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+
+from backend.publisher import shortcut
+from backend.publisher.buffer import DeletePolicyPublishBuffer, buffered_publish
+from backend.publisher.constants import DELETE_POLICY_MESSAGE_MAX_ITEMS, DeletePolicyTypeEnum
+
+
+class DeletePolicyPublishBufferTests(TestCase):
+    def test_pop_messages_coalesce_by_type(self):
+        buffer = DeletePolicyPublishBuffer()
+        buffer.add(DeletePolicyTypeEnum.POLICY.value, {"policy_ids": [1, 2]})
+        buffer.add(DeletePolicyTypeEnum.SUBJECT.value, {"subjects": [{"type": "user", "id": "admin"}]})
+        buffer.add(DeletePolicyTypeEnum.POLICY.value, {"policy_ids": [3]})
+
+        messages = buffer.pop_messages()
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0]["type"], DeletePolicyTypeEnum.POLICY.value)
+        self.assertEqual(messages[0]["data"], {"policy_ids": [1, 2, 3]})
+        self.assertEqual(messages[1]["data"], {"subjects": [{"type": "user", "id": "admin"}]})
+        # 缓冲区已清空
+        self.assertEqual(buffer.pop_messages(), [])
+
+    def test_pop_messages_split_large_message(self):
+        buffer = DeletePolicyPublishBuffer()
+        buffer.add(DeletePolicyTypeEnum.POLICY.value, {"policy_ids": list(range(DELETE_POLICY_MESSAGE_MAX_ITEMS + 1))})
+
+        messages = buffer.pop_messages()
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(len(messages[1]["data"]["policy_ids"]), 1)
+
+    def test_buffered_publish(self):
+        with mock.patch("backend.publisher.tasks.send_delete_policies_messages") as send:
+            with buffered_publish():
+                shortcut.publish_delete_policies_by_id([1])
+                # 嵌套时由最外层统一发布
+                with buffered_publish():
+                    shortcut.publish_delete_policies_by_id([2])
+                send.assert_not_called()
+
+        send.assert_called_once()
+        messages = send.call_args[0][0]
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]["data"], {"policy_ids": [1, 2]})
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+from django.test import TestCase
+
+from backend.publisher.codec import decode_message, decode_varint, encode_message, encode_varint
+from backend.publisher.constants import DeletePolicyTypeEnum
+from backend.util.json import json_dumps
+
+
+class CodecTests(TestCase):
+    def test_varint(self):
+        for value in [0, 1, 127, 128, 300, 2 ** 32, 2 ** 63]:
+            raw = encode_varint(value)
+            self.assertEqual(decode_varint(raw, 0), (value, len(raw)))
+
+        with self.assertRaises(ValueError):
+            encode_varint(-1)
+
+    def test_policy_message(self):
+        message = {
+            "timestamp": 1633000000,
+            "type": DeletePolicyTypeEnum.POLICY.value,
+            "data": {"policy_ids": list(range(100000, 110000))},
+        }
+        raw = encode_message(message)
+
+        self.assertEqual(decode_message(raw), message)
+        # 连续的ID每个只占1字节
+        self.assertLess(len(raw), len(json_dumps(message)) / 5)
+
+    def test_policy_message_sorted_and_dedup(self):
+        message = {"timestamp": 1, "type": DeletePolicyTypeEnum.POLICY.value, "data": {"policy_ids": [5, 3, 5, 1]}}
+
+        decoded = decode_message(encode_message(message))
+
+        self.assertEqual(decoded["data"], {"policy_ids": [1, 3, 5]})
+
+    def test_subject_message(self):
+        message = {
+            "timestamp": 1,
+            "type": DeletePolicyTypeEnum.SUBJECT_TEMPLATE.value,
+            "data": {"subject_templates": [{"subject": {"type": "user", "id": "admin"}, "template_id": 1}]},
+        }
+
+        self.assertEqual(decode_message(encode_message(message)), message)
+
+    def test_decode_json_message(self):
+        message = {"timestamp": 1, "type": DeletePolicyTypeEnum.POLICY.value, "data": {"policy_ids": [1]}}
+
+        self.assertEqual(decode_message(json_dumps(message)), message)
+        self.assertEqual(decode_message(json_dumps(message).encode()), message)
+
+    def test_decode_unknown_version(self):
+        with self.assertRaises(ValueError):
+            decode_message(b"\x09\x01\x01")
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+
+from backend.publisher.metrics import DeletePolicyMessageCollector, incr_delete_policy_messages
+from backend.util.cache import redis_region
+from tests.test_util.helpers import fake_redis_client
+
+
+@mock.patch.object(redis_region.backend, "client", new_callable=fake_redis_client)
+class DeletePolicyMessageCollectorTests(TestCase):
+    def test_collect(self, mock_client):
+        # 模拟worker进程中的计数, web进程采集时读取
+        incr_delete_policy_messages("published", 3)
+        incr_delete_policy_messages("published", 2)
+        incr_delete_policy_messages("dropped", 1)
+
+        metric = list(DeletePolicyMessageCollector().collect())[0]
+        values = {s.labels["status"]: s.value for s in metric.samples if s.name.endswith("_total")}
+
+        self.assertEqual(values, {"published": 5, "dropped": 1})
+
+    def test_collect_empty(self, mock_client):
+        metric = list(DeletePolicyMessageCollector().collect())[0]
+        self.assertEqual(metric.samples, [])
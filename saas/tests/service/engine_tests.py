@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+
+from backend.service.engine import MAX_ENGINE_SEARCH_RESOURCE_COUNT, EngineService, PolicyResource
+
+
+class EngineServiceTests(TestCase):
+    def setUp(self):
+        self.svc = EngineService()
+
+    def _gen_policy_resources(self, count: int):
+        resources = [{"system": "bk_job", "type": "script", "id": str(i), "attribute": {}} for i in range(count)]
+        return [PolicyResource(action_id="execute_script", resources=resources)]
+
+    def test_gen_query_data_dedupe(self):
+        resource = {"system": "bk_job", "type": "script", "id": "1", "attribute": {}}
+        policy_resources = [
+            PolicyResource(action_id="execute_script", resources=[resource, dict(resource)]),
+            PolicyResource(action_id="view_script", resources=[]),
+            PolicyResource(action_id="view_script", resources=[]),
+        ]
+        query_data = self.svc._gen_query_data("bk_job", policy_resources, "group", 1000)
+
+        self.assertEqual(len(query_data), 2)
+        self.assertEqual(query_data[0]["resource"], [resource])
+        self.assertEqual(query_data[1]["resource"], [])
+
+    def test_iter_query_subjects_in_chunks(self):
+        policy_resources = self._gen_policy_resources(MAX_ENGINE_SEARCH_RESOURCE_COUNT + 1)
+
+        def batch_query_subjects(data):
+            return {"results": [[{"type": "group", "id": q["resource"][0]["id"]}] for q in data]}
+
+        with mock.patch("backend.service.engine.batch_query_subjects", side_effect=batch_query_subjects) as m:
+            results = list(self.svc.iter_query_subjects_by_policy_resources("bk_job", policy_resources, "group"))
+
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(len(results), MAX_ENGINE_SEARCH_RESOURCE_COUNT + 1)
+
+    def test_iter_query_subjects_stop_early(self):
+        policy_resources = self._gen_policy_resources(MAX_ENGINE_SEARCH_RESOURCE_COUNT + 1)
+
+        with mock.patch(
+            "backend.service.engine.batch_query_subjects",
+            return_value={"results": [[] for _ in range(MAX_ENGINE_SEARCH_RESOURCE_COUNT)]},
+        ) as m:
+            for _ in self.svc.iter_query_subjects_by_policy_resources("bk_job", policy_resources, "group"):
+                break
+
+        # 提前结束迭代后不再请求后续的批次
+        self.assertEqual(m.call_count, 1)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+
+from backend.service.group import GroupService
+from backend.service.models import Subject
+from backend.util.cache import redis_region
+from tests.test_util.helpers import fake_redis_client
+
+
+@mock.patch.object(redis_region.backend, "client", new_callable=fake_redis_client)
+class DepartmentSubjectRelationCacheTests(TestCase):
+    @mock.patch("backend.service.group.iam.get_subject_relation")
+    def test_list_department_subject_relation_cached(self, mock_get_subject_relation, mock_client):
+        mock_get_subject_relation.side_effect = lambda _type, _id: [{"id": f"group_{_id}"}]
+
+        svc = GroupService()
+        self.assertEqual(
+            svc.list_department_subject_relation([1, 2]), {1: [{"id": "group_1"}], 2: [{"id": "group_2"}]}
+        )
+        # 第二次从共享缓存读取
+        self.assertEqual(
+            svc.list_department_subject_relation([2, 1]), {2: [{"id": "group_2"}], 1: [{"id": "group_1"}]}
+        )
+        self.assertEqual(mock_get_subject_relation.call_count, 2)
+
+    @mock.patch("backend.service.group.iam.get_subject_relation")
+    def test_invalidate_department_relation_cache(self, mock_get_subject_relation, mock_client):
+        mock_get_subject_relation.return_value = []
+
+        svc = GroupService()
+        svc.list_department_subject_relation([1])
+        svc._invalidate_department_relation_cache([Subject(type="department", id="1"), Subject(type="user", id="1")])
+        svc.list_department_subject_relation([1])
+
+        self.assertEqual(mock_get_subject_relation.call_count, 2)
@@ -878,6 +878,21 @@ class RelatedResourceTests(TestCase):
         resource.remove_conditions([condition])
         self.assertTrue(resource.is_empty())
 
+    def test_subtract_conditions(self):
+        resource = self.resource_factory.new("bk_cmdb", "host", "主机")
+        self.assertTrue(resource.subtract_conditions([]).is_empty())
+        self.assertFalse(resource.is_empty())
+
+        condition = self.condition_factory.example()
+        self.assertTrue(resource.subtract_conditions([condition]).is_any())
+
+        resource = self.resource_factory.example()
+        subtraction = resource.subtract_conditions([condition])
+        self.assertTrue(subtraction.is_empty())
+        # 不修改原有的资源类型
+        self.assertFalse(resource.is_empty())
+        self.assertEqual(len(resource.condition), 1)
+
     def test_has_conditions(self):
         resource = self.resource_factory.example()
         self.assertFalse(resource.has_conditions([]))
@@ -10,8 +10,12 @@ specific language governing permissions and limitations under the License.
 """
 import mock
 from django.test import TestCase
+from django_dynamic_fixture import G
 
+from backend.apps.policy.models import Policy as PolicyModel
+from backend.service.models import Subject
 from backend.service.policy import PolicyService
+from backend.service.policy.query import PolicyQueryService
 from tests.test_util.factory import PolicyFactory
 
 
@@ -28,3 +32,36 @@ class PolicyServiceTests(TestCase):
         with self.assertRaises(Exception):
             policy.related_resource_types[0].instances_count = mock.Mock(return_value=10001)
             svc.check_policy_instance_count(policy)
+
+
+class PolicyQueryServiceTests(TestCase):
+    def test_list_system_counter_by_subjects(self):
+        for subject_id, system_id in [("1", "bk_job"), ("1", "bk_job"), ("1", "bk_cmdb"), ("2", "bk_job")]:
+            G(PolicyModel, subject_type="group", subject_id=subject_id, system_id=system_id, _resources="[]")
+        G(PolicyModel, subject_type="user", subject_id="1", system_id="bk_job", _resources="[]")
+
+        counters = PolicyQueryService().list_system_counter_by_subjects("group", ["1", "2", "3"])
+
+        self.assertEqual({c.id: c.count for c in counters["1"]}, {"bk_job": 2, "bk_cmdb": 1})
+        self.assertEqual({c.id: c.count for c in counters["2"]}, {"bk_job": 1})
+        self.assertNotIn("3", counters)
+
+    @mock.patch("backend.service.policy.query.iam.list_system_policy")
+    def test_list_summary_by_subject(self, mock_list_system_policy):
+        for action_id, policy_id in [("view", 1), ("edit", 2)]:
+            G(
+                PolicyModel,
+                subject_type="group",
+                subject_id="1",
+                system_id="bk_job",
+                action_id=action_id,
+                policy_id=policy_id,
+                _resources="[]",
+            )
+        mock_list_system_policy.return_value = [
+            {"id": 1, "system": "bk_job", "action_id": "view", "expired_at": 100},
+        ]
+
+        summaries = PolicyQueryService().list_summary_by_subject("bk_job", Subject(type="group", id="1"))
+
+        self.assertEqual([s.dict() for s in summaries], [{"action_id": "view", "policy_id": 1, "expired_at": 100}])
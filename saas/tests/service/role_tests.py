@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.role.models import RoleScope
+from backend.service.constants import RoleScopeType
+from backend.service.role import RoleScopeCache
+from backend.util.cache import redis_region
+from tests.test_util.helpers import fake_redis_client
+
+
+@mock.patch.object(redis_region.backend, "client", new_callable=fake_redis_client)
+class RoleScopeCacheTests(TestCase):
+    def setUp(self):
+        self.content = '[{"system_id":"bk_job","actions":[]}]'
+        G(RoleScope, role_id=100, type=RoleScopeType.AUTHORIZATION.value, content=self.content)
+
+    @mock.patch("backend.service.role.local")
+    def test_get_content_cached(self, mock_local, mock_client):
+        mock_local.request = None
+        role_scope_cache = RoleScopeCache()
+
+        self.assertEqual(role_scope_cache.get_content(100, RoleScopeType.AUTHORIZATION.value), self.content)
+        # 第二次从Redis读取, 经过decode_responses的客户端
+        with self.assertNumQueries(0):
+            self.assertEqual(role_scope_cache.get_content(100, RoleScopeType.AUTHORIZATION.value), self.content)
+
+        # 不存在的范围也会缓存
+        self.assertEqual(role_scope_cache.get_content(100, RoleScopeType.SUBJECT.value), "")
+        with self.assertNumQueries(0):
+            self.assertEqual(role_scope_cache.get_content(100, RoleScopeType.SUBJECT.value), "")
+
+    @mock.patch("backend.service.role.local")
+    def test_delete(self, mock_local, mock_client):
+        mock_local.request = None
+        role_scope_cache = RoleScopeCache()
+        role_scope_cache.get_content(100, RoleScopeType.AUTHORIZATION.value)
+
+        RoleScope.objects.filter(role_id=100).update(content="[]")
+        role_scope_cache.delete([100])
+
+        self.assertEqual(role_scope_cache.get_content(100, RoleScopeType.AUTHORIZATION.value), "[]")
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+
+from backend.service.system import SystemService
+from backend.util.cache import redis_region
+from tests.test_util.helpers import fake_redis_client
+
+SYSTEMS = [
+    {"id": "bk_job", "name": "作业平台", "name_en": "job", "description": "", "description_en": ""},
+    {"id": "bk_cmdb", "name": "配置平台", "name_en": "cmdb", "description": "", "description_en": ""},
+]
+
+
+class SystemServiceTests(TestCase):
+    def setUp(self):
+        # 使用与rd_pool相同decode_responses配置的Redis客户端, 覆盖真实的编解码
+        patcher = mock.patch.object(redis_region.backend, "client", new_callable=fake_redis_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.svc = SystemService()
+
+    def test_backend_calls(self):
+        with mock.patch("backend.component.iam.list_system", return_value=SYSTEMS) as list_system, mock.patch(
+            "backend.component.iam.get_system"
+        ) as get_system:
+            # 模拟页面中多处查询系统信息, 只需请求一次后端
+            for _ in range(10):
+                self.svc.list()
+                self.svc.get("bk_job")
+                self.svc.get_many(["bk_job", "bk_cmdb"])
+
+        self.assertEqual(list_system.call_count, 1)
+        self.assertEqual(get_system.call_count, 0)
+
+    def test_get_many(self):
+        with mock.patch("backend.component.iam.list_system", return_value=SYSTEMS):
+            systems = self.svc.get_many(["bk_job", "not_exists"])
+
+        self.assertEqual(list(systems.keys()), ["bk_job"])
+        self.assertEqual(systems["bk_job"].name, "作业平台")
+
+    def test_get_not_in_cache_and_invalidate(self):
+        new_system = {"id": "bk_new", "name": "新系统", "name_en": "new", "description": "", "description_en": ""}
+        with mock.patch("backend.component.iam.list_system", return_value=SYSTEMS) as list_system, mock.patch(
+            "backend.component.iam.get_system", return_value=new_system
+        ):
+            self.svc.list()
+            system = self.svc.get("bk_new")
+            # 新注册的系统会失效缓存, 下次查询会重新请求后端
+            self.svc.list()
+
+        self.assertEqual(system.id, "bk_new")
+        self.assertEqual(list_system.call_count, 2)
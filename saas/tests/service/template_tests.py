@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import mock
+from django.test import TestCase
+from django_dynamic_fixture import G
+
+from backend.apps.template.models import PermTemplate, PermTemplatePolicyAuthorized
+from backend.service.models import Subject
+from backend.service.template import TemplateService
+
+
+class TemplateServiceTests(TestCase):
+    def setUp(self):
+        self.template = G(PermTemplate, system_id="bk_job", subject_count=3, _action_ids="[]")
+        for subject_type, subject_id in [("group", "1"), ("group", "2"), ("user", "admin")]:
+            G(
+                PermTemplatePolicyAuthorized,
+                template_id=self.template.id,
+                subject_type=subject_type,
+                subject_id=subject_id,
+                system_id="bk_job",
+                _data="{}",
+            )
+
+    @mock.patch("backend.service.template.iam.batch_delete_template_policies", return_value=[])
+    def test_revoke_subjects(self, mock_batch_delete):
+        subjects = [Subject(type="group", id="1"), Subject(type="user", id="admin"), Subject(type="group", id="3")]
+
+        failed_subjects = TemplateService().revoke_subjects("bk_job", self.template.id, subjects)
+
+        self.assertEqual(failed_subjects, [])
+        remain = PermTemplatePolicyAuthorized.objects.filter(template_id=self.template.id)
+        self.assertEqual([(a.subject_type, a.subject_id) for a in remain], [("group", "2")])
+        self.assertEqual(PermTemplate.objects.get(id=self.template.id).subject_count, 1)
+
+        mock_batch_delete.assert_called_once()
+        items = mock_batch_delete.call_args[0][0]
+        self.assertEqual({(i["subject_type"], i["subject_id"]) for i in items}, {("group", "1"), ("user", "admin")})
+
+    @mock.patch("backend.service.template.iam._call_iam_api")
+    @mock.patch("backend.service.template.iam.publisher_shortcut.publish_delete_policies_by_template_subjects")
+    def test_revoke_subjects_backend_fail(self, mock_publish, mock_call_iam_api):
+        def call_iam_api(http_func, url_path, data):
+            if data["subject_id"] == "1":
+                raise Exception("backend error")
+
+        mock_call_iam_api.side_effect = call_iam_api
+        subjects = [Subject(type="group", id="1"), Subject(type="group", id="2")]
+
+        failed_subjects = TemplateService().revoke_subjects("bk_job", self.template.id, subjects)
+
+        # 后端删除失败不回滚DB的删除
+        remain = PermTemplatePolicyAuthorized.objects.filter(template_id=self.template.id)
+        self.assertEqual([(a.subject_type, a.subject_id) for a in remain], [("user", "admin")])
+        self.assertEqual(PermTemplate.objects.get(id=self.template.id).subject_count, 1)
+
+        self.assertEqual(
+            failed_subjects,
+            [{"system_id": "bk_job", "template_id": self.template.id, "subject_type": "group", "subject_id": "1"}],
+        )
+        # 只发布删除成功的subject的删除策略事件
+        mock_publish.assert_called_once_with(
+            [{"template_id": self.template.id, "subject": {"type": "group", "id": "2"}}]
+        )
+
+    @mock.patch("backend.service.template.iam.batch_delete_template_policies", return_value=[])
+    def test_revoke_subject_templates(self, mock_batch_delete):
+        other = G(PermTemplate, system_id="bk_cmdb", subject_count=0, _action_ids="[]")
+
+        TemplateService().revoke_subject_templates(Subject(type="group", id="1"), [self.template, other])
+
+        self.assertFalse(PermTemplatePolicyAuthorized.objects.filter(subject_type="group", subject_id="1").exists())
+        self.assertEqual(PermTemplate.objects.get(id=self.template.id).subject_count, 2)
+        self.assertEqual(PermTemplate.objects.get(id=other.id).subject_count, 0)
+        mock_batch_delete.assert_called_once_with(
+            [{"system_id": "bk_job", "template_id": self.template.id, "subject_type": "group", "subject_id": "1"}]
+        )
@@ -10,6 +10,8 @@ specific language governing permissions and limitations under the License.
 """
 import random
 
+import fakeredis
+
 DEF_RANDOM_CHARACTER_SET = "abcdefghijklmnopqrstuvwxyz0123456789"
 
 
@@ -28,3 +30,10 @@ def generate_random_number(min_num=0, max_num=100):
     """生成随机数"""
     rand = random.SystemRandom()
     return rand.randint(min_num, max_num)
+
+
+def fake_redis_client():
+    """
+    与rd_pool配置一致(decode_responses=True)的fakeredis客户端, 用于替换redis_region.backend.client
+    """
+    return fakeredis.FakeStrictRedis(decode_responses=True)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import threading
+
+import mock
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+
+from backend.util.cache import VersionedLocalCache, redis_region
+from tests.test_util.helpers import fake_redis_client, generate_random_string
+
+
+@mock.patch.object(redis_region.backend, "client", new_callable=fake_redis_client)
+class VersionedLocalCacheTests(TestCase):
+    def setUp(self):
+        self.version_cache = LocMemCache(generate_random_string(), {})
+        patcher = mock.patch("backend.util.cache.cache", self.version_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.build_count = 0
+
+        def build():
+            self.build_count += 1
+            return []
+
+        self.local_cache = VersionedLocalCache(
+            "test:version", build, check_interval=0, updater=lambda value, item: value.append(item)
+        )
+
+    def test_update_without_rebuild(self, mock_client):
+        self.assertEqual(self.local_cache.get(), [])
+
+        self.local_cache.update([1, 2])
+        self.assertEqual(self.local_cache.get(), [1, 2])
+
+        # 其他进程的缓存同样只应用增量变更
+        other = VersionedLocalCache(
+            "test:version", list, check_interval=0, updater=lambda value, item: value.append(item)
+        )
+        self.assertEqual(other.get(), [])
+        self.local_cache.update([3])
+        self.assertEqual(other.get(), [3])
+        self.assertEqual(self.local_cache.get(), [1, 2, 3])
+
+        self.assertEqual(self.build_count, 1)
+
+    def test_invalidate(self, mock_client):
+        self.local_cache.get()
+        self.local_cache.update([1])
+        self.local_cache.invalidate()
+
+        self.assertEqual(self.local_cache.get(), [])
+        self.assertEqual(self.build_count, 2)
+
+    def test_rebuild_when_too_many_updates(self, mock_client):
+        self.local_cache.max_updates = 2
+        self.local_cache.get()
+
+        self.local_cache.update([1, 2])
+        self.assertEqual(self.local_cache.get(), [1, 2])
+
+        # 变更列表超过上限时全量重建并清空变更列表
+        self.local_cache.update([3])
+        self.assertEqual(self.local_cache.get(), [])
+        self.assertEqual(self.build_count, 2)
+        self.assertEqual(mock_client.llen(self.local_cache.updates_key), 0)
+
+    def test_get_never_returns_none_during_invalidate(self, mock_client):
+        self.local_cache.get()
+        results = []
+
+        def get():
+            for _ in range(50):
+                results.append(self.local_cache.get())
+
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for _ in range(20):
+            self.local_cache.invalidate()
+        for t in threads:
+            t.join()
+
+        self.assertNotIn(None, results)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making 蓝鲸智云-权限中心(BlueKing-IAM) available.
+Copyright (C) 2017-2021 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+import json
+from datetime import date, datetime, timezone
+from unittest import skipIf
+
+from django.test import TestCase
+from rest_framework.utils.encoders import JSONEncoder
+
+from backend.util.json import JSONCodec, OrjsonCodec, json_dumps, json_loads, orjson
+from tests.test_util.factory import PolicyBeanFactory, PolicyFactory
+
+CASES = [
+    {},
+    [],
+    "",
+    {"name": "主机", "emoji": "😀", "escape": '"\\/\n\t\x01\x7f', "none": None, "bool": True},
+    {"int": 1, "negative": -1, "float": 1.5, "big": 2 ** 70, 1: "int key"},
+    {"exponent": [1e16, 1e-7, 1e15, -2.5e-5], "hash": "3e5a0c", "none": None},
+    PolicyFactory().example().dict(),
+    PolicyBeanFactory().example().dict(),
+]
+
+
+class JSONCodecTests(TestCase):
+    def assert_parity(self, codec):
+        for data in CASES:
+            expected = json.dumps(data, separators=(",", ":"))
+            # 编码结果与标准库逐字节一致
+            self.assertEqual(codec.dumps(data), expected)
+            # 解码结果与标准库一致
+            self.assertEqual(codec.loads(expected), json.loads(expected))
+            self.assertEqual(json.loads(codec.dumps_bytes(data)), json.loads(expected))
+
+        # NaN/Infinity与标准库一致, 不会被序列化为null
+        data = {"nan": float("nan"), "inf": [float("inf")]}
+        self.assertEqual(codec.dumps(data), '{"nan":NaN,"inf":[Infinity]}')
+
+        data = {"b": [1, {"d": 1, "c": 2}], "a": "中文"}
+        self.assertEqual(codec.dumps(data, sort_keys=True), json.dumps(data, separators=(",", ":"), sort_keys=True))
+
+    def test_json(self):
+        self.assert_parity(JSONCodec())
+
+    @skipIf(orjson is None, "orjson not installed")
+    def test_orjson(self):
+        self.assert_parity(OrjsonCodec())
+
+    def test_dumps_bytes_reject_nan(self):
+        codecs = [JSONCodec()] + ([OrjsonCodec()] if orjson is not None else [])
+        for codec in codecs:
+            # 与DRF的STRICT_JSON一致, 接口响应不允许NaN/Infinity
+            with self.assertRaises(ValueError):
+                codec.dumps_bytes({"data": [float("nan")]})
+
+    @skipIf(orjson is None, "orjson not installed")
+    def test_dumps_bytes_datetime(self):
+        data = {"time": datetime(2021, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc), "date": date(2021, 1, 1)}
+        default = JSONEncoder().default
+        # datetime交给DRF的encoder处理, UTC时间为Z结尾, 保留微秒
+        self.assertEqual(
+            json.loads(OrjsonCodec().dumps_bytes(data, default=default)),
+            {"time": "2021-01-01T12:00:00.123456Z", "date": "2021-01-01"},
+        )
+        self.assertEqual(OrjsonCodec().dumps_bytes(data, default=default), JSONCodec().dumps_bytes(data, default))
+
+    def test_round_trip(self):
+        policy = PolicyBeanFactory().example().dict()
+        self.assertEqual(json_loads(json_dumps(policy)), policy)
+        # 兼容标准库允许的NaN
+        self.assertTrue(json_loads("[NaN]")[0] != json_loads("[NaN]")[0])
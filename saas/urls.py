@@ -59,6 +59,7 @@ urlpatterns = [
                 url(r"^modeling/", include("backend.apps.model_builder.urls")),
                 url(r"^audits/", include("backend.audit.urls")),
                 url(r"^debug/", include("backend.debug.urls")),
+                url(r"^long_tasks/", include("backend.long_task.urls")),
             ]
         ),
     ),